@@ -3,6 +3,16 @@ ASGI config for CaSy project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Las vistas del catálogo (listado, búsqueda, detalle) y del carrito son async
+y usan el ORM async, así que bajo ASGI no ocupan un thread por request.
+Para producción: ``python -m CaSy.servidor`` (uvicorn, ver CaSy/servidor.py).
+Para comparar contra WSGI: ``python benchmarks/carga.py --comparar``.
+
+Bajo ASGI las conexiones a la base no son persistentes (DB_CONN_MAX_AGE=0
+salvo que se defina): el código sync de cada request corre en un thread
+distinto, así que con CONN_MAX_AGE cada thread dejaría su conexión abierta
+hasta el timeout. Es lo que recomienda la documentación de Django para async.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -12,5 +22,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'CaSy.settings')
+# Antes de cargar settings (ver CaSy/basedatos.py, conexion_persistente)
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
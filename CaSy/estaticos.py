@@ -0,0 +1,120 @@
+# CaSy/estaticos.py
+"""
+Pipeline de estáticos: `collectstatic` arma los bundles de CSS definidos en
+settings.CSS_BUNDLES (concatenados y minificados) y después todo pasa por
+ManifestStaticFilesStorage, que les agrega el hash del contenido al nombre.
+
+Los archivos que se copian tal cual (imágenes, fuentes) se guardan como
+hardlinks al origen: ni la copia de collectstatic ni la versión con hash
+ocupan disco de nuevo. Si STATIC_ROOT está en otro sistema de archivos se copia.
+"""
+import os
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.files.base import ContentFile
+from django.views.static import serve
+
+# Strings y comentarios; los strings se conservan tal cual (data: URIs, content: "...")
+_TOKENS_CSS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+_ESPACIOS = re.compile(r'\s+')
+# No se tocan los espacios antes de ':' (`a :hover` no es lo mismo que `a:hover`)
+_ALREDEDOR = re.compile(r'\s*([{};,>])\s*')
+_DESPUES_DOS_PUNTOS = re.compile(r':\s+')
+
+CACHE_INMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def minificar_css(texto):
+    """Quita comentarios y espacios sobrantes sin modificar los strings"""
+    strings = []
+
+    def reservar(token):
+        if token.group(1) is None:
+            return ' '  # comentario
+        strings.append(token.group(1))
+        return f'\x00{len(strings) - 1}\x00'
+
+    codigo = _TOKENS_CSS.sub(reservar, texto)
+    codigo = _ESPACIOS.sub(' ', codigo)
+    codigo = _ALREDEDOR.sub(r'\1', codigo)
+    codigo = _DESPUES_DOS_PUNTOS.sub(':', codigo)
+    codigo = codigo.replace(';}', '}').strip()
+    return re.sub(r'\x00(\d+)\x00', lambda m: strings[int(m.group(1))], codigo)
+
+
+class StaticManifiesto(ManifestStaticFilesStorage):
+    """
+    Manifest storage que además genera los bundles de CSS antes de hashear.
+
+    No es estricto: una ruta que no está en el manifest (p. ej. una imagen
+    guardada en la base que se agregó después del último collectstatic) sale
+    con su URL sin hash en lugar de romper el render con un 500.
+    """
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Tampoco está en STATIC_ROOT, así que no se puede hashear
+            return name
+
+    def _save(self, name, content):
+        origen = getattr(content, 'name', None)
+        if origen and os.path.isabs(origen) and os.path.isfile(origen):
+            destino = self.path(name)
+            if not os.path.exists(destino):
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                try:
+                    os.link(origen, destino)
+                    return name
+                except OSError:
+                    pass
+        return super()._save(name, content)
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for nombre, fuentes in getattr(settings, 'CSS_BUNDLES', {}).items():
+                contenido = []
+                for fuente in fuentes:
+                    with self.open(fuente) as archivo:
+                        contenido.append(archivo.read().decode('utf-8'))
+                if self.exists(nombre):
+                    self.delete(nombre)
+                self.save(nombre, ContentFile(minificar_css('\n'.join(contenido)).encode('utf-8')))
+                # Así el bundle también recibe hash y se reescriben sus url()
+                paths[nombre] = (self, nombre)
+        yield from super().post_process(paths, dry_run, **options)
+
+
+@lru_cache(maxsize=1)
+def nombres_hasheados():
+    """Nombres con hash del manifiesto (se lee una vez por proceso)"""
+    return frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+
+def servir_media(request, path):
+    """
+    Sirve MEDIA_ROOT con SERVIR_ESTATICOS: las portadas procesadas llevan el
+    hash del original en el nombre, así que también se cachean por un año.
+    """
+    respuesta = serve(request, path, document_root=settings.MEDIA_ROOT)
+    respuesta['Cache-Control'] = CACHE_INMUTABLE
+    return respuesta
+
+
+def servir_estatico(request, path):
+    """
+    Sirve STATIC_ROOT desde Django (settings.SERVIR_ESTATICOS) cuando no hay un
+    servidor web adelante. Los nombres con hash no cambian nunca, así que se
+    cachean por un año; el resto se revalida en cada visita.
+    """
+    respuesta = serve(request, path, document_root=settings.STATIC_ROOT)
+    if path in nombres_hasheados():
+        respuesta['Cache-Control'] = CACHE_INMUTABLE
+    else:
+        respuesta['Cache-Control'] = 'no-cache'
+    return respuesta
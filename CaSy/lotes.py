@@ -0,0 +1,104 @@
+# CaSy/lotes.py
+"""
+Escritura en lote de filas que solo se agregan (pedidos, eventos).
+
+El request solo agrega el objeto a una lista en memoria; un thread del
+proceso hace un bulk_create cuando se juntan `tamano` objetos o cada
+`intervalo` segundos, y lo pendiente se vuelca al salir (atexit). Si el
+proceso muere de golpe se pierde como mucho el último lote: no usar para
+datos que no se puedan reconstruir de otro lado.
+
+Si el bulk_create falla se reintenta fila por fila: las filas que la base
+rechaza (IntegrityError, DataError) se registran en el log y se descartan,
+para que una fila mala no trabe el lote para siempre. Si lo que falla es la
+conexión, lo que quedó sin escribir vuelve a la cola para el próximo lote.
+"""
+import atexit
+import logging
+import threading
+
+from django.db import InterfaceError, OperationalError, close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+# Tope de objetos en memoria si la base no acepta escrituras: lo más viejo se descarta
+MAX_PENDIENTES = 10000
+
+# Errores de la base (no de la fila): se reintenta en el próximo lote
+ERRORES_CONEXION = (OperationalError, InterfaceError)
+
+
+class EscritorPorLotes:
+    def __init__(self, modelo, tamano=50, intervalo=5.0, nombre=None):
+        self.modelo = modelo
+        self.tamano = tamano
+        self.intervalo = intervalo
+        self.nombre = nombre or f'lotes-{modelo._meta.model_name}'
+        self.pendientes = []
+        self.lock = threading.Lock()
+        self.despertar = threading.Event()
+        self.hilo = None
+        atexit.register(self.volcar)
+
+    def agregar(self, objeto):
+        """No toca la base: encola y, si se completó un lote, despierta al thread"""
+        with self.lock:
+            self.pendientes.append(objeto)
+            if len(self.pendientes) > MAX_PENDIENTES:
+                del self.pendientes[:len(self.pendientes) - MAX_PENDIENTES]
+            lleno = len(self.pendientes) >= self.tamano
+            if self.hilo is None or not self.hilo.is_alive():
+                self.hilo = threading.Thread(target=self._bucle, name=self.nombre, daemon=True)
+                self.hilo.start()
+        if lleno:
+            self.despertar.set()
+
+    def volcar(self):
+        """Escribe lo pendiente en un bulk_create; devuelve cuántas filas escribió"""
+        with self.lock:
+            lote, self.pendientes = self.pendientes, []
+        if not lote:
+            return 0
+        try:
+            self.modelo.objects.bulk_create(lote, batch_size=500)
+        except ERRORES_CONEXION:
+            logger.exception('No se pudieron escribir %s %s; se reintenta en el próximo lote', len(lote), self.nombre)
+            self._reencolar(lote)
+            return 0
+        except Exception:
+            logger.warning('Falló el lote de %s %s; se reintenta fila por fila', len(lote), self.nombre)
+            return self._volcar_filas(lote)
+        return len(lote)
+
+    def _volcar_filas(self, lote):
+        escritas = 0
+        for i, objeto in enumerate(lote):
+            try:
+                self.modelo.objects.bulk_create([objeto])
+            except ERRORES_CONEXION:
+                logger.exception('Se perdió la conexión; %s %s vuelven a la cola', len(lote) - i, self.nombre)
+                self._reencolar(lote[i:])
+                break
+            except Exception:
+                logger.exception('Se descarta una fila de %s: %s', self.nombre, objeto)
+            else:
+                escritas += 1
+        return escritas
+
+    def _reencolar(self, lote):
+        with self.lock:
+            self.pendientes[:0] = lote
+            if len(self.pendientes) > MAX_PENDIENTES:
+                del self.pendientes[:len(self.pendientes) - MAX_PENDIENTES]
+
+    def _bucle(self):
+        while True:
+            self.despertar.wait(self.intervalo)
+            self.despertar.clear()
+            if not self.pendientes:
+                continue
+            try:
+                close_old_connections()
+                self.volcar()
+            finally:
+                connection.close()
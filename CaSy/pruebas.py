@@ -0,0 +1,109 @@
+# CaSy/pruebas.py
+"""
+Runner de tests: corre la suite en SQLite y, si hay binarios de PostgreSQL
+(initdb / pg_ctl), otra vez contra un cluster temporal.
+
+`python manage.py test` levanta el cluster en un directorio temporal (socket
+y puerto propios, autenticación trust), corre la suite en un subproceso con
+DATABASE_URL apuntando a él y lo borra al terminar. Así la migración de
+pg_trgm, el índice GIN, `candidatos_similares` y `migrar_sqlite_a_postgres`
+se prueban siempre que PostgreSQL esté instalado, sin configurar nada.
+
+- Con DATABASE_URL ya definida se usa esa base y no se levanta nada.
+- TEST_POSTGRES=0 saltea la pasada de PostgreSQL.
+- PG_BIN indica el directorio de los binarios si no están en el PATH.
+"""
+import glob
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+# initdb se niega a correr como root: en ese caso el cluster se inicia con este usuario
+USUARIO_SISTEMA = 'postgres'
+
+
+def directorio_binarios():
+    """Directorio con initdb y pg_ctl, o None si PostgreSQL no está instalado"""
+    candidatos = [os.environ.get('PG_BIN', '')]
+    if shutil.which('initdb'):
+        candidatos.append(str(Path(shutil.which('initdb')).parent))
+    candidatos += sorted(glob.glob('/usr/lib/postgresql/*/bin'), reverse=True)
+    candidatos += ['/usr/local/pgsql/bin', '/opt/homebrew/bin', '/usr/local/bin']
+    for directorio in filter(None, candidatos):
+        if all((Path(directorio) / binario).exists() for binario in ('initdb', 'pg_ctl')):
+            return Path(directorio)
+    return None
+
+
+def puerto_libre():
+    with socket.socket() as conexion:
+        conexion.bind(('127.0.0.1', 0))
+        return conexion.getsockname()[1]
+
+
+@contextmanager
+def cluster_temporal(binarios):
+    """Levanta un cluster descartable y devuelve su DATABASE_URL"""
+    directorio = Path(tempfile.mkdtemp(prefix='casy-pg-'))
+    datos = directorio / 'datos'
+    puerto = puerto_libre()
+    prefijo = []
+    if hasattr(os, 'geteuid') and os.geteuid() == 0:
+        try:
+            shutil.chown(directorio, USUARIO_SISTEMA)
+        except LookupError:
+            shutil.rmtree(directorio, ignore_errors=True)
+            raise RuntimeError(f'initdb no corre como root y no existe el usuario {USUARIO_SISTEMA}')
+        prefijo = ['runuser', '-u', USUARIO_SISTEMA, '--']
+
+    def correr(*comando):
+        subprocess.run(prefijo + [str(c) for c in comando], check=True, capture_output=True)
+
+    try:
+        correr(binarios / 'initdb', '-D', datos, '-U', 'postgres', '-A', 'trust', '--no-sync', '-E', 'UTF8')
+        correr(
+            binarios / 'pg_ctl', '-D', datos, '-l', directorio / 'log', '-w',
+            '-o', f"-p {puerto} -k {directorio} -c listen_addresses=127.0.0.1 -c fsync=off",
+            'start',
+        )
+        try:
+            yield f'postgres://postgres@127.0.0.1:{puerto}/postgres'
+        finally:
+            correr(binarios / 'pg_ctl', '-D', datos, '-m', 'immediate', 'stop')
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+class RunnerConPostgres(DiscoverRunner):
+    def run_tests(self, test_labels, **kwargs):
+        fallas = super().run_tests(test_labels, **kwargs)
+        if os.environ.get('DATABASE_URL') or os.environ.get('TEST_POSTGRES') == '0':
+            return fallas
+
+        binarios = directorio_binarios()
+        if binarios is None:
+            self.log('⚠️  Sin binarios de PostgreSQL (initdb/pg_ctl): los tests de PostgreSQL quedaron salteados')
+            return fallas
+
+        comando = [sys.executable, 'manage.py', 'test', *test_labels, '--noinput', f'-v{self.verbosity}']
+        if self.failfast:
+            comando.append('--failfast')
+        self.log(f'🐘 Otra pasada contra un PostgreSQL temporal ({binarios})')
+        try:
+            with cluster_temporal(binarios) as url:
+                resultado = subprocess.run(comando, cwd=settings.BASE_DIR, env={**os.environ, 'DATABASE_URL': url})
+        except subprocess.CalledProcessError as e:
+            self.log(f'❌ No se pudo levantar PostgreSQL: {e.stderr.decode(errors="replace").strip()}')
+            return fallas + 1
+        except RuntimeError as e:
+            self.log(f'❌ No se pudo levantar PostgreSQL: {e}')
+            return fallas + 1
+        return fallas + resultado.returncode
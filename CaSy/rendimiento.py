@@ -0,0 +1,223 @@
+# CaSy/rendimiento.py
+"""
+Medición por request: consultas SQL y su tiempo, render de templates,
+aciertos de cache y escritura de sesión.
+
+- `MedicionMiddleware` (primero en MIDDLEWARE) abre la medición, agrega el
+  header Server-Timing y manda al log 'casy.requests' (JSON por línea,
+  archivo rotativo) todos los requests lentos y una muestra del resto.
+- Las consultas se cuentan con un execute_wrapper que se instala en cada
+  conexión nueva; la medición vive en un ContextVar, así que también cuenta
+  las consultas que las vistas async hacen desde sync_to_async.
+- El render se mide con el backend `PlantillasMedidas` y el cache con
+  `CacheArchivosMedido` (ver TEMPLATES y CACHES en settings).
+
+Se activa con MEDIR_REQUESTS=1 (settings.MEDIR_REQUESTS, apagada por defecto). Los percentiles por URL salen de
+`python manage.py reporte_requests`.
+"""
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache.backends.filebased import FileBasedCache
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger('casy.requests')
+
+_medicion = ContextVar('medicion_request', default=None)
+
+
+class Medicion:
+    __slots__ = ('inicio', 'consultas', 'db_ms', 'plantillas_ms', 'cache_aciertos', 'cache_fallos', 'extra')
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.db_ms = 0.0
+        self.plantillas_ms = 0.0
+        self.cache_aciertos = 0
+        self.cache_fallos = 0
+        self.extra = {}
+
+    def total_ms(self):
+        return (time.perf_counter() - self.inicio) * 1000
+
+
+def registrar(**valores):
+    """Suma contadores propios a la medición en curso (si hay una)"""
+    medicion = _medicion.get()
+    if medicion is None:
+        return
+    for clave, valor in valores.items():
+        medicion.extra[clave] = medicion.extra.get(clave, 0) + valor
+
+
+def _medir_consulta(execute, sql, params, many, context):
+    medicion = _medicion.get()
+    if medicion is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        medicion.consultas += 1
+        medicion.db_ms += (time.perf_counter() - inicio) * 1000
+
+
+def instalar_en_conexion(sender, connection, **kwargs):
+    if _medir_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_medir_consulta)
+
+
+def conectar():
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(instalar_en_conexion, dispatch_uid='casy_medicion_consultas')
+
+
+class TemplateMedido(Template):
+    def render(self, context=None, request=None):
+        medicion = _medicion.get()
+        if medicion is None:
+            return super().render(context, request)
+        inicio = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            medicion.plantillas_ms += (time.perf_counter() - inicio) * 1000
+
+
+class PlantillasMedidas(DjangoTemplates):
+    """DjangoTemplates que mide el render de cada template de primer nivel (los include quedan adentro)"""
+
+    def from_string(self, template_code):
+        return TemplateMedido(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        plantilla = super().get_template(template_name)
+        return TemplateMedido(plantilla.template, self)
+
+
+_FALTANTE = object()
+
+
+class CacheArchivosMedido(FileBasedCache):
+    """FileBasedCache que cuenta aciertos y fallos en la medición del request"""
+
+    def get(self, key, default=None, version=None):
+        valor = super().get(key, _FALTANTE, version)
+        medicion = _medicion.get()
+        if medicion is not None:
+            if valor is _FALTANTE:
+                medicion.cache_fallos += 1
+            else:
+                medicion.cache_aciertos += 1
+        return default if valor is _FALTANTE else valor
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        encontrados = super().get_many(keys, version)
+        medicion = _medicion.get()
+        if medicion is not None:
+            medicion.cache_aciertos += len(encontrados)
+            medicion.cache_fallos += len(keys) - len(encontrados)
+        return encontrados
+
+
+class ArchivoRotativo(RotatingFileHandler):
+    """RotatingFileHandler que crea el directorio del log al abrirlo"""
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+
+def nombre_url(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None else '<sin resolver>'
+
+
+def server_timing(medicion, total_ms, sesion_escrita):
+    partes = [
+        f'db;dur={medicion.db_ms:.1f};desc="{medicion.consultas} consultas"',
+        f'tpl;dur={medicion.plantillas_ms:.1f}',
+        f'cache;desc="{medicion.cache_aciertos} aciertos, {medicion.cache_fallos} fallos"',
+    ]
+    if sesion_escrita:
+        partes.append('sesion;desc="escrita"')
+    partes.append(f'total;dur={total_ms:.1f}')
+    return ', '.join(partes)
+
+
+class MedicionMiddleware:
+    """Ir primero en MIDDLEWARE para incluir la escritura de la sesión"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.activa = getattr(settings, 'MEDIR_REQUESTS', False)
+        self.umbral_ms = getattr(settings, 'REQUEST_LENTO_MS', 500)
+        self.muestreo = getattr(settings, 'MUESTREO_REQUESTS', 0.05)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.activa:
+            return self.get_response(request)
+        token = _medicion.set(Medicion())
+        try:
+            response = self.get_response(request)
+            self.cerrar(request, response)
+        finally:
+            _medicion.reset(token)
+        return response
+
+    async def __acall__(self, request):
+        if not self.activa:
+            return await self.get_response(request)
+        token = _medicion.set(Medicion())
+        try:
+            response = await self.get_response(request)
+            self.cerrar(request, response)
+        finally:
+            _medicion.reset(token)
+        return response
+
+    def cerrar(self, request, response):
+        medicion = _medicion.get()
+        total_ms = medicion.total_ms()
+        sesion = getattr(request, 'session', None)
+        sesion_escrita = bool(sesion is not None and sesion.modified)
+        response['Server-Timing'] = server_timing(medicion, total_ms, sesion_escrita)
+
+        lento = total_ms >= self.umbral_ms
+        if not lento and random.random() >= self.muestreo:
+            return
+        registro = {
+            'ts': time.time(),
+            'url': nombre_url(request),
+            'metodo': request.method,
+            'ruta': request.path,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+            'db_ms': round(medicion.db_ms, 2),
+            'consultas': medicion.consultas,
+            'plantillas_ms': round(medicion.plantillas_ms, 2),
+            'cache_aciertos': medicion.cache_aciertos,
+            'cache_fallos': medicion.cache_fallos,
+            'sesion_escrita': sesion_escrita,
+            'lento': lento,
+            # Cuántos requests representa el registro (los lentos se guardan todos)
+            'peso': 1.0 if lento else 1.0 / self.muestreo,
+            **medicion.extra,
+        }
+        logger.info(json.dumps(registro, ensure_ascii=False))
@@ -0,0 +1,74 @@
+# CaSy/servidor.py
+"""
+Arranque del sitio en modo ASGI (vistas async del catálogo y del carrito).
+
+    python -m CaSy.servidor [--host 0.0.0.0] [--port 8000] [--workers N]
+
+Usa uvicorn con settings.ASGI_WORKERS procesos. Es lo mismo que
+
+    uvicorn CaSy.asgi:application --workers N --lifespan off --no-access-log
+
+Si uvicorn no está instalado cae a daphne (`daphne CaSy.asgi:application`),
+que corre un solo proceso: para más núcleos levantar varias instancias.
+Los estáticos se sirven con SERVIR_ESTATICOS=1 o desde el proxy de adelante.
+Las conexiones a la base no son persistentes salvo DB_CONN_MAX_AGE explícito
+(ver CaSy/asgi.py).
+"""
+import argparse
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'CaSy.settings')
+# Acá también: con un solo worker uvicorn carga la app en este proceso, y
+# workers_recomendados() ya leyó settings
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
+
+APLICACION = 'CaSy.asgi:application'
+MAX_WORKERS_AUTO = 4
+
+
+def workers_recomendados():
+    """
+    Un proceso por núcleo: en async un proceso ya atiende muchas requests a la
+    vez, más procesos solo suman memoria y peleas por el lock de SQLite.
+    """
+    from django.conf import settings
+
+    if settings.ASGI_WORKERS > 0:
+        return settings.ASGI_WORKERS
+    return max(1, min(os.cpu_count() or 1, MAX_WORKERS_AUTO))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sirve CaSy por ASGI')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=None, help='Por defecto settings.ASGI_WORKERS')
+    opciones = parser.parse_args(argv)
+    workers = opciones.workers or workers_recomendados()
+
+    try:
+        import uvicorn
+    except ImportError:
+        from daphne.cli import CommandLineInterface
+
+        print(f'⚠️  uvicorn no está instalado: daphne con un solo proceso (se pidieron {workers})')
+        CommandLineInterface().run(['-b', opciones.host, '-p', str(opciones.port), APLICACION])
+        return
+
+    print(f'🚀 ASGI en http://{opciones.host}:{opciones.port} con {workers} worker(s)')
+    uvicorn.run(
+        APLICACION,
+        host=opciones.host,
+        port=opciones.port,
+        workers=workers,
+        # Django no implementa el protocolo lifespan
+        lifespan='off',
+        access_log=False,
+        proxy_headers=True,
+        backlog=2048,
+        timeout_keep_alive=5,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,8 @@
 from pathlib import Path
 import os
 
+from CaSy.basedatos import bases_de_datos, es_postgres
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -45,6 +47,8 @@ NEW_APPS = [
 INSTALLED_APPS = BASIC_APPS + NEW_APPS
 
 MIDDLEWARE = [
+    # Primero: mide todo el request, incluida la escritura de la sesión
+    'CaSy.rendimiento.MedicionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -52,13 +56,16 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Último: responde con las páginas pre-renderizadas (solo con PRERENDER_SERVIR)
+    'catalog.prerender.PrerenderMiddleware',
 ]
 
 ROOT_URLCONF = 'CaSy.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates que además mide el tiempo de render (CaSy/rendimiento.py)
+        'BACKEND': 'CaSy.rendimiento.PlantillasMedidas',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -78,10 +85,25 @@ WSGI_APPLICATION = 'CaSy.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
+# WAL, PRAGMAs, conexiones persistentes y alias 'lectura' opcional (ver CaSy/basedatos.py)
+DATABASES = bases_de_datos(BASE_DIR / 'db.sqlite3')
+
+if es_postgres(DATABASES):
+    # Lookups y funciones de trigramas (catalog/busqueda.py)
+    INSTALLED_APPS.append('django.contrib.postgres')
+
+# `manage.py test` corre la suite en SQLite y otra vez en un PostgreSQL temporal
+# si hay initdb/pg_ctl (CaSy/pruebas.py)
+TEST_RUNNER = 'CaSy.pruebas.RunnerConPostgres'
+
+
+# Cache compartido entre procesos (web y comandos de importación).
+# Los comandos regeneran lo cacheado al terminar, así que tiene que ser el mismo almacén.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        # FileBasedCache que cuenta aciertos/fallos por request (CaSy/rendimiento.py)
+        'BACKEND': 'CaSy.rendimiento.CacheArchivosMedido',
+        'LOCATION': os.environ.get('CACHE_DIR', str(BASE_DIR / '.cache')),
     }
 }
 
@@ -130,7 +152,107 @@ STATICFILES_DIRS = [
 # Directorio donde se recopilarán todos los archivos estáticos en producción
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
-# Media files (archivos subidos por usuarios) - opcional
+# collectstatic arma los bundles y agrega el hash del contenido a cada nombre
+# (css/site.min.css -> css/site.min.3f2a9c1b7e4d.css). Requiere correr
+# `python manage.py collectstatic` en cada deploy con DEBUG = False.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'CaSy.estaticos.StaticManifiesto',
+    },
+}
+
+# Bundles de CSS: nombre del bundle -> archivos fuente (en orden)
+CSS_BUNDLES = {
+    'css/site.min.css': ['css/styles.css'],
+    'css/home.min.css': ['css/carrusel.css', 'css/resena.css'],
+}
+
+# Cache local de las dependencias de front-end (ver `python manage.py vendorizar`)
+VENDOR_CACHE = Path(os.environ.get('VENDOR_CACHE', BASE_DIR / '.vendor-cache'))
+
+# Índice de dimensiones/placeholders de static/img (python manage.py indexar_imagenes)
+INDICE_IMAGENES = BASE_DIR / 'indice_imagenes.json'
+# Portadas por fila en el listado: esas se piden con fetchpriority="high"
+PORTADAS_PRIMERA_FILA = 5
+
+# Servir STATIC_ROOT desde Django con Cache-Control inmutable (sin nginx adelante)
+SERVIR_ESTATICOS = os.environ.get('SERVIR_ESTATICOS', '') == '1'
+
+# Procesos de `python -m CaSy.servidor` (modo ASGI). 0 = uno por núcleo, hasta 4:
+# cada proceso atiende muchas requests concurrentes y SQLite serializa las escrituras
+ASGI_WORKERS = int(os.environ.get('ASGI_WORKERS', 0))
+
+# Medición por request (CaSy/rendimiento.py): header Server-Timing y log de
+# requests lentos + una muestra del resto. Reporte: python manage.py reporte_requests
+# Apagada por defecto: envuelve cada consulta y escribe en logs/; MEDIR_REQUESTS=1 la activa
+MEDIR_REQUESTS = os.environ.get('MEDIR_REQUESTS', '') == '1'
+REQUEST_LENTO_MS = int(os.environ.get('REQUEST_LENTO_MS', 500))
+MUESTREO_REQUESTS = float(os.environ.get('MUESTREO_REQUESTS', 0.05))
+LOG_REQUESTS = Path(os.environ.get('LOG_REQUESTS', BASE_DIR / 'logs' / 'requests.jsonl'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'format': '%(message)s'},
+        'consola': {'format': '%(levelname)s %(name)s: %(message)s'},
+    },
+    'handlers': {
+        'requests': {
+            'class': 'CaSy.rendimiento.ArchivoRotativo',
+            'filename': str(LOG_REQUESTS),
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'delay': True,
+            'encoding': 'utf-8',
+            'formatter': 'json',
+        },
+        'consola': {'class': 'logging.StreamHandler', 'formatter': 'consola'},
+    },
+    'loggers': {
+        'casy.requests': {'handlers': ['requests'], 'level': 'INFO', 'propagate': False},
+        'catalog': {'handlers': ['consola'], 'level': 'DEBUG' if DEBUG else 'INFO'},
+        'featured': {'handlers': ['consola'], 'level': 'DEBUG' if DEBUG else 'INFO'},
+    },
+}
+
+# Importaciones de stock subidas desde el admin (catalog/trabajos.py).
+# 'hilo': las corre un thread del proceso web; 'comando': solo se encolan y las
+# corre `python manage.py procesar_importaciones --esperar`.
+IMPORTACIONES_DIR = Path(os.environ.get('IMPORTACIONES_DIR', BASE_DIR / 'importaciones'))
+IMPORTACIONES_WORKER = os.environ.get('IMPORTACIONES_WORKER', 'hilo')
+# Un trabajo 'corriendo' sin checkpoint en estos minutos se da por muerto y el worker lo reencola
+IMPORTACIONES_COLGADO_MINUTOS = int(os.environ.get('IMPORTACIONES_COLGADO_MINUTOS', 10))
+
+# Portadas subidas desde el admin (catalog/procesamiento_portadas.py): el
+# original queda fuera de static y se generan WebP de estos anchos en MEDIA_ROOT/portadas.
+PORTADAS_ORIGINALES_DIR = Path(os.environ.get('PORTADAS_ORIGINALES_DIR', BASE_DIR / 'portadas_originales'))
+PORTADAS_WORKER = os.environ.get('PORTADAS_WORKER', 'hilo')
+TAMANOS_PORTADA = (300, 600)
+
+# Páginas del catálogo pre-renderizadas (python manage.py prerender_catalogo).
+# Con PRERENDER_SERVIR=1 el middleware las sirve mientras el catálogo no cambie.
+PRERENDER_DIR = Path(os.environ.get('PRERENDER_DIR', BASE_DIR / 'prerender'))
+PRERENDER_SERVIR = os.environ.get('PRERENDER_SERVIR', '') == '1'
+PRERENDER_PAGINAS = int(os.environ.get('PRERENDER_PAGINAS', 3))
+# URL pública del sitio, para el sitemap
+SITIO_URL = os.environ.get('SITIO_URL', 'http://localhost:8000')
+
+# Pedidos del checkout (carrito/pedidos.py): se escriben de a PEDIDOS_LOTE o
+# cada PEDIDOS_INTERVALO segundos, lo que pase primero.
+PEDIDOS_LOTE = int(os.environ.get('PEDIDOS_LOTE', 20))
+PEDIDOS_INTERVALO = float(os.environ.get('PEDIDOS_INTERVALO', 5))
+
+# Eventos de demanda (catalog/demanda.py): vistas, carrito y checkout, en lote.
+# `python manage.py consolidar_demanda` los resume y calcula Juego.popularidad.
+DEMANDA_EVENTOS = os.environ.get('DEMANDA_EVENTOS', '1') == '1'
+DEMANDA_LOTE = int(os.environ.get('DEMANDA_LOTE', 200))
+DEMANDA_INTERVALO = float(os.environ.get('DEMANDA_INTERVALO', 10))
+
+# Media files (archivos subidos por usuarios): portadas procesadas en runtime
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
@@ -1,6 +1,9 @@
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from featured import views
+from django.conf.urls.static import static
+from CaSy.estaticos import servir_estatico, servir_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -10,4 +13,13 @@ urlpatterns = [
     path('about/', views.about, name='about'),
     path('carrito/', include('carrito.urls')),
     path("catalog/", include("catalog.urls")),
-]
\ No newline at end of file
+]
+
+if settings.SERVIR_ESTATICOS and not settings.DEBUG:
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % settings.STATIC_URL.lstrip('/'), servir_estatico),
+        re_path(r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'), servir_media),
+    ]
+
+# Portadas procesadas en desarrollo (en producción las sirve el proxy o SERVIR_ESTATICOS)
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,246 @@
+# CaSy/vendor.py
+"""
+Dependencias de front-end servidas desde static/vendor en lugar de CDNs.
+
+`python manage.py vendorizar` toma las versiones fijadas en DEPENDENCIAS desde
+un cache local (settings.VENDOR_CACHE), arma un único bundle de JS, recorta
+Font Awesome a los íconos que usan los templates y deja todo en static/vendor
+junto con vendor.json, que es lo que lee el template tag `vendor_head`.
+"""
+import hashlib
+import json
+import re
+import shutil
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+
+# archivo en el cache -> URL de la versión fijada
+DEPENDENCIAS = {
+    'bootstrap/bootstrap.min.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.8/dist/css/bootstrap.min.css',
+    'bootstrap/bootstrap.bundle.min.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.8/dist/js/bootstrap.bundle.min.js',
+    'htmx/htmx.min.js': 'https://unpkg.com/htmx.org@1.9.10/dist/htmx.min.js',
+    'fontawesome/all.min.css': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css',
+    'fontawesome/fa-solid-900.woff2': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/fa-solid-900.woff2',
+    'fontawesome/fa-regular-400.woff2': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/fa-regular-400.woff2',
+    'fontawesome/fa-brands-400.woff2': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/fa-brands-400.woff2',
+    'poppins/poppins-latin-400-normal.woff2': 'https://cdn.jsdelivr.net/npm/@fontsource/poppins@5.0.8/files/poppins-latin-400-normal.woff2',
+    'poppins/poppins-latin-600-normal.woff2': 'https://cdn.jsdelivr.net/npm/@fontsource/poppins@5.0.8/files/poppins-latin-600-normal.woff2',
+    'poppins/poppins-latin-700-normal.woff2': 'https://cdn.jsdelivr.net/npm/@fontsource/poppins@5.0.8/files/poppins-latin-700-normal.woff2',
+}
+
+# Orden del bundle: htmx no depende de bootstrap, pero theme.js usa window.htmx
+BUNDLE_JS = ['bootstrap/bootstrap.bundle.min.js', 'htmx/htmx.min.js']
+
+FUENTES_FA = ['fa-solid-900', 'fa-regular-400', 'fa-brands-400']
+PESOS_POPPINS = [400, 600, 700]
+# Rango latin de Google Fonts / Fontsource
+UNICODE_LATIN = (
+    'U+0000-00FF,U+0131,U+0152-0153,U+02BB-02BC,U+02C6,U+02DA,U+02DC,U+0304,'
+    'U+0308,U+0329,U+2000-206F,U+2074,U+20AC,U+2122,U+2191,U+2193,U+2212,U+2215,U+FEFF,U+FFFD'
+)
+
+# El manifest storage falla si el .map referenciado no existe
+_SOURCE_MAP = re.compile(r'^\s*(/\*#\s*sourceMappingURL=.*?\*/|//#\s*sourceMappingURL=.*)$', re.M)
+_CLASE_FA = re.compile(r'\bfa-[a-z0-9-]+')
+_SELECTOR_ICONO = re.compile(r'^\.(fa-[a-z0-9-]+)(?:::?before)?$')
+_CODIGO_ICONO = re.compile(r'(?:content|--fa)\s*:\s*"\\([0-9a-fA-F]+)"')
+_URL_FUENTE = re.compile(r'url\(\.\./webfonts/([a-z0-9-]+)\.[a-z0-9]+\)')
+
+
+class ErrorVendor(Exception):
+    """Falta un archivo en el cache o no coincide con el lock"""
+
+
+def directorio_cache():
+    return Path(getattr(settings, 'VENDOR_CACHE', settings.BASE_DIR / '.vendor-cache'))
+
+
+def directorio_vendor():
+    return Path(settings.STATICFILES_DIRS[0]) / 'vendor'
+
+
+def sha256(ruta):
+    return hashlib.sha256(Path(ruta).read_bytes()).hexdigest()
+
+
+def descargar_faltantes(cache):
+    """Descarga al cache las dependencias que falten. Devuelve los nombres descargados."""
+    descargados = []
+    for nombre, url in DEPENDENCIAS.items():
+        destino = cache / nombre
+        if destino.exists():
+            continue
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        with urllib.request.urlopen(url, timeout=30) as respuesta, open(destino, 'wb') as archivo:
+            shutil.copyfileobj(respuesta, archivo)
+        descargados.append(nombre)
+    return descargados
+
+
+def verificar_cache(cache, lock):
+    """Chequea que estén todos los archivos y que coincidan con el lock anterior"""
+    faltantes = [nombre for nombre in DEPENDENCIAS if not (cache / nombre).exists()]
+    if faltantes:
+        raise ErrorVendor(
+            'Faltan en el cache ' + str(cache) + ':\n' +
+            '\n'.join(f'  {nombre} <- {DEPENDENCIAS[nombre]}' for nombre in faltantes)
+        )
+    hashes = {nombre: sha256(cache / nombre) for nombre in DEPENDENCIAS}
+    distintos = [n for n, h in hashes.items() if n in lock and lock[n] != h]
+    if distintos:
+        raise ErrorVendor('No coinciden con vendor.json (¿cambió la versión?): ' + ', '.join(distintos))
+    return hashes
+
+
+def iconos_usados(directorios):
+    """Clases fa-* que aparecen en templates y JS del proyecto"""
+    usados = set()
+    for directorio in directorios:
+        for ruta in Path(directorio).rglob('*'):
+            if ruta.suffix in ('.html', '.js') and 'vendor' not in ruta.parts:
+                usados.update(_CLASE_FA.findall(ruta.read_text(encoding='utf-8', errors='ignore')))
+    return usados
+
+
+def reglas_css(texto):
+    """Separa el CSS en reglas de primer nivel (prelude, cuerpo) respetando bloques anidados"""
+    reglas = []
+    i = 0
+    while i < len(texto):
+        inicio = texto.find('{', i)
+        if inicio < 0:
+            break
+        profundidad = 0
+        for j in range(inicio, len(texto)):
+            if texto[j] == '{':
+                profundidad += 1
+            elif texto[j] == '}':
+                profundidad -= 1
+                if profundidad == 0:
+                    break
+        reglas.append((texto[i:inicio].strip(), texto[inicio + 1:j]))
+        i = j + 1
+    return reglas
+
+
+def recortar_fontawesome(css, usados, fuentes):
+    """
+    Deja solo los íconos usados (más el núcleo de Font Awesome) y las @font-face
+    de las fuentes que se publican. Devuelve (css, codepoints).
+    """
+    salida = []
+    codepoints = set()
+    for prelude, cuerpo in reglas_css(_SOURCE_MAP.sub('', css)):
+        if prelude.startswith('@font-face'):
+            archivos = set(_URL_FUENTE.findall(cuerpo))
+            if not archivos or not archivos <= set(fuentes):
+                continue
+            # Solo se publica el woff2 (sin el fallback .ttf)
+            cuerpo = re.sub(r'src\s*:[^;}]*', f'src:url(../webfonts/{archivos.pop()}.woff2) format("woff2")', cuerpo)
+            salida.append(f'{prelude}{{{cuerpo}}}')
+            continue
+
+        selectores = [s.strip() for s in prelude.split(',')]
+        codigo = _CODIGO_ICONO.search(cuerpo)
+        iconos = [_SELECTOR_ICONO.match(s) for s in selectores]
+        if codigo and all(iconos):
+            vigentes = [s for s, m in zip(selectores, iconos) if m.group(1) in usados]
+            if vigentes:
+                codepoints.add(int(codigo.group(1), 16))
+                salida.append(f'{",".join(vigentes)}{{{cuerpo}}}')
+            continue
+
+        salida.append(f'{prelude}{{{cuerpo}}}')
+    return ''.join(salida), codepoints
+
+
+def subconjunto_fuente(origen, destino, codepoints):
+    """
+    Recorta la fuente woff2 a los codepoints dados. Sin fontTools o brotli
+    (necesario para leer y escribir woff2) se copia la fuente completa.
+    """
+    try:
+        import brotli  # noqa: F401
+        from fontTools import subset
+    except ImportError:
+        shutil.copyfile(origen, destino / origen.name)
+        return
+
+    opciones = subset.Options()
+    opciones.flavor = 'woff2'
+    opciones.layout_features = ['*']
+    fuente = subset.load_font(str(origen), opciones)
+    recortador = subset.Subsetter(opciones)
+    recortador.populate(unicodes=codepoints)
+    recortador.subset(fuente)
+    subset.save_font(fuente, str(destino / origen.name), opciones)
+
+
+def css_poppins():
+    return ''.join(
+        '@font-face{font-family:"Poppins";font-style:normal;font-weight:%d;font-display:swap;'
+        'src:url(poppins-latin-%d-normal.woff2) format("woff2");unicode-range:%s}' % (peso, peso, UNICODE_LATIN)
+        for peso in PESOS_POPPINS
+    )
+
+
+def construir(cache=None, descargar=False):
+    """Arma static/vendor desde el cache y devuelve el manifiesto escrito"""
+    cache = Path(cache or directorio_cache())
+    vendor = directorio_vendor()
+    ruta_manifiesto = vendor / 'vendor.json'
+    lock = json.loads(ruta_manifiesto.read_text())['fuentes'] if ruta_manifiesto.exists() else {}
+
+    if descargar:
+        descargar_faltantes(cache)
+    hashes = verificar_cache(cache, lock)
+
+    if vendor.exists():
+        shutil.rmtree(vendor)
+    for sub in ('bootstrap', 'htmx', 'fontawesome/css', 'fontawesome/webfonts', 'poppins'):
+        (vendor / sub).mkdir(parents=True, exist_ok=True)
+
+    # Bootstrap CSS
+    css_bootstrap = (cache / 'bootstrap/bootstrap.min.css').read_text(encoding='utf-8')
+    (vendor / 'bootstrap/bootstrap.min.css').write_text(_SOURCE_MAP.sub('', css_bootstrap), encoding='utf-8')
+
+    # Un solo JS, cargado con defer
+    partes = [_SOURCE_MAP.sub('', (cache / nombre).read_text(encoding='utf-8')).strip() for nombre in BUNDLE_JS]
+    (vendor / 'vendor.bundle.js').write_text(';\n'.join(partes) + ';\n', encoding='utf-8')
+    # htmx suelto para el admin, que no carga Bootstrap
+    htmx = _SOURCE_MAP.sub('', (cache / 'htmx/htmx.min.js').read_text(encoding='utf-8'))
+    (vendor / 'htmx/htmx.min.js').write_text(htmx, encoding='utf-8')
+
+    # Font Awesome recortado
+    usados = iconos_usados([Path(settings.BASE_DIR) / app for app in ('featured', 'catalog', 'carrito', 'about', 'questions')]
+                           + [Path(settings.STATICFILES_DIRS[0]) / 'js'])
+    css_fa, codepoints = recortar_fontawesome(
+        (cache / 'fontawesome/all.min.css').read_text(encoding='utf-8'), usados, FUENTES_FA
+    )
+    (vendor / 'fontawesome/css/fontawesome.min.css').write_text(css_fa, encoding='utf-8')
+    for nombre in FUENTES_FA:
+        subconjunto_fuente(cache / f'fontawesome/{nombre}.woff2', vendor / 'fontawesome/webfonts', codepoints)
+
+    # Poppins
+    for peso in PESOS_POPPINS:
+        nombre = f'poppins-latin-{peso}-normal.woff2'
+        shutil.copyfile(cache / f'poppins/{nombre}', vendor / 'poppins' / nombre)
+    (vendor / 'poppins/poppins.css').write_text(css_poppins(), encoding='utf-8')
+
+    manifiesto = {
+        'fuentes': hashes,
+        'iconos': sorted(usados),
+        'css': [
+            'vendor/bootstrap/bootstrap.min.css',
+            'vendor/fontawesome/css/fontawesome.min.css',
+            'vendor/poppins/poppins.css',
+        ],
+        'js': 'vendor/vendor.bundle.js',
+        'htmx': 'vendor/htmx/htmx.min.js',
+        # El ícono del carrito está en la navbar de todas las páginas
+        'preload': ['vendor/fontawesome/webfonts/fa-solid-900.woff2'],
+    }
+    ruta_manifiesto.write_text(json.dumps(manifiesto, indent=2), encoding='utf-8')
+    return manifiesto
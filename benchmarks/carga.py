@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+"""
+Prueba de carga del storefront: usuarios concurrentes que buscan en el
+catálogo, abren un juego, lo agregan al carrito por htmx y ven el carrito.
+
+    # contra un servidor ya levantado
+    python benchmarks/carga.py --url http://127.0.0.1:8000 --concurrencia 100 --duracion 30
+
+    # levanta ASGI (python -m CaSy.servidor) y WSGI (gunicorn o runserver) y compara
+    python benchmarks/carga.py --comparar --workers 2
+
+Necesita httpx (requeriments.txt). Reporta requests/s y p50/p95/p99 por endpoint.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+RAIZ = Path(__file__).resolve().parent.parent
+BUSQUEDAS = ['', 'fifa', 'call', 'god', 'spider', 'gran', 'mortal', 'lego', 'resident', 'zzz']
+_DETALLE = re.compile(r'href="(/catalogo/juego/[^"/]+/)"')
+_AGREGAR = re.compile(r'hx-post="(/carrito/agregar/\d+/)\?tipo=(\w+)"')
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+class Resultados:
+    def __init__(self):
+        self.latencias = defaultdict(list)
+        self.errores = defaultdict(int)
+
+    def medir(self, endpoint, inicio, respuesta):
+        self.latencias[endpoint].append((time.perf_counter() - inicio) * 1000)
+        if respuesta is None or respuesta.status_code >= 400:
+            self.errores[endpoint] += 1
+
+    def resumen(self, duracion):
+        filas = {}
+        for endpoint, valores in sorted(self.latencias.items()):
+            filas[endpoint] = {
+                'requests': len(valores),
+                'errores': self.errores[endpoint],
+                'p50_ms': round(statistics.median(valores), 1),
+                'p95_ms': round(percentil(valores, 95), 1),
+                'p99_ms': round(percentil(valores, 99), 1),
+            }
+        total = sum(len(v) for v in self.latencias.values())
+        return {
+            'requests': total,
+            'errores': sum(self.errores.values()),
+            'rps': round(total / duracion, 1) if duracion else 0.0,
+            'endpoints': filas,
+        }
+
+
+async def pedir(cliente, resultados, endpoint, metodo, url, **kwargs):
+    inicio = time.perf_counter()
+    try:
+        respuesta = await cliente.request(metodo, url, **kwargs)
+    except httpx.HTTPError:
+        respuesta = None
+    resultados.medir(endpoint, inicio, respuesta)
+    return respuesta
+
+
+async def usuario(url, fin, resultados, semilla):
+    """Un visitante: sesión y cookie CSRF propias, como un navegador"""
+    azar = random.Random(semilla)
+    async with httpx.AsyncClient(base_url=url, timeout=30) as cliente:
+        while time.perf_counter() < fin:
+            termino = azar.choice(BUSQUEDAS)
+            listado = await pedir(cliente, resultados, 'listado', 'GET', '/catalogo/', params={'q': termino} if termino else None)
+            if listado is None:
+                continue
+            detalles = _DETALLE.findall(listado.text)
+            agregables = _AGREGAR.findall(listado.text)
+            if detalles:
+                await pedir(cliente, resultados, 'detalle', 'GET', azar.choice(detalles))
+            if agregables:
+                ruta, tipo = azar.choice(agregables)
+                await pedir(
+                    cliente, resultados, 'carrito_agregar', 'POST', ruta, params={'tipo': tipo},
+                    headers={'HX-Request': 'true', 'X-CSRFToken': cliente.cookies.get('csrftoken', '')},
+                )
+                await pedir(cliente, resultados, 'carrito_ver', 'GET', '/carrito/ver/', headers={'HX-Request': 'true'})
+
+
+async def correr(url, concurrencia, duracion):
+    resultados = Resultados()
+    inicio = time.perf_counter()
+    fin = inicio + duracion
+    await asyncio.gather(*(usuario(url, fin, resultados, i) for i in range(concurrencia)))
+    return resultados.resumen(time.perf_counter() - inicio)
+
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def esperar_puerto(puerto, proceso, timeout=60):
+    limite = time.time() + timeout
+    while time.time() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError(f'El servidor terminó con código {proceso.returncode}')
+        try:
+            with socket.create_connection(('127.0.0.1', puerto), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'El puerto {puerto} no respondió en {timeout}s')
+
+
+def comando_wsgi(puerto, workers):
+    """gunicorn con threads si está instalado; si no, el runserver (WSGI con un thread por request)"""
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        return [sys.executable, 'manage.py', 'runserver', f'127.0.0.1:{puerto}', '--noreload']
+    return [
+        sys.executable, '-m', 'gunicorn', 'CaSy.wsgi:application', '-b', f'127.0.0.1:{puerto}',
+        '--workers', str(workers), '--threads', '8',
+    ]
+
+
+def servidores(workers):
+    return {
+        'asgi': lambda puerto: [sys.executable, '-m', 'CaSy.servidor', '--port', str(puerto), '--workers', str(workers)],
+        'wsgi': lambda puerto: comando_wsgi(puerto, workers),
+    }
+
+
+def comparar(concurrencia, duracion, workers, entorno=None):
+    resultados = {}
+    for modo, comando in servidores(workers).items():
+        puerto = puerto_libre()
+        proceso = subprocess.Popen(comando(puerto), cwd=RAIZ, env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            esperar_puerto(puerto, proceso)
+            url = f'http://127.0.0.1:{puerto}'
+            # Calentar: imports, conexiones y cache de templates
+            asyncio.run(correr(url, 2, 2))
+            resultados[modo] = asyncio.run(correr(url, concurrencia, duracion))
+        finally:
+            proceso.terminate()
+            proceso.wait(timeout=10)
+    return resultados
+
+
+def imprimir(modo, resumen):
+    print(f"\n{modo}: {resumen['rps']} req/s, {resumen['requests']} requests, {resumen['errores']} errores")
+    print(f"  {'endpoint':<16}{'n':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for endpoint, fila in resumen['endpoints'].items():
+        print(f"  {endpoint:<16}{fila['requests']:>8}{fila['p50_ms']:>9}{fila['p95_ms']:>9}{fila['p99_ms']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prueba de carga del catálogo y el carrito')
+    parser.add_argument('--url', help='Servidor ya levantado')
+    parser.add_argument('--comparar', action='store_true', help='Levanta ASGI y WSGI y los compara')
+    parser.add_argument('--concurrencia', type=int, default=50)
+    parser.add_argument('--duracion', type=float, default=20, help='Segundos por corrida')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--json', help='Guardar los resultados en este archivo')
+    opciones = parser.parse_args()
+
+    if opciones.comparar:
+        resultados = comparar(opciones.concurrencia, opciones.duracion, opciones.workers)
+    elif opciones.url:
+        resultados = {opciones.url: asyncio.run(correr(opciones.url, opciones.concurrencia, opciones.duracion))}
+    else:
+        parser.error('Indicar --url o --comparar')
+
+    for modo, resumen in resultados.items():
+        imprimir(modo, resumen)
+    if opciones.json:
+        Path(opciones.json).write_text(json.dumps(resultados, indent=2), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()
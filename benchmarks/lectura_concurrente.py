@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+"""
+Lecturas del storefront mientras corre `python manage.py ps5`.
+
+Para cada modo copia db.sqlite3 a un directorio temporal, lanza la
+importación sobre la copia y al mismo tiempo N threads hacen las consultas
+del listado (COUNT + página, con y sin búsqueda) y del detalle.
+
+    python benchmarks/lectura_concurrente.py --lectores 8
+    python benchmarks/lectura_concurrente.py --modos ajustado --archivo stock_ps5.csv
+
+Modos: 'django' es SQLite como venía (journal de rollback, sin busy timeout);
+'ajustado' es CaSy/basedatos.py con WAL, PRAGMAs y el alias 'lectura'.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from carga import percentil
+
+RAIZ = Path(__file__).resolve().parent.parent
+BUSQUEDAS = ['', 'fifa', 'call', 'god', 'spider', 'lego']
+MODOS = {
+    'django': {'SQLITE_TUNING': '0', 'journal_mode': 'DELETE'},
+    'ajustado': {'SQLITE_TUNING': '1', 'DB_LECTURA': '1', 'journal_mode': 'WAL'},
+}
+
+
+def lector(alias, ids, fin, latencias, errores, semilla):
+    from django.db import OperationalError, connections
+    from catalog.models import Juego
+
+    azar = random.Random(semilla)
+    try:
+        while time.monotonic() < fin:
+            inicio = time.perf_counter()
+            try:
+                juegos = Juego.objects.using(alias).filter(disponible=True).order_by('nombre')
+                termino = azar.choice(BUSQUEDAS)
+                if termino:
+                    juegos = juegos.filter(nombre__icontains=termino)
+                juegos.count()
+                list(juegos[:24])
+                Juego.objects.using(alias).filter(id=azar.choice(ids)).first()
+            except OperationalError as e:
+                errores.append(str(e))
+                continue
+            latencias.append((time.perf_counter() - inicio) * 1000)
+    finally:
+        connections.close_all()
+
+
+def medir_lecturas(lectores, duracion):
+    """Corre dentro del subproceso, con el entorno del modo ya aplicado"""
+    import django
+
+    sys.path.insert(0, str(RAIZ))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'CaSy.settings')
+    django.setup()
+
+    from catalog.models import Juego
+    from CaSy.basedatos import alias_lectura
+
+    alias = alias_lectura()
+    ids = list(Juego.objects.using(alias).values_list('id', flat=True))
+    latencias, errores = [], []
+    fin = time.monotonic() + duracion
+    hilos = [
+        threading.Thread(target=lector, args=(alias, ids, fin, latencias, errores, i))
+        for i in range(lectores)
+    ]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    print(json.dumps({
+        'alias': alias,
+        'lecturas': len(latencias),
+        'lecturas_s': round(len(latencias) / duracion, 1),
+        'p50_ms': round(percentil(latencias, 50), 1),
+        'p95_ms': round(percentil(latencias, 95), 1),
+        'p99_ms': round(percentil(latencias, 99), 1),
+        'errores': len(errores),
+        'primer_error': errores[0] if errores else '',
+    }))
+
+
+def correr_modo(modo, archivo, lectores, duracion):
+    config = MODOS[modo]
+    with tempfile.TemporaryDirectory() as temporal:
+        copia = Path(temporal) / 'db.sqlite3'
+        shutil.copyfile(RAIZ / 'db.sqlite3', copia)
+        conexion = sqlite3.connect(copia)
+        conexion.execute(f"PRAGMA journal_mode = {config['journal_mode']}")
+        conexion.close()
+
+        entorno = {
+            **os.environ,
+            'SQLITE_PATH': str(copia),
+            'CACHE_DIR': str(Path(temporal) / 'cache'),
+            **{k: v for k, v in config.items() if k.isupper()},
+        }
+        inicio = time.perf_counter()
+        importacion = subprocess.Popen(
+            [sys.executable, 'manage.py', 'ps5', '--file', str(archivo)],
+            cwd=RAIZ, env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        lecturas = subprocess.run(
+            [sys.executable, __file__, '--lector', '--lectores', str(lectores), '--duracion', str(duracion)],
+            cwd=RAIZ, env=entorno, capture_output=True, text=True, check=True,
+        )
+        _, error_importacion = importacion.communicate()
+        resultado = json.loads(lecturas.stdout.strip().splitlines()[-1])
+        resultado['importacion_s'] = round(time.perf_counter() - inicio, 1)
+        resultado['importacion_ok'] = importacion.returncode == 0
+        if importacion.returncode:
+            resultado['importacion_error'] = error_importacion.strip().splitlines()[-1:]
+        return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Throughput de lectura durante una importación')
+    parser.add_argument('--archivo', default='stock_ps5.csv')
+    parser.add_argument('--lectores', type=int, default=8)
+    parser.add_argument('--duracion', type=float, default=15, help='Segundos de lecturas por modo')
+    parser.add_argument('--modos', default='django,ajustado')
+    parser.add_argument('--json', help='Guardar los resultados en este archivo')
+    parser.add_argument('--lector', action='store_true', help=argparse.SUPPRESS)
+    opciones = parser.parse_args()
+
+    if opciones.lector:
+        medir_lecturas(opciones.lectores, opciones.duracion)
+        return
+
+    archivo = (RAIZ / opciones.archivo).resolve()
+    resultados = {}
+    for modo in opciones.modos.split(','):
+        resultados[modo] = correr_modo(modo, archivo, opciones.lectores, opciones.duracion)
+
+    print(f"\n{'modo':<10}{'lect/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'errores':>9}{'import s':>10}")
+    for modo, r in resultados.items():
+        print(f"{modo:<10}{r['lecturas_s']:>9}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}{r['errores']:>9}{r['importacion_s']:>10}")
+        if r['primer_error']:
+            print(f"  ⚠️  {r['primer_error']}")
+        if not r['importacion_ok']:
+            print(f"  ❌ ps5 falló: {r.get('importacion_error')}")
+    if opciones.json:
+        Path(opciones.json).write_text(json.dumps(resultados, indent=2), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Catálogos y CSV de proveedores sintéticos para benchmarks/suite.py.
+
+Los nombres siguen la forma de los reales ("Titulo Subtitulo 3 PS4") y los
+CSV copian los formatos de stock_ps4.csv, stock_ps5.csv, stock_secus.csv y
+juegos.csv (maestros): parte de las filas nombra juegos del catálogo con
+ruido de proveedor (mayúsculas, ediciones, precios con $ y puntos) y el resto
+no existe, para que el matcheo difuso trabaje como en una importación real.
+"""
+import csv
+import random
+from decimal import Decimal
+
+PALABRAS = [
+    'Assassin', 'Battle', 'Call', 'Dark', 'Dragon', 'Eternal', 'Final', 'Ghost', 'Grand', 'Hollow',
+    'Infinite', 'Just', 'Kingdom', 'Legend', 'Mortal', 'Need', 'Outer', 'Persona', 'Red', 'Resident',
+    'Shadow', 'Sonic', 'Spider', 'Star', 'Street', 'Tales', 'Tomb', 'Ultimate', 'Watch', 'Yakuza',
+]
+SUSTANTIVOS = [
+    'Creed', 'Field', 'Duty', 'Souls', 'Ball', 'Fantasy', 'Recon', 'Theft', 'Knight', 'Cause',
+    'Hearts', 'Heroes', 'Kombat', 'Speed', 'Worlds', 'Rising', 'Redemption', 'Evil', 'Tactics', 'Racing',
+    'Frontiers', 'Man', 'Wars', 'Fighter', 'Arise', 'Raider', 'Dogs', 'Zero', 'Legacy', 'Odyssey',
+]
+EDICIONES = ['', '', '', ' Deluxe Edition', ' Gold Edition', ' Remastered', ' GOTY']
+GENEROS = ['Acción', 'Aventura', 'Deportes', 'Carreras', 'Terror', 'Rol', 'Lucha', 'Estrategia']
+# Términos de búsqueda: palabras que existen y una que no
+BUSQUEDAS = ['creed', 'dark souls', 'fantasy', 'kombat', 'spider', 'zzz inexistente']
+
+
+def nombre_juego(indice, azar):
+    base = f'{azar.choice(PALABRAS)} {azar.choice(SUSTANTIVOS)} {indice // 100 + 1}'
+    return base + azar.choice(EDICIONES)
+
+
+def juegos_sinteticos(cantidad, semilla=0):
+    """Instancias de Juego sin guardar (para bulk_create), reproducibles por semilla"""
+    from catalog.busqueda import normalizar_nombre
+    from catalog.models import Juego
+
+    azar = random.Random(semilla)
+    for indice in range(cantidad):
+        consola = 'ps5' if indice % 3 == 0 else 'ps4'
+        nombre = f'{nombre_juego(indice, azar)} {consola.upper()}'
+        precio = Decimal(azar.randrange(5000, 40000, 500))
+        secundario = azar.random() < 0.3
+        yield Juego(
+            nombre=nombre,
+            nombre_normalizado=normalizar_nombre(nombre),
+            consola=consola,
+            destacado=azar.random() < 0.02,
+            descripcion=f'Juego sintético número {indice}.',
+            precio=precio,
+            recargo=Decimal(3000),
+            precio_secundario=precio - 2000 if secundario else None,
+            recargo_secundario=Decimal(2500) if secundario else None,
+            tiene_secundario=secundario,
+            imagen='img/default.png',
+            disponible=azar.random() < 0.9,
+        )
+
+
+def precio_proveedor(pesos):
+    """17500 -> '$17.500', como en las planillas"""
+    return '$' + f'{pesos:,}'.replace(',', '.')
+
+
+def _filas(nombres, cantidad, azar, proporcion_existentes=0.8):
+    """(nombre, precio) mezclando juegos del catálogo con ruido y juegos inexistentes"""
+    for indice in range(cantidad):
+        if nombres and azar.random() < proporcion_existentes:
+            nombre = azar.choice(nombres)
+            for sufijo in (' PS4', ' PS5'):
+                nombre = nombre.removesuffix(sufijo)
+            if azar.random() < 0.3:
+                nombre = nombre.upper()
+        else:
+            nombre = f'Inexistente {azar.choice(SUSTANTIVOS)} {indice}'
+        yield nombre, azar.randrange(5000, 40000, 100)
+
+
+def escribir_stock_ps4(ruta, nombres, cantidad, semilla=0):
+    azar = random.Random(semilla)
+    with open(ruta, 'w', encoding='utf-8-sig', newline='') as archivo:
+        escritor = csv.writer(archivo, delimiter=';')
+        escritor.writerow(['JUEGOS', 'PRECIO DE COMPRA', 'GANANCIAS', 'PRECIO'])
+        for nombre, precio in _filas(nombres, cantidad, azar):
+            escritor.writerow([
+                f'🦊{nombre}   {precio_proveedor(precio)} ',
+                precio_proveedor(precio),
+                3000,
+                precio_proveedor(precio + 3000),
+            ])
+
+
+def escribir_stock_ps5(ruta, nombres, cantidad, semilla=0):
+    azar = random.Random(semilla)
+    with open(ruta, 'w', encoding='utf-8-sig', newline='') as archivo:
+        escritor = csv.writer(archivo, delimiter=';')
+        escritor.writerow(['Juegos', 'Precio', 'Disponible'])
+        for nombre, precio in _filas(nombres, cantidad, azar):
+            disponible = '' if azar.random() < 0.9 else 'NO'
+            escritor.writerow([f'{nombre} (PS5) {precio_proveedor(precio)}', precio, disponible])
+
+
+def escribir_stock_secus(ruta, nombres, cantidad, semilla=0):
+    azar = random.Random(semilla)
+    with open(ruta, 'w', encoding='utf-8-sig', newline='') as archivo:
+        escritor = csv.writer(archivo, delimiter=';')
+        escritor.writerow(['JUEGOS', 'PRECIO', 'DISPONIBLE'])
+        for nombre, precio in _filas(nombres, cantidad, azar):
+            escritor.writerow([nombre, precio_proveedor(precio), ''])
+
+
+def escribir_maestros(ruta, nombres, cantidad, semilla=0):
+    """Formato de juegos.csv (comando maestros): nombre con consola, descripción y género"""
+    azar = random.Random(semilla)
+    with open(ruta, 'w', encoding='utf-8-sig', newline='') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(['nombre', 'descripcion', 'genero', 'destacado'])
+        for indice in range(cantidad):
+            if nombres and azar.random() < 0.8:
+                nombre = azar.choice(nombres)
+            else:
+                nombre = f'Nuevo {azar.choice(SUSTANTIVOS)} {indice} PS4'
+            escritor.writerow([nombre, f'Descripción de {nombre}.', azar.choice(GENEROS), int(azar.random() < 0.05)])
+
+
+ESCRITORES = {
+    'ps4': ('stock_ps4.csv', escribir_stock_ps4),
+    'ps5': ('stock_ps5.csv', escribir_stock_ps5),
+    'secus': ('stock_secus.csv', escribir_stock_secus),
+    'maestros': ('juegos.csv', escribir_maestros),
+}
@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+"""
+Suite de benchmarks sobre catálogos sintéticos (benchmarks/sintetico.py).
+
+Para cada tamaño arma una base SQLite temporal con N juegos y CSV de
+proveedores en los formatos stock_*.csv / juegos.csv, y mide:
+
+- los flujos del storefront con el test client de Django: listado, búsqueda,
+  detalle y carrito (latencias y consultas SQL por request);
+- las importaciones `maestros`, `ps4`, `ps5` y `secus` (tiempo total);
+- con --http, carga concurrente contra ASGI y WSGI (benchmarks/carga.py).
+
+    python benchmarks/suite.py --tamanos 1000,10000 --salida resultados.json
+    python benchmarks/suite.py --tamanos 1000 --base resultados.json   # falla si hay regresiones
+    python benchmarks/suite.py --solo-comparar nuevo.json --base viejo.json
+
+Una métrica de tiempo es regresión si crece más que --tolerancia (relativo)
+y más que --piso-ms (absoluto, para no fallar por ruido en valores chicos);
+las consultas por request son regresión si aumentan en cualquier cantidad.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from carga import comparar as comparar_http, percentil
+
+RAIZ = Path(__file__).resolve().parent.parent
+COMANDOS = ['maestros', 'ps4', 'ps5', 'secus']
+FLUJOS = ['listado', 'busqueda', 'detalle', 'carrito']
+
+
+def preparar_django():
+    import django
+
+    sys.path.insert(0, str(RAIZ))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'CaSy.settings')
+    django.setup()
+
+
+def generar(tamano, filas_csv, directorio, semilla):
+    """Corre dentro del subproceso: catálogo sintético en la base temporal y los CSV"""
+    preparar_django()
+    from catalog.importacion import en_lotes
+    from catalog.models import Juego
+    from sintetico import ESCRITORES, juegos_sinteticos
+
+    inicio = time.perf_counter()
+    for lote in en_lotes(juegos_sinteticos(tamano, semilla), 2000):
+        Juego.objects.bulk_create(lote)
+    nombres = list(Juego.objects.values_list('nombre', flat=True))
+    for archivo, escribir in ESCRITORES.values():
+        escribir(Path(directorio) / archivo, nombres, filas_csv, semilla)
+    print(json.dumps({'generacion_s': round(time.perf_counter() - inicio, 2)}))
+
+
+def medir_flujos(repeticiones, semilla):
+    """Corre dentro del subproceso: cada flujo `repeticiones` veces con el test client"""
+    preparar_django()
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from catalog.models import Juego
+    from sintetico import BUSQUEDAS
+
+    azar = random.Random(semilla)
+    ids = list(Juego.objects.filter(disponible=True).values_list('id', flat=True))
+    paginas = max(1, len(ids) // 24)
+    cliente = Client()
+
+    def listado():
+        return [cliente.get('/catalogo/', {'page': azar.randint(1, paginas)})]
+
+    def busqueda():
+        return [cliente.get('/catalogo/', {'q': azar.choice(BUSQUEDAS)})]
+
+    def detalle():
+        return [cliente.get(f'/catalogo/juego/{azar.choice(ids)}-juego/')]
+
+    def carrito():
+        agregar = cliente.post(f'/carrito/agregar/{azar.choice(ids)}/?tipo=primario', HTTP_HX_REQUEST='true')
+        return [agregar, cliente.get('/carrito/ver/', HTTP_HX_REQUEST='true')]
+
+    resultados = {}
+    for nombre, flujo in zip(FLUJOS, [listado, busqueda, detalle, carrito]):
+        # Calentar: templates compilados, conexiones y caches
+        flujo()
+        latencias, consultas, errores = [], [], 0
+        for _ in range(repeticiones):
+            with CaptureQueriesContext(connection) as capturadas:
+                inicio = time.perf_counter()
+                respuestas = flujo()
+                latencias.append((time.perf_counter() - inicio) * 1000)
+            consultas.append(len(capturadas))
+            errores += sum(1 for r in respuestas if r.status_code >= 400)
+        resultados[nombre] = {
+            'p50_ms': round(percentil(latencias, 50), 2),
+            'p95_ms': round(percentil(latencias, 95), 2),
+            'consultas': max(consultas),
+            'errores': errores,
+        }
+    print(json.dumps(resultados))
+
+
+def subproceso(argumentos, entorno):
+    """Corre este mismo script en modo interno y devuelve el JSON de su última línea"""
+    salida = subprocess.run(
+        [sys.executable, __file__, *argumentos], cwd=RAIZ, env=entorno,
+        capture_output=True, text=True,
+    )
+    if salida.returncode:
+        raise RuntimeError(salida.stderr.strip().splitlines()[-1] if salida.stderr.strip() else 'sin salida')
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def importar(comando, archivo, entorno):
+    inicio = time.perf_counter()
+    proceso = subprocess.run(
+        [sys.executable, 'manage.py', comando, '--file', str(archivo)],
+        cwd=RAIZ, env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    resultado = {'s': round(time.perf_counter() - inicio, 2), 'ok': proceso.returncode == 0}
+    if proceso.returncode:
+        resultado['error'] = proceso.stderr.strip().splitlines()[-1:]
+    return resultado
+
+
+def correr_tamano(tamano, opciones):
+    from sintetico import ESCRITORES
+
+    with tempfile.TemporaryDirectory() as temporal:
+        temporal = Path(temporal)
+        entorno = {
+            **os.environ,
+            'SQLITE_PATH': str(temporal / 'db.sqlite3'),
+            'CACHE_DIR': str(temporal / 'cache'),
+            'LOG_REQUESTS': str(temporal / 'requests.jsonl'),
+        }
+        subprocess.run(
+            [sys.executable, 'manage.py', 'migrate', '-v0'], cwd=RAIZ, env=entorno, check=True, capture_output=True,
+        )
+        resultado = subproceso(
+            ['--generar', str(tamano), '--filas-csv', str(opciones.filas_csv),
+             '--directorio', str(temporal), '--semilla', str(opciones.semilla)],
+            entorno,
+        )
+        resultado['flujos'] = subproceso(
+            ['--flujos', '--repeticiones', str(opciones.repeticiones), '--semilla', str(opciones.semilla)],
+            entorno,
+        )
+        if opciones.http:
+            resultado['http'] = comparar_http(opciones.concurrencia, opciones.duracion_http, opciones.workers, entorno)
+        resultado['importaciones'] = {}
+        for comando in opciones.comandos:
+            archivo = temporal / ESCRITORES[comando][0]
+            resultado['importaciones'][comando] = importar(comando, archivo, entorno)
+        return resultado
+
+
+def version_git():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def metricas(resultados):
+    """{(tamaño, métrica): (valor, es_conteo)} aplanado para comparar corridas"""
+    planas = {}
+    for tamano, r in resultados['tamanos'].items():
+        for flujo, fila in r.get('flujos', {}).items():
+            planas[(tamano, f'{flujo}.p50_ms')] = (fila['p50_ms'], False)
+            planas[(tamano, f'{flujo}.p95_ms')] = (fila['p95_ms'], False)
+            planas[(tamano, f'{flujo}.consultas')] = (fila['consultas'], True)
+        for comando, fila in r.get('importaciones', {}).items():
+            if fila['ok']:
+                planas[(tamano, f'{comando}.ms')] = (fila['s'] * 1000, False)
+        for modo, resumen in r.get('http', {}).items():
+            for endpoint, fila in resumen['endpoints'].items():
+                planas[(tamano, f'http.{modo}.{endpoint}.p95_ms')] = (fila['p95_ms'], False)
+    return planas
+
+
+def regresiones(base, nuevo, tolerancia, piso_ms):
+    antes, despues = metricas(base), metricas(nuevo)
+    encontradas = []
+    for clave in sorted(antes.keys() & despues.keys()):
+        (valor_antes, es_conteo), (valor_despues, _) = antes[clave], despues[clave]
+        if es_conteo:
+            peor = valor_despues > valor_antes
+        else:
+            peor = valor_despues > valor_antes * (1 + tolerancia) and valor_despues - valor_antes > piso_ms
+        if peor:
+            encontradas.append((*clave, valor_antes, valor_despues))
+    return encontradas
+
+
+def imprimir(resultados):
+    print(f"\n{'juegos':>8} {'flujo':<10}{'p50 ms':>9}{'p95 ms':>9}{'SQL':>6}{'errores':>9}")
+    for tamano, r in resultados['tamanos'].items():
+        for flujo, fila in r['flujos'].items():
+            print(f"{tamano:>8} {flujo:<10}{fila['p50_ms']:>9}{fila['p95_ms']:>9}{fila['consultas']:>6}{fila['errores']:>9}")
+    print(f"\n{'juegos':>8} {'comando':<10}{'s':>9}")
+    for tamano, r in resultados['tamanos'].items():
+        print(f"{tamano:>8} {'generar':<10}{r['generacion_s']:>9}")
+        for comando, fila in r['importaciones'].items():
+            print(f"{tamano:>8} {comando:<10}{fila['s']:>9}" + ('' if fila['ok'] else f"  ❌ {fila.get('error')}"))
+    for tamano, r in resultados['tamanos'].items():
+        for modo, resumen in r.get('http', {}).items():
+            print(f"\n{tamano} juegos, {modo}: {resumen['rps']} req/s, {resumen['errores']} errores")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks del storefront y las importaciones sobre catálogos sintéticos')
+    parser.add_argument('--tamanos', default='1000,10000', help='Juegos por catálogo, separados por coma')
+    parser.add_argument('--filas-csv', type=int, default=200, help='Filas de cada CSV de proveedor')
+    parser.add_argument('--repeticiones', type=int, default=50, help='Veces que se mide cada flujo')
+    parser.add_argument('--comandos', default=','.join(COMANDOS), help='Importaciones a medir (vacío: ninguna)')
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--http', action='store_true', help='Agregar carga concurrente contra ASGI y WSGI')
+    parser.add_argument('--concurrencia', type=int, default=20)
+    parser.add_argument('--duracion-http', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--salida', help='Guardar los resultados en este JSON')
+    parser.add_argument('--base', help='JSON de una corrida anterior: termina con código 1 si hay regresiones')
+    parser.add_argument('--solo-comparar', help='No correr nada: comparar este JSON contra --base')
+    parser.add_argument('--tolerancia', type=float, default=0.25, help='Aumento relativo permitido en tiempos')
+    parser.add_argument('--piso-ms', type=float, default=2.0, help='Aumento absoluto ignorado en tiempos')
+    parser.add_argument('--generar', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--directorio', help=argparse.SUPPRESS)
+    parser.add_argument('--flujos', action='store_true', help=argparse.SUPPRESS)
+    opciones = parser.parse_args()
+
+    if opciones.generar is not None:
+        generar(opciones.generar, opciones.filas_csv, opciones.directorio, opciones.semilla)
+        return
+    if opciones.flujos:
+        medir_flujos(opciones.repeticiones, opciones.semilla)
+        return
+
+    opciones.comandos = [c for c in opciones.comandos.split(',') if c]
+    if opciones.solo_comparar:
+        if not opciones.base:
+            parser.error('--solo-comparar necesita --base')
+        resultados = json.loads(Path(opciones.solo_comparar).read_text(encoding='utf-8'))
+    else:
+        resultados = {
+            'fecha': datetime.now().isoformat(timespec='seconds'),
+            'commit': version_git(),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count(),
+            'parametros': {
+                'filas_csv': opciones.filas_csv,
+                'repeticiones': opciones.repeticiones,
+                'semilla': opciones.semilla,
+            },
+            'tamanos': {},
+        }
+        for tamano in opciones.tamanos.split(','):
+            print(f'⏱️  {tamano} juegos...', flush=True)
+            resultados['tamanos'][tamano] = correr_tamano(int(tamano), opciones)
+        imprimir(resultados)
+        if opciones.salida:
+            Path(opciones.salida).write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    if opciones.base:
+        base = json.loads(Path(opciones.base).read_text(encoding='utf-8'))
+        encontradas = regresiones(base, resultados, opciones.tolerancia, opciones.piso_ms)
+        if not encontradas:
+            print(f"\n✅ Sin regresiones contra {opciones.base} ({base.get('commit') or base.get('fecha')})")
+            return
+        print(f'\n❌ {len(encontradas)} regresiones contra {opciones.base}:')
+        for tamano, metrica, antes, despues in encontradas:
+            print(f'  {tamano:>8} {metrica:<32}{antes:>10.1f} -> {despues:.1f}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
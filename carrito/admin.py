@@ -1,3 +1,15 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Pedido
+
+
+@admin.register(Pedido)
+class PedidoAdmin(admin.ModelAdmin):
+    list_display = ['codigo', 'fecha', 'cantidad_items', 'total', 'metodo_pago']
+    list_filter = ['metodo_pago']
+    search_fields = ['codigo']
+    date_hierarchy = 'fecha'
+    readonly_fields = [f.name for f in Pedido._meta.fields]
+
+    def has_add_permission(self, request): return False
+    def has_change_permission(self, request, obj=None): return False
@@ -1,6 +1,6 @@
 # carrito/cart.py - VERSIÓN CORRECTA
 from decimal import Decimal
-from catalog.models import Juego
+from catalog.cache_juegos import aobtener_juego, aobtener_juegos, obtener_juego, obtener_juegos
 
 class Cart:
     def __init__(self, request):
@@ -13,10 +13,33 @@ class Cart:
         
         self.cart = cart
     
+    @classmethod
+    async def acrear(cls, request):
+        """
+        Versión para vistas async: carga la sesión con la API async y después
+        construye el carrito, que ya no necesita tocar la base.
+        """
+        await request.session.aget('cart')
+        return cls(request)
+    
     def add(self, juego_id, tipo_precio='primario', cantidad=1):
         """
         Agrega un juego al carrito con el tipo de precio especificado.
         """
+        item_key = f"{juego_id}_{tipo_precio}"
+        juego = None
+        if item_key not in self.cart:
+            juego = obtener_juego(juego_id)
+        return self._agregar(juego_id, tipo_precio, cantidad, juego)
+    
+    async def aadd(self, juego_id, tipo_precio='primario', cantidad=1, juego=None):
+        """Igual que add(); si la vista ya tiene el juego se evita otra consulta"""
+        item_key = f"{juego_id}_{tipo_precio}"
+        if item_key not in self.cart and juego is None:
+            juego = await aobtener_juego(juego_id)
+        return self._agregar(juego_id, tipo_precio, cantidad, juego)
+    
+    def _agregar(self, juego_id, tipo_precio, cantidad, juego):
         juego_id = str(juego_id)
         tipo_precio = str(tipo_precio)
         
@@ -24,9 +47,7 @@ class Cart:
         item_key = f"{juego_id}_{tipo_precio}"
         
         if item_key not in self.cart:
-            try:
-                juego = Juego.objects.get(id=juego_id)
-            except Juego.DoesNotExist:
+            if juego is None:
                 return False
             
             # 🔧 LÓGICA CORRECTA:
@@ -115,13 +136,20 @@ class Cart:
     
     def get_items(self):
         """Retorna una lista de items del carrito con información completa."""
-        items = []
         juego_ids = [item['juego_id'] for item in self.cart.values()]
         
-        # Obtener todos los juegos de una sola query
-        juegos = Juego.objects.filter(id__in=juego_ids)
-        juegos_dict = {str(juego.id): juego for juego in juegos}
-        
+        # Todos los juegos de una vez (cache por id; la base solo para los que faltan)
+        juegos = obtener_juegos(juego_ids)
+        return self._armar_items({str(juego_id): juego for juego_id, juego in juegos.items()})
+    
+    async def aget_items(self):
+        """get_items() con el ORM async"""
+        juego_ids = [item['juego_id'] for item in self.cart.values()]
+        juegos = await aobtener_juegos(juego_ids)
+        return self._armar_items({str(juego_id): juego for juego_id, juego in juegos.items()})
+    
+    def _armar_items(self, juegos_dict):
+        items = []
         for item_key, item_data in self.cart.items():
             juego_id = item_data['juego_id']
             
@@ -146,9 +174,10 @@ class Cart:
         
         return items
     
-    def get_total_price(self):
+    def get_total_price(self, items=None):
         """Calcula el precio total del carrito (usando precio base)"""
-        items = self.get_items()
+        if items is None:
+            items = self.get_items()
         return sum(item['subtotal'] for item in items)
     
     def get_total_items(self):
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:53
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Pedido',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('codigo', models.CharField(help_text='Va en el mensaje de WhatsApp', max_length=12, unique=True)),
+                ('fecha', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('items', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('total', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('cantidad_items', models.PositiveIntegerField(default=0)),
+                ('metodo_pago', models.CharField(blank=True, default='', max_length=50)),
+            ],
+            options={
+                'ordering': ['-fecha'],
+            },
+        ),
+    ]
@@ -1,3 +1,23 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class Pedido(models.Model):
+    """
+    Snapshot de un checkout: lo que se mandó por WhatsApp, con los precios de
+    ese momento. Solo se agregan, en lote, desde carrito/pedidos.py.
+    """
+    codigo = models.CharField(max_length=12, unique=True, help_text="Va en el mensaje de WhatsApp")
+    fecha = models.DateTimeField(default=timezone.now, db_index=True)
+    # [{juego_id, nombre, consola, tipo_precio, etiqueta, cantidad, precio, subtotal}]
+    items = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    total = models.DecimalField(max_digits=12, decimal_places=2)
+    cantidad_items = models.PositiveIntegerField(default=0)
+    metodo_pago = models.CharField(max_length=50, blank=True, default='')
+
+    class Meta:
+        ordering = ['-fecha']
+
+    def __str__(self):
+        return f"Pedido {self.codigo} - ${self.total:,.0f}"
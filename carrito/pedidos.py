@@ -0,0 +1,83 @@
+# carrito/pedidos.py
+"""
+Checkout: el carrito se arma una sola vez, se congela en un `Pedido` y el
+mensaje de WhatsApp sale de ese snapshot. El Pedido se guarda con
+`EscritorPorLotes` (CaSy/lotes.py), así el request no espera a la base.
+"""
+import secrets
+from decimal import Decimal
+from urllib.parse import quote
+
+from django.conf import settings
+
+from CaSy.lotes import EscritorPorLotes
+from .models import Pedido
+
+NUMERO_WHATSAPP = "5491151594477"
+
+escritor = EscritorPorLotes(
+    Pedido,
+    tamano=getattr(settings, 'PEDIDOS_LOTE', 20),
+    intervalo=getattr(settings, 'PEDIDOS_INTERVALO', 5.0),
+    nombre='pedidos',
+)
+
+
+def nuevo_codigo():
+    """
+    12 caracteres hex (48 bits). El código va en el mensaje de WhatsApp antes de
+    que se escriba el Pedido, así que no se puede regenerar si choca: tiene que
+    ser lo bastante largo para que no choque.
+    """
+    return secrets.token_hex(6).upper()
+
+
+def armar_pedido(items, metodo_pago):
+    """Pedido (sin guardar) a partir de los items de Cart.aget_items()"""
+    snapshot = [
+        {
+            'juego_id': int(item['juego_id']),
+            'nombre': item['juego'].nombre,
+            'consola': item['juego'].consola,
+            'tipo_precio': item['tipo_precio'],
+            'etiqueta': item.get('etiqueta') or '',
+            'cantidad': item['cantidad'],
+            'precio': item['precio'],
+            'subtotal': item['subtotal'],
+        }
+        for item in items
+    ]
+    return Pedido(
+        codigo=nuevo_codigo(),
+        items=snapshot,
+        total=sum((item['subtotal'] for item in items), Decimal('0')),
+        cantidad_items=sum(item['cantidad'] for item in items),
+        metodo_pago=(metodo_pago or 'sin especificar')[:50],
+    )
+
+
+def mensaje_whatsapp(pedido):
+    lineas_juegos = []
+    for item in pedido.items:
+        etiqueta = f"({item['etiqueta']})" if item['etiqueta'] else ""
+        cantidad_texto = f"x{item['cantidad']}" if item['cantidad'] > 1 else ""
+        lineas_juegos.append(f"• {item['nombre']} {etiqueta} {cantidad_texto}".strip())
+
+    return (
+        f"¡Buenas! Vengo de la página web.\n\n"
+        f"Quiero los siguientes juegos:\n"
+        f"{chr(10).join(lineas_juegos)}\n\n"
+        f"Total: ${pedido.total:,.0f}\n"
+        f"Método de pago: {pedido.metodo_pago}\n"
+        f"Pedido: {pedido.codigo}"
+    )
+
+
+def url_whatsapp(pedido):
+    return f"https://wa.me/{NUMERO_WHATSAPP}?text={quote(mensaje_whatsapp(pedido))}"
+
+
+def registrar(pedido):
+    """Encola el Pedido; se escribe en el próximo lote"""
+    escritor.agregar(pedido)
+    return pedido
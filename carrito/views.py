@@ -1,16 +1,21 @@
 # carrito/views.py
-from django.shortcuts import render, get_object_or_404
-from django.http import HttpResponse, JsonResponse
+# Vistas async: la sesión y el ORM se usan con su API async (ver CaSy/asgi.py)
+from django.shortcuts import render
+from django.http import Http404, JsonResponse
 from django.views.decorators.http import require_POST
-from catalog.models import Juego
+from catalog import demanda
+from catalog.cache_juegos import aobtener_juego
+from catalog.condicional import condicional, etag, marca_actual
+from . import pedidos
 from .cart import Cart
-from urllib.parse import quote
 
 @require_POST
-def agregar_al_carrito(request, juego_id):
+async def agregar_al_carrito(request, juego_id):
     """Agrega un juego al carrito con el tipo de precio especificado"""
-    cart = Cart(request)
-    juego = get_object_or_404(Juego, id=juego_id, disponible=True)
+    cart = await Cart.acrear(request)
+    juego = await aobtener_juego(juego_id)
+    if juego is None or not juego.disponible:
+        raise Http404("Juego no encontrado")
     
     # ⭐ NUEVO: Obtener tipo de precio desde el query parameter
     tipo_precio = request.GET.get('tipo', 'primario')
@@ -26,7 +31,8 @@ def agregar_al_carrito(request, juego_id):
             tipo_precio = 'primario'
     
     # Agregar al carrito con el tipo de precio
-    cart.add(juego_id, tipo_precio=tipo_precio)
+    if await cart.aadd(juego_id, tipo_precio=tipo_precio, juego=juego):
+        demanda.registrar(demanda.CARRITO, juego_id)
     
     # Renderiza el badge actualizado + notificación
     context = {
@@ -36,45 +42,52 @@ def agregar_al_carrito(request, juego_id):
     }
     return render(request, 'carrito/badge_update.html', context)
 
-def ver_carrito(request):
+async def validadores_carrito(request):
+    """El popup depende del carrito de la sesión y de los precios del catálogo"""
+    return etag(marca_actual(), await request.session.aget('cart', {})), None
+
+@condicional(validadores_carrito)
+async def ver_carrito(request):
     """Muestra el contenido completo del carrito"""
-    cart = Cart(request)
+    cart = await Cart.acrear(request)
+    items = await cart.aget_items()
     
     context = {
         'cart': cart,
-        'items': cart.get_items(),
-        'total_price': cart.get_total_price(),
+        'items': items,
+        'total_price': cart.get_total_price(items),
         'total_items': cart.get_total_items(),
     }
     return render(request, 'carrito/popup_content.html', context)
 
 @require_POST
-def actualizar_cantidad(request, item_key):
+async def actualizar_cantidad(request, item_key):
     """
     Actualiza la cantidad de un item específico del carrito.
     Ahora usa item_key en lugar de juego_id para soportar precios duales.
     """
-    cart = Cart(request)
+    cart = await Cart.acrear(request)
     cantidad = int(request.POST.get('cantidad', 1))
     
     cart.update_quantity(item_key, cantidad)
+    items = await cart.aget_items()
     
     # Renderiza el contenido actualizado del carrito
     context = {
         'cart': cart,
-        'items': cart.get_items(),
-        'total_price': cart.get_total_price(),
+        'items': items,
+        'total_price': cart.get_total_price(items),
         'total_items': cart.get_total_items(),
     }
     return render(request, 'carrito/cart_items.html', context)
 
 @require_POST
-def eliminar_del_carrito(request, item_key):
+async def eliminar_del_carrito(request, item_key):
     """
     Elimina un item del carrito.
     Ahora usa item_key en lugar de juego_id para soportar precios duales.
     """
-    cart = Cart(request)
+    cart = await Cart.acrear(request)
     cart.remove(item_key)
     
     # Si el carrito quedó vacío, retorna mensaje
@@ -82,62 +95,37 @@ def eliminar_del_carrito(request, item_key):
         return render(request, 'carrito/cart_empty.html')
     
     # Sino, retorna el contenido actualizado
+    items = await cart.aget_items()
     context = {
         'cart': cart,
-        'items': cart.get_items(),
-        'total_price': cart.get_total_price(),
+        'items': items,
+        'total_price': cart.get_total_price(items),
         'total_items': cart.get_total_items(),
     }
     return render(request, 'carrito/cart_items.html', context)
 
 @require_POST
-def vaciar_carrito(request):
+async def vaciar_carrito(request):
     """Vacía todo el carrito"""
-    cart = Cart(request)
+    cart = await Cart.acrear(request)
     cart.clear()
     
     return render(request, 'carrito/cart_empty.html')
 
 @require_POST
-def finalizar_compra(request):
-    """Arma el mensaje de WhatsApp con los juegos del carrito y devuelve el enlace"""
-    cart = Cart(request)
-    items = cart.get_items()
+async def finalizar_compra(request):
+    """
+    Congela el carrito en un Pedido (se guarda en lote, ver carrito/pedidos.py)
+    y devuelve el enlace de WhatsApp con el mensaje armado desde ese snapshot
+    """
+    cart = await Cart.acrear(request)
+    items = await cart.aget_items()
 
     if not items:
         return JsonResponse({'error': 'El carrito está vacío.'}, status=400)
 
-    # 1️⃣ Construir lista de juegos con detalles
-    lineas_juegos = []
-    for item in items:
-        # ⭐ NUEVO: Incluir tipo de precio en el mensaje
-        etiqueta = f"({item['etiqueta']})" if item['tipo_precio'] == 'secundario' or item.get('etiqueta') else ""
-        cantidad_texto = f"x{item['cantidad']}" if item['cantidad'] > 1 else ""
-        
-        linea = f"• {item['juego'].nombre} {etiqueta} {cantidad_texto}".strip()
-        lineas_juegos.append(linea)
-    
-    # 2️⃣ Obtener total
-    total = cart.get_total_price()
-
-    # 3️⃣ Obtener método de pago
-    metodo_pago = request.POST.get('metodo_pago', 'sin especificar')
-
-    # 4️⃣ Construir el mensaje
-    mensaje = (
-        f"¡Buenas! Vengo de la página web.\n\n"
-        f"Quiero los siguientes juegos:\n"
-        f"{chr(10).join(lineas_juegos)}\n\n"
-        f"Total: ${total:,.0f}\n"
-        f"Método de pago: {metodo_pago}"
-    )
-
-    # 5️⃣ Codificar mensaje para WhatsApp
-    mensaje_url = quote(mensaje)
-
-    # 6️⃣ Número de destino
-    numero = "5491151594477"
-    url_whatsapp = f"https://wa.me/{numero}?text={mensaje_url}"
+    pedido = pedidos.registrar(pedidos.armar_pedido(items, request.POST.get('metodo_pago')))
+    demanda.registrar_pedido(pedido)
 
-    # 7️⃣ Devolver respuesta JSON para abrir el link en JS
-    return JsonResponse({'url': url_whatsapp})
\ No newline at end of file
+    # Devolver respuesta JSON para abrir el link en JS
+    return JsonResponse({'url': pedidos.url_whatsapp(pedido)})
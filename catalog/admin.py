@@ -1,27 +1,97 @@
 # catalog/admin.py
+import hashlib
+from decimal import Decimal
+
 from django.contrib import admin
+from django.contrib.admin.helpers import ActionForm
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Case, DecimalField, ExpressionWrapper, F, Value, When
+from django.db.models.functions import Now, Round
+from django.utils.functional import cached_property
 from django.utils.html import format_html
-from django.urls import path
-from .models import Juego, Utilidades
+from django.urls import path, reverse
+from .models import Juego, Utilidades, ImportRun, SupplierAlias, TrabajoImportacion, PortadaSubida, DemandaDiaria
 from .forms import JuegoAdminForm
+from .signals import notificar_catalogo_actualizado
+from . import trabajos
+from .busqueda import filtrar_por_nombre
+from .imagenes import url_imagen
+from .cache_juegos import version_actual
 from django import forms
-from django.shortcuts import render, redirect
-import csv
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_POST
+from django.shortcuts import get_object_or_404, render, redirect
+
+class SupplierAliasInline(admin.TabularInline):
+    model = SupplierAlias
+    extra = 0
+    fields = ['texto_original', 'proveedor', 'consola', 'score', 'confirmado', 'ultima_vez']
+    readonly_fields = ['score', 'ultima_vez']
+
+# Segundos que el admin reutiliza el COUNT de un mismo filtro
+TIMEOUT_CONTEO = 30
+
+class PaginadorConteoCacheado(Paginator):
+    """
+    Paginator que guarda el COUNT del filtro en el cache. La clave lleva la
+    versión del catálogo (cache_juegos), así que las importaciones y acciones
+    masivas lo invalidan; una edición suelta se ve a más tardar en TIMEOUT_CONTEO.
+    """
+
+    @cached_property
+    def count(self):
+        consulta = str(self.object_list.query).encode()
+        clave = f'admin:conteo:v{version_actual()}:{hashlib.md5(consulta).hexdigest()}'
+        conteo = cache.get(clave)
+        if conteo is None:
+            conteo = super().count
+            cache.set(clave, conteo, TIMEOUT_CONTEO)
+        return conteo
+
+class AjustePrecioForm(ActionForm):
+    porcentaje = forms.DecimalField(
+        required=False,
+        max_digits=6,
+        decimal_places=2,
+        label='%',
+        help_text='Para las acciones de ajuste (p. ej. 10 o -5)',
+        widget=forms.NumberInput(attrs={'style': 'width: 6em;', 'step': '0.5'}),
+    )
+
+def ajustar_por_porcentaje(campo, factor):
+    """campo * factor redondeado a pesos, como expresión SQL (un solo UPDATE)"""
+    return Round(ExpressionWrapper(
+        F(campo) * Value(factor),
+        output_field=DecimalField(max_digits=10, decimal_places=2),
+    ))
 
 @admin.register(Juego)
 class JuegoAdmin(admin.ModelAdmin):
     form = JuegoAdminForm
+    inlines = [SupplierAliasInline]
+    action_form = AjustePrecioForm
+    paginator = PaginadorConteoCacheado
+    # Sin el segundo COUNT de toda la tabla en cada página del listado
+    show_full_result_count = False
+    list_per_page = 50
     list_display = [
         'nombre',
         'consola',
         'mostrar_precio',
         'mostrar_precio_secundario',
-        'disponible',
+        'mostrar_disponible',
         'tiene_secundario',
         'es_solo_secundario',
         'fecha_actualizacion'
     ]
     
+    # Columnas que usa el listado (sin la descripción)
+    campos_listado = [
+        'id', 'nombre', 'consola', 'precio', 'recargo', 'precio_secundario', 'recargo_secundario',
+        'disponible', 'tiene_secundario', 'es_solo_secundario', 'fecha_actualizacion',
+    ]
+    
     list_filter = [
         'consola',
         'disponible',
@@ -31,8 +101,6 @@ class JuegoAdmin(admin.ModelAdmin):
     
     search_fields = ['nombre']
     
-    list_editable = ['disponible']
-    
     readonly_fields = [
         'fecha_creacion',
         'fecha_actualizacion',
@@ -94,28 +162,84 @@ class JuegoAdmin(admin.ModelAdmin):
         return format_html('<span style="color: #999;">-</span>')
     mostrar_precio_secundario.short_description = '🔵 Precio Secundario'
     
+    def mostrar_disponible(self, obj):
+        """Ícono que alterna la disponibilidad por htmx (un UPDATE, sin enviar el formset)"""
+        return format_html(
+            '<button type="button" class="boton-disponible" hx-post="{}" hx-swap="outerHTML" '
+            'title="Clic para alternar" style="border: 0; background: none; cursor: pointer;">{}</button>',
+            reverse('admin:catalog_juego_alternar_disponible', args=[obj.id]),
+            '✅' if obj.disponible else '❌',
+        )
+    mostrar_disponible.short_description = 'Disponible'
+    mostrar_disponible.admin_order_field = 'disponible'
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name.endswith('changelist'):
+            queryset = queryset.only(*self.campos_listado)
+        return queryset
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Búsqueda por nombre normalizado (índice trigram en PostgreSQL) en lugar de nombre__icontains"""
+        if not search_term:
+            return queryset, False
+        return filtrar_por_nombre(queryset, search_term), False
+    
+    def get_urls(self):
+        urls = super().get_urls()
+        return [
+            path(
+                '<int:juego_id>/alternar-disponible/',
+                self.admin_site.admin_view(require_POST(self.alternar_disponible)),
+                name='catalog_juego_alternar_disponible',
+            ),
+        ] + urls
+    
+    def alternar_disponible(self, request, juego_id):
+        if not self.has_change_permission(request):
+            raise Http404
+        actualizados = Juego.objects.filter(id=juego_id).update(
+            disponible=Case(When(disponible=True, then=Value(False)), default=Value(True)),
+            # update() no pasa por auto_now: Last-Modified, sitemap y destacados usan esta fecha
+            fecha_actualizacion=Now(),
+        )
+        if not actualizados:
+            raise Http404
+        notificar_catalogo_actualizado('admin')
+        juego = Juego.objects.only('id', 'disponible').get(id=juego_id)
+        return HttpResponse(self.mostrar_disponible(juego))
+    
     def mostrar_imagen_preview(self, obj):
         """Muestra preview de la imagen"""
         if obj.imagen and obj.imagen != 'img/default.jpg':
             return format_html(
-                '<img src="/static/{}" style="max-height: 200px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);" />',
-                obj.imagen
+                '<img src="{}" style="max-height: 200px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);" />',
+                url_imagen(obj.imagen)
             )
         return format_html('<span style="color: #999;">Sin imagen</span>')
     mostrar_imagen_preview.short_description = '🖼️ Preview'
     
     # Acciones personalizadas
-    actions = ['marcar_disponible', 'marcar_no_disponible', 'eliminar_precio_secundario']
+    actions = [
+        'marcar_disponible',
+        'marcar_no_disponible',
+        'eliminar_precio_secundario',
+        'ajustar_recargo',
+        'ajustar_recargo_secundario',
+        'ajustar_precio',
+    ]
     
     def marcar_disponible(self, request, queryset):
         """Marca los juegos seleccionados como disponibles"""
-        updated = queryset.update(disponible=True)
+        updated = queryset.update(disponible=True, fecha_actualizacion=Now())
+        notificar_catalogo_actualizado('admin')
         self.message_user(request, f'{updated} juego(s) marcado(s) como disponible(s).')
     marcar_disponible.short_description = '✅ Marcar como disponible'
     
     def marcar_no_disponible(self, request, queryset):
         """Marca los juegos seleccionados como no disponibles"""
-        updated = queryset.update(disponible=False)
+        updated = queryset.update(disponible=False, fecha_actualizacion=Now())
+        notificar_catalogo_actualizado('admin')
         self.message_user(request, f'{updated} juego(s) marcado(s) como NO disponible(s).')
     marcar_no_disponible.short_description = '❌ Marcar como NO disponible'
     
@@ -124,13 +248,125 @@ class JuegoAdmin(admin.ModelAdmin):
         updated = queryset.update(
             precio_secundario=None,
             recargo_secundario=None,
-            tiene_secundario=False
+            tiene_secundario=False,
+            fecha_actualizacion=Now(),
         )
+        notificar_catalogo_actualizado('admin')
         self.message_user(request, f'Precio secundario eliminado de {updated} juego(s).')
     eliminar_precio_secundario.short_description = '🔵 Eliminar precio secundario'
     
-class StockPS4UploadForm(forms.Form):
-    archivo_csv = forms.FileField()
+    def _ajustar(self, request, queryset, campo, etiqueta):
+        """
+        Suma el % indicado a `campo` en un solo UPDATE. Con "seleccionar todos"
+        y el filtro de consola ajusta toda la consola sin traer las filas.
+        """
+        porcentaje = request.POST.get('porcentaje', '').strip()
+        try:
+            porcentaje = Decimal(porcentaje)
+        except ArithmeticError:
+            porcentaje = None
+        if not porcentaje or not -100 < porcentaje <= 1000:
+            self.message_user(request, 'Indicá un porcentaje distinto de 0 (mayor a -100) en el campo %.', level='error')
+            return
+        factor = 1 + porcentaje / 100
+        updated = queryset.exclude(**{f'{campo}__isnull': True}).update(
+            **{campo: ajustar_por_porcentaje(campo, factor)},
+            fecha_actualizacion=Now(),
+        )
+        notificar_catalogo_actualizado('admin')
+        self.message_user(request, f'{etiqueta} ajustado {porcentaje:+}% en {updated} juego(s).')
+    
+    def ajustar_recargo(self, request, queryset):
+        """Ajusta el recargo primario de los juegos seleccionados"""
+        self._ajustar(request, queryset, 'recargo', 'Recargo')
+    ajustar_recargo.short_description = '📈 Ajustar recargo primario en %%'
+    
+    def ajustar_recargo_secundario(self, request, queryset):
+        """Ajusta el recargo secundario de los juegos seleccionados"""
+        self._ajustar(request, queryset, 'recargo_secundario', 'Recargo secundario')
+    ajustar_recargo_secundario.short_description = '📈 Ajustar recargo secundario en %%'
+    
+    def ajustar_precio(self, request, queryset):
+        """Ajusta el precio primario de los juegos seleccionados"""
+        self._ajustar(request, queryset, 'precio', 'Precio')
+    ajustar_precio.short_description = '📈 Ajustar precio primario en %%'
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if getattr(form, 'portada_original', None):
+            form.encolar_portada()
+            self.message_user(request, '🖼️ La portada nueva se está optimizando; en unos segundos reemplaza a la actual.')
+    
+    def save_formset(self, request, form, formset, change):
+        """Los alias cargados o editados a mano quedan confirmados"""
+        if formset.model is SupplierAlias:
+            for alias in formset.save(commit=False):
+                alias.confirmado = True
+                alias.save()
+            for alias in formset.deleted_objects:
+                alias.delete()
+            return
+        super().save_formset(request, form, formset, change)
+
+@admin.register(SupplierAlias)
+class SupplierAliasAdmin(admin.ModelAdmin):
+    list_display = ['texto_original', 'juego', 'proveedor', 'consola', 'score', 'confirmado', 'ultima_vez']
+    list_filter = ['proveedor', 'consola', 'confirmado']
+    search_fields = ['texto_original']
+    autocomplete_fields = ['juego']
+    list_select_related = ['juego']
+    readonly_fields = ['score', 'ultima_vez', 'fecha_creacion']
+    actions = ['confirmar_alias']
+
+    def save_model(self, request, obj, form, change):
+        """Un alias editado desde el admin es una corrección manual: queda confirmado"""
+        obj.confirmado = True
+        super().save_model(request, obj, form, change)
+
+    def confirmar_alias(self, request, queryset):
+        """Confirma los alias seleccionados"""
+        updated = queryset.update(confirmado=True)
+        self.message_user(request, f'{updated} alias confirmado(s).')
+    confirmar_alias.short_description = '✅ Confirmar alias'
+
+@admin.register(ImportRun)
+class ImportRunAdmin(admin.ModelAdmin):
+    list_display = ['id', 'comando', 'archivo', 'etapa', 'checkpoint', 'filas_procesadas', 'fecha_inicio', 'fecha_fin']
+    list_filter = ['comando', 'etapa']
+    readonly_fields = [f.name for f in ImportRun._meta.fields]
+
+    def has_add_permission(self, request): return False
+    def has_change_permission(self, request, obj=None): return False
+
+@admin.register(PortadaSubida)
+class PortadaSubidaAdmin(admin.ModelAdmin):
+    list_display = ['id', 'juego', 'estado', 'imagen', 'fecha_creacion', 'fecha_proceso']
+    list_filter = ['estado']
+    list_select_related = ['juego']
+    readonly_fields = [f.name for f in PortadaSubida._meta.fields]
+
+    def has_add_permission(self, request): return False
+    def has_change_permission(self, request, obj=None): return False
+
+@admin.register(DemandaDiaria)
+class DemandaDiariaAdmin(admin.ModelAdmin):
+    list_display = ['dia', 'juego', 'vistas', 'carritos', 'checkouts']
+    list_select_related = ['juego']
+    search_fields = ['juego__nombre']
+    date_hierarchy = 'dia'
+    readonly_fields = [f.name for f in DemandaDiaria._meta.fields]
+
+    def has_add_permission(self, request): return False
+    def has_change_permission(self, request, obj=None): return False
+
+class StockUploadForm(forms.Form):
+    archivo_csv = forms.FileField(label='Archivo CSV')
+
+    def clean_archivo_csv(self):
+        archivo = self.cleaned_data['archivo_csv']
+        if not archivo.name.lower().endswith('.csv'):
+            raise forms.ValidationError('El archivo tiene que ser un .csv')
+        return archivo
 
 class UtilidadesAdmin(admin.ModelAdmin):
     def has_add_permission(self, request): return False
@@ -141,32 +377,58 @@ class UtilidadesAdmin(admin.ModelAdmin):
         # Redirige directamente a tu vista personalizada
         return redirect("subir-stock-ps4/")
 
-
-
     def get_urls(self):
         urls = super().get_urls()
+        vista = self.admin_site.admin_view
         my_urls = [
-            path('subir-stock-ps4/', self.subir_stock_ps4)
+            path('subir-stock-<str:comando>/', vista(self.subir_stock), name='catalog_subir_stock'),
+            path('importacion/<int:trabajo_id>/', vista(self.ver_importacion), name='catalog_importacion'),
+            path('importacion/<int:trabajo_id>/progreso/', vista(self.progreso_importacion), name='catalog_importacion_progreso'),
         ]
         return my_urls + urls
 
-    def subir_stock_ps4(self, request):
+    def subir_stock(self, request, comando):
+        """Guarda el CSV y encola la importación; el comando corre en segundo plano"""
+        comandos = dict(TrabajoImportacion.COMANDOS)
+        if comando not in comandos:
+            raise Http404('Tipo de stock desconocido')
         if request.method == "POST":
-            form = StockPS4UploadForm(request.POST, request.FILES)
+            form = StockUploadForm(request.POST, request.FILES)
             if form.is_valid():
-                archivo = form.cleaned_data["archivo_csv"].read().decode('utf-8').splitlines()
-                reader = csv.DictReader(archivo)
+                trabajo = trabajos.encolar(form.cleaned_data["archivo_csv"], comando, request.user.get_username())
+                self.message_user(request, f"📥 Archivo recibido: la importación #{trabajo.id} corre en segundo plano.")
+                return redirect('admin:catalog_importacion', trabajo_id=trabajo.id)
+        else:
+            form = StockUploadForm()
 
-                # Acá va tu lógica actual del comando manage.py ps4
-                for fila in reader:
-                    print(fila)  # reemplazar por lógica real
+        return render(request, "admin/subir_stock.html", {
+            **self.admin_site.each_context(request),
+            "title": f"Subir {comandos[comando]}",
+            "form": form,
+            "comando": comando,
+            "comandos": TrabajoImportacion.COMANDOS,
+            "recientes": TrabajoImportacion.objects.select_related('corrida')[:10],
+        })
 
-                self.message_user(request, "Stock PS4 actualizado correctamente.")
-                return redirect("../")
-        else:
-            form = StockPS4UploadForm()
+    def ver_importacion(self, request, trabajo_id):
+        trabajo = get_object_or_404(TrabajoImportacion, id=trabajo_id)
+        return render(request, "admin/importacion_progreso.html", {
+            **self.admin_site.each_context(request),
+            "title": f"Importación #{trabajo.id}",
+            "trabajo": trabajo,
+            "progreso": trabajos.progreso(trabajo),
+        })
 
-        return render(request, "admin/subir_stock_ps4.html", {"form": form})
+    def progreso_importacion(self, request, trabajo_id):
+        """Fragmento que la página de la importación pide por htmx cada 2 segundos"""
+        trabajo = get_object_or_404(TrabajoImportacion, id=trabajo_id)
+        if not trabajo.terminado:
+            # Si el proceso web se reinició nadie está corriendo la cola
+            trabajos.despertar_worker()
+        return render(request, "admin/_progreso_importacion.html", {
+            "trabajo": trabajo,
+            "progreso": trabajos.progreso(trabajo),
+        })
         
 
 # Registrar una sección "Utilidades"
@@ -0,0 +1,184 @@
+# catalog/almacen_imagenes.py
+"""
+Almacén de imágenes por contenido en static/img/cas/<2 hex>/<sha256>.<ext>.
+
+- `almacenar(ruta)` agrega un archivo al almacén (si el hash ya está, no
+  copia nada) y reemplaza el archivo original por un hardlink al blob: los
+  nombres viejos (img/<juego>_ps4.jpg) siguen existiendo para los
+  importadores que buscan portadas por nombre, pero ocupan disco una sola vez.
+- `Juego.imagen` pasa a la ruta del blob y `Juego.imagen_blob` lo referencia.
+- `recolectar()` borra los blobs que ya nadie usa: sin juegos que los
+  referencien y sin nombres viejos enlazados al mismo inodo, además de las
+  variantes de MEDIA_ROOT/portadas/ que ningún juego muestra.
+
+collectstatic (CaSy/estaticos.py) enlaza en lugar de copiar, así que
+STATIC_ROOT tampoco duplica los bytes.
+"""
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+
+from .imagenes import EXTENSIONES_IMAGEN, buscar_imagen, cargar_indice, describir_imagen, directorio_estaticos, guardar_indice
+from .models import ImagenBlob, Juego, PortadaSubida
+from .procesamiento_portadas import SUBDIRECTORIO as SUBDIRECTORIO_PORTADAS, nombre_variante, tamanos, variantes
+
+SUBDIRECTORIO = 'img/cas'
+
+
+def hash_archivo(ruta, tamano_bloque=1 << 20):
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(tamano_bloque), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def enlazar(origen, destino):
+    """Hardlink atómico de origen en destino (copia si están en otro sistema de archivos)"""
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporal = destino.with_name(f'.{destino.name}.{os.getpid()}.tmp')
+    try:
+        os.link(origen, temporal)
+    except OSError:
+        shutil.copyfile(origen, temporal)
+    os.replace(temporal, destino)
+
+
+def mismo_archivo(a, b):
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def almacenar(ruta, enlazar_original=True, indice=None):
+    """
+    Agrega el archivo `ruta` (absoluta, dentro de static/) al almacén y devuelve
+    (blob, nuevo). Con `enlazar_original` el archivo pasa a ser un hardlink al blob.
+    Si se pasa `indice` (dict) la entrada del blob se agrega ahí y guardarlo queda
+    a cargo del que llama; si no, se escribe el índice en el momento.
+    """
+    ruta = Path(ruta)
+    base = directorio_estaticos()
+    hash_contenido = hash_archivo(ruta)
+    blob = ImagenBlob.objects.filter(hash=hash_contenido).first()
+    nuevo = blob is None
+    if nuevo:
+        blob = ImagenBlob(hash=hash_contenido, extension=ruta.suffix.lower(), tamano=ruta.stat().st_size)
+    destino = base / blob.ruta
+    if not destino.exists():
+        enlazar(ruta, destino)
+        # Dimensiones y placeholder: los del nombre viejo si ya estaba indexado
+        datos = buscar_imagen(ruta.relative_to(base).as_posix()) or describir_imagen(destino)
+        if datos and indice is not None:
+            indice[blob.ruta] = datos
+        elif datos:
+            guardar_indice({**cargar_indice(), blob.ruta: datos})
+    if nuevo:
+        blob.save()
+    if enlazar_original and not mismo_archivo(ruta, destino):
+        enlazar(destino, ruta)
+    return blob, nuevo
+
+
+def imagenes_sueltas():
+    """Imágenes de static/img que no están en el almacén ni son variantes procesadas"""
+    base = directorio_estaticos()
+    excluidos = (SUBDIRECTORIO + '/',)
+    for ruta in sorted((base / 'img').rglob('*')):
+        nombre = ruta.relative_to(base).as_posix()
+        if ruta.is_file() and ruta.suffix.lower() in EXTENSIONES_IMAGEN and not nombre.startswith(excluidos):
+            yield ruta
+
+
+def asignar_juegos(blobs_por_nombre):
+    """Pasa Juego.imagen de los nombres viejos a la ruta del blob; devuelve cuántos cambió"""
+    juegos = list(Juego.objects.filter(imagen__in=list(blobs_por_nombre)).only('id', 'imagen', 'imagen_blob'))
+    for juego in juegos:
+        blob = blobs_por_nombre[juego.imagen]
+        juego.imagen = blob.ruta
+        juego.imagen_blob = blob
+    with transaction.atomic():
+        Juego.objects.bulk_update(juegos, ['imagen', 'imagen_blob'], batch_size=500)
+    return len(juegos)
+
+
+def rutas_en_uso():
+    """Rutas estáticas que muestra algún juego o que una portada subida puede volver a usar"""
+    rutas = set(Juego.objects.values_list('imagen', flat=True))
+    for ruta in list(rutas):
+        rutas.update(variantes(ruta).values())
+    # Las que el worker está generando todavía no llegaron a Juego.imagen
+    for hash_original in PortadaSubida.objects.filter(estado='pendiente').values_list('hash_original', flat=True):
+        rutas.update(nombre_variante(hash_original, ancho) for ancho in tamanos())
+    return rutas
+
+
+def inodos_sueltos():
+    """(dispositivo, inodo) de los nombres viejos de static/img: los blobs enlazados siguen en uso"""
+    inodos = set()
+    for ruta in imagenes_sueltas():
+        datos = ruta.stat()
+        inodos.add((datos.st_dev, datos.st_ino))
+    return inodos
+
+
+def recolectar(dry_run=False):
+    """
+    Borra blobs y variantes sin uso. Devuelve {'archivos': [...], 'bytes': n}.
+    Un blob se conserva si algún juego lo referencia (FK o ruta) o si un nombre
+    viejo de static/img es hardlink al mismo archivo (los de STATIC_ROOT no cuentan).
+    """
+    base = directorio_estaticos()
+    en_uso = rutas_en_uso()
+    enlazados = inodos_sueltos()
+    referenciados = set(Juego.objects.exclude(imagen_blob=None).values_list('imagen_blob_id', flat=True))
+    borrados, liberados = [], 0
+
+    def enlazado(ruta):
+        datos = ruta.stat()
+        return (datos.st_dev, datos.st_ino) in enlazados
+
+    def borrar(ruta, raiz=base):
+        nonlocal liberados
+        liberados += ruta.stat().st_size
+        borrados.append(ruta.relative_to(raiz).as_posix())
+        if not dry_run:
+            ruta.unlink()
+
+    conocidos = set()
+    for blob in ImagenBlob.objects.all():
+        ruta = base / blob.ruta
+        conocidos.add(blob.ruta)
+        if blob.id in referenciados or blob.ruta in en_uso:
+            continue
+        if ruta.exists() and enlazado(ruta):
+            continue
+        if ruta.exists():
+            borrar(ruta)
+        if not dry_run:
+            blob.delete()
+
+    # Los blobs están en static; las variantes procesadas, en media
+    for raiz, subdirectorio in ((base, SUBDIRECTORIO), (Path(settings.MEDIA_ROOT), SUBDIRECTORIO_PORTADAS)):
+        for ruta in (raiz / subdirectorio).rglob('*'):
+            nombre = ruta.relative_to(raiz).as_posix()
+            if not ruta.is_file() or nombre in en_uso or nombre in conocidos:
+                continue
+            # Temporales a medio escribir de otro proceso: no se tocan
+            if ruta.name.startswith('.'):
+                continue
+            if subdirectorio == SUBDIRECTORIO and enlazado(ruta):
+                continue
+            borrar(ruta, raiz)
+
+    if borrados and not dry_run:
+        indice = dict(cargar_indice())
+        for nombre in borrados:
+            indice.pop(nombre, None)
+        guardar_indice(indice)
+    return {'archivos': borrados, 'bytes': liberados}
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class CatalogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'catalog'
+
+    def ready(self):
+        from CaSy import basedatos, rendimiento
+        from . import cache_juegos, condicional, prerender
+        basedatos.conectar()
+        rendimiento.conectar()
+        cache_juegos.conectar()
+        condicional.conectar()
+        prerender.conectar()
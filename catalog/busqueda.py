@@ -0,0 +1,59 @@
+# catalog/busqueda.py
+"""
+Búsqueda por nombre sobre `Juego.nombre_normalizado` (minúsculas, sin
+acentos ni signos).
+
+En PostgreSQL la columna tiene un índice GIN con pg_trgm (migración 0014),
+así que el `contains` del buscador y el prefiltrado de candidatos de los
+importadores se resuelven con el índice. En SQLite se comportan igual que
+antes: LIKE sobre la tabla y todos los juegos de la consola como candidatos.
+"""
+import re
+import unicodedata
+
+from django.db import connections
+
+# Candidatos que los importadores puntúan en Python después del prefiltrado
+LIMITE_CANDIDATOS = 50
+# NFKD los convierte en letras ('™' -> 'TM'): se sacan antes
+_SIMBOLOS = str.maketrans('', '', '™®℠©℗')
+
+
+def normalizar_nombre(texto):
+    """'Marvel's Spider-Man 2™' -> 'marvel s spider man 2'"""
+    if not texto:
+        return ''
+    texto = unicodedata.normalize('NFKD', texto.translate(_SIMBOLOS))
+    texto = ''.join(c for c in texto if unicodedata.category(c) != 'Mn').lower()
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', texto).split())
+
+
+def usa_trigramas(queryset):
+    return connections[queryset.db].vendor == 'postgresql'
+
+
+def filtrar_por_nombre(queryset, texto):
+    """Juegos cuyo nombre contiene `texto`, sin importar acentos, mayúsculas ni signos"""
+    consulta = normalizar_nombre(texto)
+    if not consulta:
+        return queryset.filter(nombre__icontains=texto)
+    return queryset.filter(nombre_normalizado__contains=consulta)
+
+
+def candidatos_similares(queryset, texto, limite=LIMITE_CANDIDATOS):
+    """
+    Juegos del queryset que pueden parecerse a `texto`. En PostgreSQL son los
+    `limite` con mayor similitud de palabra (operador <%, usa el índice GIN);
+    en otras bases es el queryset completo.
+    """
+    consulta = normalizar_nombre(texto)
+    if not consulta or not usa_trigramas(queryset):
+        return queryset
+
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    return (
+        queryset.filter(nombre_normalizado__trigram_word_similar=consulta)
+        .annotate(similitud=TrigramWordSimilarity(consulta, 'nombre_normalizado'))
+        .order_by('-similitud')[:limite]
+    )
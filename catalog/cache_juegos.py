@@ -0,0 +1,257 @@
+# catalog/cache_juegos.py
+"""
+Cache de `Juego` por id, de lectura: un LRU por proceso adelante del cache
+compartido (settings.CACHES) y la base atrás.
+
+- Las claves compartidas llevan un número de versión. `catalogo_actualizado`
+  (importaciones, acciones masivas del admin, snapshots) lo incrementa, y con
+  eso todo lo anterior queda inalcanzable de una vez.
+- post_save / post_delete de un Juego borran su entrada compartida y la local
+  de este proceso. Los otros procesos pueden servir su copia local hasta
+  TTL_LOCAL segundos.
+- Los objetos devueltos se comparten entre requests: son de solo lectura.
+
+Las métricas (aciertos locales, compartidos y fallos) se acumulan por proceso
+y se suman en el cache compartido; se ven con `python manage.py cache_juegos`.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from CaSy.basedatos import alias_lectura
+from CaSy.rendimiento import registrar
+from .models import Juego
+from .signals import catalogo_actualizado
+
+CLAVE_VERSION = 'juegos:version'
+PREFIJO_METRICAS = 'juegos:metricas:'
+METRICAS = ('local', 'compartido', 'base', 'invalidaciones')
+
+MAX_LOCAL = 2048
+TTL_LOCAL = 5
+TIMEOUT_COMPARTIDO = 60 * 60
+# Cada cuánto se vuelve a leer la versión del cache compartido
+VERIFICAR_VERSION_CADA = 1.0
+# Operaciones contadas antes de sumar las métricas al cache compartido
+VOLCAR_METRICAS_CADA = 200
+
+
+class _CacheLocal:
+    """LRU con vencimiento, protegido con un lock (runserver y gunicorn usan threads)"""
+
+    def __init__(self, maximo):
+        self.maximo = maximo
+        self.entradas = OrderedDict()
+        self.lock = threading.Lock()
+        self.version = None
+        self.version_leida = 0.0
+        self.contadores = dict.fromkeys(METRICAS, 0)
+        self.pendientes = 0
+
+    def obtener(self, ids, version):
+        ahora = time.monotonic()
+        encontrados = {}
+        with self.lock:
+            for juego_id in ids:
+                entrada = self.entradas.get(juego_id)
+                if entrada is None:
+                    continue
+                juego, entrada_version, vence = entrada
+                if entrada_version != version or vence < ahora:
+                    del self.entradas[juego_id]
+                    continue
+                self.entradas.move_to_end(juego_id)
+                encontrados[juego_id] = juego
+        return encontrados
+
+    def guardar(self, juegos, version):
+        vence = time.monotonic() + TTL_LOCAL
+        with self.lock:
+            for juego_id, juego in juegos.items():
+                self.entradas[juego_id] = (juego, version, vence)
+                self.entradas.move_to_end(juego_id)
+            while len(self.entradas) > self.maximo:
+                self.entradas.popitem(last=False)
+
+    def quitar(self, juego_id=None):
+        with self.lock:
+            if juego_id is None:
+                self.entradas.clear()
+            else:
+                self.entradas.pop(juego_id, None)
+
+    def contar(self, **cantidades):
+        """Suma a los contadores; devuelve lo pendiente de volcar si ya toca"""
+        with self.lock:
+            for clave, cantidad in cantidades.items():
+                self.contadores[clave] += cantidad
+                self.pendientes += cantidad
+            if self.pendientes < VOLCAR_METRICAS_CADA:
+                return None
+            volcar = {clave: valor for clave, valor in self.contadores.items() if valor}
+            self.contadores = dict.fromkeys(METRICAS, 0)
+            self.pendientes = 0
+            return volcar
+
+
+_local = _CacheLocal(MAX_LOCAL)
+
+
+def _clave(version, juego_id):
+    return f'juegos:v{version}:{juego_id}'
+
+
+def _version_en_memoria():
+    """La versión leída hace menos de VERIFICAR_VERSION_CADA segundos, o None"""
+    if _local.version is not None and time.monotonic() - _local.version_leida <= VERIFICAR_VERSION_CADA:
+        return _local.version
+    return None
+
+
+def version_actual():
+    ahora = time.monotonic()
+    if _local.version is None or ahora - _local.version_leida > VERIFICAR_VERSION_CADA:
+        version = cache.get(CLAVE_VERSION)
+        if version is None:
+            cache.add(CLAVE_VERSION, 1, timeout=None)
+            version = cache.get(CLAVE_VERSION, 1)
+        _local.version, _local.version_leida = version, ahora
+    return _local.version
+
+
+def _volcar_metricas(volcar):
+    if not volcar:
+        return
+    for clave, valor in volcar.items():
+        try:
+            cache.incr(PREFIJO_METRICAS + clave, valor)
+        except ValueError:
+            cache.set(PREFIJO_METRICAS + clave, valor, timeout=None)
+
+
+def _contar(**cantidades):
+    # También quedan en la medición del request (log de CaSy/rendimiento.py)
+    registrar(**{f'juegos_{clave}': valor for clave, valor in cantidades.items() if valor})
+    _volcar_metricas(_local.contar(**cantidades))
+
+
+def _normalizar_ids(ids):
+    return list(dict.fromkeys(int(juego_id) for juego_id in ids))
+
+
+def _buscar_en_caches(ids, version):
+    """(encontrados, faltantes) mirando el LRU y después el cache compartido"""
+    encontrados = _local.obtener(ids, version)
+    locales = len(encontrados)
+    faltantes = [juego_id for juego_id in ids if juego_id not in encontrados]
+    compartidos = {}
+    if faltantes:
+        claves = {_clave(version, juego_id): juego_id for juego_id in faltantes}
+        compartidos = {claves[clave]: juego for clave, juego in cache.get_many(list(claves)).items()}
+        _local.guardar(compartidos, version)
+        encontrados.update(compartidos)
+        faltantes = [juego_id for juego_id in faltantes if juego_id not in compartidos]
+    _contar(local=locales, compartido=len(compartidos), base=len(faltantes))
+    return encontrados, faltantes
+
+
+def _guardar(juegos, version):
+    if not juegos:
+        return
+    cache.set_many({_clave(version, juego_id): juego for juego_id, juego in juegos.items()}, TIMEOUT_COMPARTIDO)
+    _local.guardar(juegos, version)
+
+
+def obtener_juegos(ids):
+    """{id: Juego} para los ids que existen, consultando la base solo por los que faltan"""
+    ids = _normalizar_ids(ids)
+    if not ids:
+        return {}
+    version = version_actual()
+    encontrados, faltantes = _buscar_en_caches(ids, version)
+    if faltantes:
+        desde_base = Juego.objects.using(alias_lectura()).in_bulk(faltantes)
+        _guardar(desde_base, version)
+        encontrados.update(desde_base)
+    return encontrados
+
+
+async def aobtener_juegos(ids):
+    """Versión async de obtener_juegos (el LRU no hace I/O; el resto va por la API async)"""
+    ids = _normalizar_ids(ids)
+    if not ids:
+        return {}
+    version = _version_en_memoria() or await sync_to_async(version_actual)()
+    encontrados = _local.obtener(ids, version)
+    if len(encontrados) == len(ids):
+        _contar(local=len(ids))
+        return encontrados
+    encontrados, faltantes = await sync_to_async(_buscar_en_caches)(ids, version)
+    if faltantes:
+        desde_base = await Juego.objects.using(alias_lectura()).ain_bulk(faltantes)
+        await sync_to_async(_guardar)(desde_base, version)
+        encontrados.update(desde_base)
+    return encontrados
+
+
+def obtener_juego(juego_id):
+    """Juego por id o None"""
+    return obtener_juegos([juego_id]).get(int(juego_id))
+
+
+async def aobtener_juego(juego_id):
+    return (await aobtener_juegos([juego_id])).get(int(juego_id))
+
+
+def invalidar_juego(sender=None, instance=None, **kwargs):
+    """post_save / post_delete"""
+    if instance is None or instance.pk is None:
+        return
+    _local.quitar(instance.pk)
+    cache.delete(_clave(version_actual(), instance.pk))
+    _contar(invalidaciones=1)
+
+
+def invalidar_todo(**kwargs):
+    """catalogo_actualizado: nueva versión, todas las entradas anteriores quedan afuera"""
+    try:
+        version = cache.incr(CLAVE_VERSION)
+    except ValueError:
+        version = 2
+        cache.set(CLAVE_VERSION, version, timeout=None)
+    _local.quitar()
+    _local.version, _local.version_leida = version, time.monotonic()
+    _contar(invalidaciones=1)
+
+
+def metricas():
+    """Métricas acumuladas de todos los procesos (más lo pendiente de este)"""
+    guardadas = cache.get_many([PREFIJO_METRICAS + clave for clave in METRICAS])
+    with _local.lock:
+        totales = {
+            clave: guardadas.get(PREFIJO_METRICAS + clave, 0) + _local.contadores[clave]
+            for clave in METRICAS
+        }
+    consultas = totales['local'] + totales['compartido'] + totales['base']
+    totales['consultas'] = consultas
+    totales['tasa_aciertos'] = (totales['local'] + totales['compartido']) / consultas if consultas else 0.0
+    totales['version'] = cache.get(CLAVE_VERSION, 1)
+    totales['entradas_locales'] = len(_local.entradas)
+    return totales
+
+
+def reiniciar_metricas():
+    cache.delete_many([PREFIJO_METRICAS + clave for clave in METRICAS])
+    with _local.lock:
+        _local.contadores = dict.fromkeys(METRICAS, 0)
+        _local.pendientes = 0
+
+
+def conectar():
+    post_save.connect(invalidar_juego, sender=Juego, dispatch_uid='cache_juegos_save')
+    post_delete.connect(invalidar_juego, sender=Juego, dispatch_uid='cache_juegos_delete')
+    catalogo_actualizado.connect(invalidar_todo, dispatch_uid='cache_juegos_catalogo')
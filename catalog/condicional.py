@@ -0,0 +1,142 @@
+# catalog/condicional.py
+"""
+GET condicionales (ETag / Last-Modified) para las vistas públicas.
+
+El decorador `condicional(validadores)` calcula los validadores antes de
+llamar a la vista y, si el navegador ya tiene esa versión (If-None-Match /
+If-Modified-Since), responde 304 sin consultas ni render. Funciona con vistas
+sync y async; los validadores pueden ser una función común o una corrutina.
+
+Los ETag salen de datos baratos, nunca del HTML:
+- `marca_actual()`: un token en el cache compartido que cambia con cualquier
+  post_save / post_delete de Juego o ResenaCliente y con `catalogo_actualizado`.
+  Es aparte de la versión de catalog/cache_juegos.py porque allí guardar un
+  juego solo borra su entrada, y acá tiene que cambiar también el listado.
+- `firma_despliegue()`: templates y manifest de estáticos, para que un deploy
+  no deje páginas viejas en el navegador.
+- la ruta y los parámetros del request.
+
+Son ETag débiles y Cache-Control: private, no-cache. El HTML lleva el token
+CSRF enmascarado (distinto en cada render y por usuario), así que el contenido
+no es idéntico byte a byte y no debe quedar en caches compartidos.
+"""
+import hashlib
+import inspect
+import json
+import uuid
+from calendar import timegm
+from functools import lru_cache, wraps
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.template.utils import get_app_template_dirs
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .models import Juego, ResenaCliente
+from .signals import catalogo_actualizado
+
+CLAVE_MARCA = 'catalogo:marca'
+
+
+def marca_actual():
+    """Token vigente del contenido del catálogo (se crea si el cache se vació)"""
+    marca = cache.get(CLAVE_MARCA)
+    if marca is None:
+        cache.add(CLAVE_MARCA, uuid.uuid4().hex, timeout=None)
+        marca = cache.get(CLAVE_MARCA)
+    return marca
+
+
+def nueva_marca(sender=None, **kwargs):
+    # Un token al azar y no un contador: si el cache se vacía no se repiten ETag viejos
+    cache.set(CLAVE_MARCA, uuid.uuid4().hex, timeout=None)
+
+
+@lru_cache(maxsize=1)
+def firma_despliegue():
+    """Cambia si cambian los templates o el manifest de estáticos (una vez por proceso)"""
+    directorios = [Path(d) for plantilla in settings.TEMPLATES for d in plantilla.get('DIRS', [])]
+    directorios += list(get_app_template_dirs('templates'))
+    archivos = [archivo for d in directorios for archivo in Path(d).rglob('*.html')]
+    archivos.append(Path(settings.STATIC_ROOT) / 'staticfiles.json')
+    datos = sorted((str(a), a.stat().st_mtime_ns, a.stat().st_size) for a in archivos if a.exists())
+    return hashlib.md5(json.dumps(datos).encode()).hexdigest()
+
+
+def etag(*partes):
+    """ETag débil a partir de datos serializables (no del contenido renderizado)"""
+    datos = json.dumps([firma_despliegue(), *partes], default=str, sort_keys=True)
+    return f'W/"{hashlib.md5(datos.encode()).hexdigest()[:20]}"'
+
+
+def parametros(request):
+    return sorted((clave, valores) for clave, valores in request.GET.lists())
+
+
+def validadores_catalogo(request, *args, **kwargs):
+    """Páginas que dependen del catálogo entero (listados, destacados, home)"""
+    return etag(marca_actual(), request.path, parametros(request)), None
+
+
+def validadores_estaticos(request, *args, **kwargs):
+    """Páginas que solo cambian con un deploy"""
+    return etag(request.path), None
+
+
+def responder_304(request, etag_actual=None, ultima_modificacion=None):
+    """La respuesta 304/412 si el cliente ya tiene esta versión; None si hay que generar la página"""
+    if request.method not in ('GET', 'HEAD') or (etag_actual is None and ultima_modificacion is None):
+        return None
+    segundos = timegm(ultima_modificacion.utctimetuple()) if ultima_modificacion else None
+    respuesta = get_conditional_response(request, etag=etag_actual, last_modified=segundos)
+    if respuesta is not None:
+        agregar_validadores(respuesta, etag_actual, ultima_modificacion)
+    return respuesta
+
+
+def agregar_validadores(respuesta, etag_actual=None, ultima_modificacion=None):
+    if respuesta.status_code not in (200, 304):
+        return respuesta
+    if etag_actual and not respuesta.has_header('ETag'):
+        respuesta['ETag'] = etag_actual
+    if ultima_modificacion and not respuesta.has_header('Last-Modified'):
+        respuesta['Last-Modified'] = http_date(timegm(ultima_modificacion.utctimetuple()))
+    patch_cache_control(respuesta, private=True, no_cache=True)
+    return respuesta
+
+
+def condicional(validadores):
+    """
+    `validadores(request, *args, **kwargs)` devuelve (etag, ultima_modificacion),
+    cualquiera de los dos puede ser None. Se calcula antes de la vista.
+    """
+    def decorador(vista):
+        if iscoroutinefunction(vista):
+            @wraps(vista)
+            async def envoltura(request, *args, **kwargs):
+                resultado = validadores(request, *args, **kwargs)
+                if inspect.isawaitable(resultado):
+                    resultado = await resultado
+                return responder_304(request, *resultado) or agregar_validadores(
+                    await vista(request, *args, **kwargs), *resultado
+                )
+        else:
+            @wraps(vista)
+            def envoltura(request, *args, **kwargs):
+                resultado = validadores(request, *args, **kwargs)
+                return responder_304(request, *resultado) or agregar_validadores(
+                    vista(request, *args, **kwargs), *resultado
+                )
+        return envoltura
+    return decorador
+
+
+def conectar():
+    for modelo in (Juego, ResenaCliente):
+        post_save.connect(nueva_marca, sender=modelo, dispatch_uid=f'condicional_save_{modelo.__name__}')
+        post_delete.connect(nueva_marca, sender=modelo, dispatch_uid=f'condicional_delete_{modelo.__name__}')
+    catalogo_actualizado.connect(nueva_marca, dispatch_uid='condicional_catalogo')
@@ -0,0 +1,112 @@
+# catalog/demanda.py
+"""
+Demanda por juego: qué se mira, qué se agrega al carrito y qué se pide.
+
+- `registrar(tipo, juego_id)` no toca la base: el evento va a un
+  EscritorPorLotes (CaSy/lotes.py) que lo escribe en EventoJuego en lote.
+  Las vistas del detalle que responde un 304 o el prerender no se cuentan:
+  es la misma persona volviendo a la misma página.
+- `consolidar(dias)` rehace DemandaDiaria de los últimos `dias` días a partir
+  de los eventos (idempotente, se puede correr varias veces por día).
+- `calcular_popularidad()` deja en Juego.popularidad un score con decaimiento
+  exponencial de los últimos VENTANA_DIAS días; el catálogo ordena por ese
+  campo con ?orden=populares, sin agregar nada en el request.
+
+Todo lo corre `python manage.py consolidar_demanda` (cron diario u horario).
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from CaSy.lotes import EscritorPorLotes
+from .models import DemandaDiaria, EventoJuego, Juego
+
+VISTA, CARRITO, CHECKOUT = 'vista', 'carrito', 'checkout'
+# Columna de DemandaDiaria de cada tipo de evento
+COLUMNAS = {VISTA: 'vistas', CARRITO: 'carritos', CHECKOUT: 'checkouts'}
+PESOS = {'vistas': 1, 'carritos': 5, 'checkouts': 20}
+VENTANA_DIAS = 60
+VIDA_MEDIA_DIAS = 14
+
+escritor = EscritorPorLotes(
+    EventoJuego,
+    tamano=getattr(settings, 'DEMANDA_LOTE', 200),
+    intervalo=getattr(settings, 'DEMANDA_INTERVALO', 10.0),
+    nombre='eventos',
+)
+
+
+def registrar(tipo, juego_id, cantidad=1):
+    if not getattr(settings, 'DEMANDA_EVENTOS', True):
+        return
+    escritor.agregar(EventoJuego(tipo=tipo, juego_id=int(juego_id), cantidad=cantidad))
+
+
+def registrar_pedido(pedido):
+    """Un evento de checkout por juego del snapshot (ver carrito/pedidos.py)"""
+    for item in pedido.items:
+        registrar(CHECKOUT, item['juego_id'], item['cantidad'])
+
+
+def consolidar(dias=2, hoy=None):
+    """
+    Rehace DemandaDiaria desde hace `dias` días hasta hoy con una consulta
+    agrupada sobre EventoJuego. Devuelve cuántas filas escribió.
+    """
+    hoy = hoy or timezone.localdate()
+    desde = hoy - timedelta(days=dias - 1)
+    inicio = timezone.make_aware(datetime.combine(desde, time.min))
+
+    totales = (
+        EventoJuego.objects.filter(fecha__gte=inicio)
+        .annotate(dia=TruncDate('fecha'))
+        .values_list('dia', 'juego_id', 'tipo')
+        .annotate(total=Sum('cantidad'))
+    )
+    filas = defaultdict(lambda: dict.fromkeys(PESOS, 0))
+    for dia, juego_id, tipo, total in totales:
+        filas[(dia, juego_id)][COLUMNAS[tipo]] += total
+
+    existentes = set(Juego.objects.filter(id__in={j for _, j in filas}).values_list('id', flat=True))
+    nuevas = [
+        DemandaDiaria(juego_id=juego_id, dia=dia, **columnas)
+        for (dia, juego_id), columnas in filas.items()
+        if juego_id in existentes
+    ]
+    with transaction.atomic():
+        DemandaDiaria.objects.filter(dia__gte=desde).delete()
+        DemandaDiaria.objects.bulk_create(nuevas, batch_size=500)
+    return len(nuevas)
+
+
+def calcular_popularidad(hoy=None):
+    """
+    Score = suma de (vistas + 5·carritos + 20·unidades pedidas) de cada día,
+    con peso 1/2 cada VIDA_MEDIA_DIAS. Solo escribe los juegos cuyo score cambió.
+    """
+    hoy = hoy or timezone.localdate()
+    scores = defaultdict(float)
+    dias = DemandaDiaria.objects.filter(dia__gte=hoy - timedelta(days=VENTANA_DIAS))
+    for juego_id, dia, *valores in dias.values_list('juego_id', 'dia', *PESOS):
+        puntos = sum(valor * peso for valor, peso in zip(valores, PESOS.values()))
+        scores[juego_id] += puntos * 0.5 ** ((hoy - dia).days / VIDA_MEDIA_DIAS)
+
+    cambiados = []
+    for juego_id, actual in Juego.objects.values_list('id', 'popularidad'):
+        nuevo = round(scores.get(juego_id, 0.0), 3)
+        if nuevo != actual:
+            cambiados.append(Juego(id=juego_id, popularidad=nuevo))
+    Juego.objects.bulk_update(cambiados, ['popularidad'], batch_size=500)
+    return len(cambiados)
+
+
+def purgar_eventos(dias):
+    """Borra los eventos crudos de más de `dias` días (ya consolidados)"""
+    limite = timezone.now() - timedelta(days=dias)
+    borrados, _ = EventoJuego.objects.filter(fecha__lt=limite).delete()
+    return borrados
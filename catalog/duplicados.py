@@ -0,0 +1,318 @@
+# catalog/duplicados.py
+"""
+Detección y fusión de juegos duplicados.
+
+El matcheo difuso de los importadores y las filas "(SECUNDARIO)" que crea
+secus.py cuando no encuentra el juego dejan en el catálogo pares como
+"A Way Out PS4" / "A Way Out PS4 (SECUNDARIO)". Este módulo los agrupa:
+
+1. Clave: nombre normalizado sin consola, "secundario" ni palabras de ruido.
+   Mismos clave y consola -> mismo grupo (score 1.0).
+2. Similares: índice invertido por palabra dentro de cada consola (blocking);
+   solo se comparan juegos que comparten alguna palabra poco frecuente y
+   tienen los mismos números, también romanos (FIFA 22 no se fusiona con
+   FIFA 23 ni Part I con Part II). El score
+   es el del motor de similitud de los importadores.
+
+Cada grupo se convierte en una Propuesta: qué juego se conserva, cómo quedan
+sus precios (el secundario pasa a la fila del primario) y si hay conflictos
+(dos precios primarios distintos, por ejemplo ediciones diferentes), que no
+se aplican salvo que se fuerce. `fusionar` aplica las propuestas en bloque:
+un bulk_update de los juegos conservados, UPDATE por conjunto de alias,
+portadas y eventos de demanda, la DemandaDiaria sumada por día, alias nuevos
+con los nombres eliminados y un DELETE.
+"""
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+from django.utils import timezone
+
+from .busqueda import normalizar_nombre
+from .demanda import COLUMNAS
+from .models import DemandaDiaria, EventoJuego, Juego, PortadaSubida, SupplierAlias
+from .salud import PORTADAS_POR_DEFECTO
+from .similitud import obtener_motor
+
+UMBRAL_SIMILITUD = 0.90
+# Palabras presentes en más juegos que esto no sirven para bloquear
+MAX_FRECUENCIA_BLOQUE = 100
+PALABRAS_RUIDO = {
+    'ps4', 'ps5', 'secundario', 'edition', 'edicion', 'standard', 'estandar',
+    'digital', 'version', 'espanol', 'latino', 'the',
+}
+_SUFIJO_SECUNDARIO = re.compile(r'\s*\(SECUNDARIO\)\s*$', re.IGNORECASE)
+
+CAMPOS = (
+    'id', 'nombre', 'nombre_normalizado', 'consola', 'precio', 'recargo', 'precio_secundario',
+    'recargo_secundario', 'tiene_secundario', 'es_solo_secundario', 'disponible', 'destacado',
+    'imagen', 'imagen_blob_id', 'descripcion', 'fecha_actualizacion',
+)
+
+
+def clave(nombre_normalizado):
+    return ' '.join(p for p in nombre_normalizado.split() if p not in PALABRAS_RUIDO)
+
+
+_ROMANO = re.compile(r'^[ivxl]+$')
+
+
+def _numeros(texto):
+    """Números (también dentro de palabras, 2k25) y romanos: distinguen secuelas y ediciones anuales"""
+    palabras = texto.split()
+    return frozenset(re.findall(r'\d+', texto)) | frozenset(p for p in palabras if _ROMANO.match(p))
+
+
+def sin_sufijo_secundario(nombre):
+    return _SUFIJO_SECUNDARIO.sub('', nombre)
+
+
+class _Grupos:
+    """Union-find sobre índices de la lista de juegos"""
+
+    def __init__(self, cantidad):
+        self.padre = list(range(cantidad))
+
+    def raiz(self, i):
+        while self.padre[i] != i:
+            self.padre[i] = self.padre[self.padre[i]]
+            i = self.padre[i]
+        return i
+
+    def unir(self, a, b):
+        a, b = self.raiz(a), self.raiz(b)
+        if a != b:
+            self.padre[max(a, b)] = min(a, b)
+
+
+def agrupar(juegos, umbral=UMBRAL_SIMILITUD, motor='indel'):
+    """
+    Agrupa dicts de juegos (con 'nombre_normalizado' y 'consola'). Devuelve
+    [(indices, score mínimo del grupo)] solo para grupos de más de un juego.
+    """
+    motor = obtener_motor(motor)
+    claves = [clave(juego['nombre_normalizado'] or normalizar_nombre(juego['nombre'])) for juego in juegos]
+    grupos = _Grupos(len(juegos))
+    scores = {}
+
+    por_consola = defaultdict(list)
+    for i, juego in enumerate(juegos):
+        por_consola[juego['consola']].append(i)
+
+    for indices in por_consola.values():
+        # Misma clave: duplicado seguro
+        por_clave = defaultdict(list)
+        for i in indices:
+            if claves[i]:
+                por_clave[claves[i]].append(i)
+        for iguales in por_clave.values():
+            for i in iguales[1:]:
+                grupos.unir(iguales[0], i)
+                scores[(iguales[0], i)] = 1.0
+
+        # Blocking: cada clave distinta se compara solo con las que comparten una palabra
+        representantes = [iguales[0] for iguales in por_clave.values()]
+        postings = defaultdict(list)
+        for i in representantes:
+            for palabra in set(claves[i].split()):
+                postings[palabra].append(i)
+        for i in representantes:
+            candidatos = set()
+            for palabra in set(claves[i].split()):
+                lista = postings[palabra]
+                if len(lista) <= MAX_FRECUENCIA_BLOQUE:
+                    candidatos.update(j for j in lista if j > i)
+            numeros = _numeros(claves[i])
+            candidatos = sorted(j for j in candidatos if _numeros(claves[j]) == numeros)
+            if not candidatos:
+                continue
+            puntajes = motor.score(claves[i], [claves[j] for j in candidatos], minimo=umbral)
+            for j, puntaje in zip(candidatos, puntajes):
+                if puntaje >= umbral:
+                    grupos.unir(i, j)
+                    scores[(i, j)] = puntaje
+
+    miembros = defaultdict(list)
+    for i in range(len(juegos)):
+        miembros[grupos.raiz(i)].append(i)
+    minimo_por_grupo = defaultdict(lambda: 1.0)
+    for (i, _), puntaje in scores.items():
+        raiz = grupos.raiz(i)
+        minimo_por_grupo[raiz] = min(minimo_por_grupo[raiz], puntaje)
+    return [(indices, round(minimo_por_grupo[raiz], 3)) for raiz, indices in miembros.items() if len(indices) > 1]
+
+
+@dataclass
+class Propuesta:
+    conservar: dict
+    eliminar: list
+    score: float
+    cambios: dict = field(default_factory=dict)
+    conflictos: list = field(default_factory=list)
+
+    @property
+    def ids(self):
+        return [self.conservar['id']] + [juego['id'] for juego in self.eliminar]
+
+
+def _orden_conservar(juego):
+    # Primario con precio, disponible, con portada y el más viejo (su URL ya circula)
+    return (
+        juego['es_solo_secundario'] or juego['precio'] <= 0,
+        not juego['disponible'],
+        (juego['imagen'] or '') in PORTADAS_POR_DEFECTO,
+        juego['id'],
+    )
+
+
+def _valor_unico(juegos, campos, etiqueta, conflictos):
+    """Valores de `campos` compartidos por los juegos; si difieren gana el más reciente"""
+    distintos = {tuple(juego[c] for c in campos) for juego in juegos}
+    if len(distintos) > 1:
+        conflictos.append(etiqueta)
+    reciente = max(juegos, key=lambda juego: juego['fecha_actualizacion'])
+    return {c: reciente[c] for c in campos}
+
+
+def proponer(juegos_grupo, score):
+    """Arma la Propuesta de fusión para un grupo de dicts de juegos"""
+    ordenados = sorted(juegos_grupo, key=_orden_conservar)
+    conservar, eliminar = ordenados[0], ordenados[1:]
+    conflictos = []
+
+    primarios = [j for j in ordenados if not j['es_solo_secundario'] and j['precio'] > 0]
+    secundarios = [j for j in ordenados if j['precio_secundario']]
+    cambios = {}
+    if primarios:
+        cambios.update(_valor_unico(primarios, ('precio', 'recargo'), 'precio primario', conflictos))
+    if secundarios:
+        cambios.update(_valor_unico(
+            secundarios, ('precio_secundario', 'recargo_secundario'), 'precio secundario', conflictos
+        ))
+    if primarios or secundarios:
+        cambios['es_solo_secundario'] = not primarios
+        cambios['tiene_secundario'] = bool(primarios and secundarios)
+    cambios['disponible'] = any(j['disponible'] for j in ordenados)
+    cambios['destacado'] = any(j['destacado'] for j in ordenados)
+    if primarios:
+        cambios['nombre'] = sin_sufijo_secundario(conservar['nombre'])
+
+    if (conservar['imagen'] or '') in PORTADAS_POR_DEFECTO:
+        con_portada = next((j for j in eliminar if (j['imagen'] or '') not in PORTADAS_POR_DEFECTO), None)
+        if con_portada:
+            cambios['imagen'] = con_portada['imagen']
+            cambios['imagen_blob_id'] = con_portada['imagen_blob_id']
+    if not conservar['descripcion']:
+        cambios['descripcion'] = next((j['descripcion'] for j in eliminar if j['descripcion']), conservar['descripcion'])
+
+    cambios = {c: v for c, v in cambios.items() if conservar[c] != v}
+    return Propuesta(conservar=conservar, eliminar=eliminar, score=score, cambios=cambios, conflictos=conflictos)
+
+
+def buscar_duplicados(umbral=UMBRAL_SIMILITUD, motor='indel', consola=None):
+    """Propuestas de fusión para todo el catálogo (una consulta), ordenadas por score"""
+    juegos = Juego.objects.order_by('id')
+    if consola:
+        juegos = juegos.filter(consola=consola)
+    juegos = list(juegos.values(*CAMPOS))
+    propuestas = [
+        proponer([juegos[i] for i in indices], score)
+        for indices, score in agrupar(juegos, umbral=umbral, motor=motor)
+    ]
+    propuestas.sort(key=lambda p: (-p.score, p.conservar['nombre']))
+    return propuestas
+
+
+def _alias_nuevos(propuesta):
+    """Alias con los nombres de las filas eliminadas, para que las próximas importaciones caigan en la conservada"""
+    conservar = propuesta.conservar
+    maximo = SupplierAlias._meta.get_field('texto_original').max_length
+    ahora = timezone.now()
+    for juego in propuesta.eliminar:
+        proveedor = 'secundario' if juego['es_solo_secundario'] else 'primario'
+        texto = sin_sufijo_secundario(juego['nombre'])[:maximo]
+        yield SupplierAlias(
+            texto_original=texto,
+            proveedor=proveedor,
+            consola=conservar['consola'],
+            juego_id=conservar['id'],
+            score=propuesta.score,
+            confirmado=True,
+            ultima_vez=ahora,
+        )
+
+
+def _sumar_demanda(destino_por_id):
+    """
+    DemandaDiaria de los eliminados se suma a la del conservado, día por día
+    (hay una fila por juego y día, así que no alcanza con cambiar juego_id).
+    """
+    columnas = list(COLUMNAS.values())
+    filas = DemandaDiaria.objects.filter(juego_id__in={*destino_por_id, *destino_por_id.values()})
+    sumas = defaultdict(lambda: dict.fromkeys(columnas, 0))
+    for juego_id, dia, *valores in filas.values_list('juego_id', 'dia', *columnas):
+        fila = sumas[(destino_por_id.get(juego_id, juego_id), dia)]
+        for columna, valor in zip(columnas, valores):
+            fila[columna] += valor
+    filas.delete()
+    DemandaDiaria.objects.bulk_create(
+        [DemandaDiaria(juego_id=juego_id, dia=dia, **valores) for (juego_id, dia), valores in sumas.items()],
+        batch_size=500,
+    )
+
+
+def fusionar(propuestas):
+    """
+    Aplica las propuestas en una transacción. Devuelve
+    {'grupos', 'eliminados', 'alias_movidos', 'alias_creados'}.
+    """
+    if not propuestas:
+        return {'grupos': 0, 'eliminados': 0, 'alias_movidos': 0, 'alias_creados': 0}
+
+    destino_por_id = {
+        juego['id']: propuesta.conservar['id'] for propuesta in propuestas for juego in propuesta.eliminar
+    }
+    conservados = []
+    campos = set()
+    for propuesta in propuestas:
+        juego = Juego(**{c: propuesta.conservar[c] for c in CAMPOS if c != 'fecha_actualizacion'})
+        for campo, valor in propuesta.cambios.items():
+            setattr(juego, campo, valor)
+        # bulk_update no pasa por save(): el nombre normalizado y la fecha van a mano
+        juego.nombre_normalizado = normalizar_nombre(juego.nombre)
+        juego.fecha_actualizacion = timezone.now()
+        conservados.append(juego)
+        campos.update(propuesta.cambios)
+    campos.update({'nombre_normalizado', 'fecha_actualizacion'})
+
+    redireccion = Case(
+        *[When(juego_id=origen, then=Value(destino)) for origen, destino in destino_por_id.items()],
+        output_field=IntegerField(),
+    )
+    alias = {}
+    for propuesta in propuestas:
+        for nuevo in _alias_nuevos(propuesta):
+            alias.setdefault((nuevo.proveedor, nuevo.consola, nuevo.texto_original), nuevo)
+
+    with transaction.atomic():
+        # Alias, portadas y demanda de los eliminados pasan al conservado antes del DELETE (CASCADE)
+        alias_movidos = SupplierAlias.objects.filter(juego_id__in=destino_por_id).update(juego_id=redireccion)
+        PortadaSubida.objects.filter(juego_id__in=destino_por_id).update(juego_id=redireccion)
+        EventoJuego.objects.filter(juego_id__in=destino_por_id).update(juego_id=redireccion)
+        _sumar_demanda(destino_por_id)
+        Juego.objects.filter(id__in=destino_por_id).delete()
+        Juego.objects.bulk_update(conservados, sorted(campos), batch_size=500)
+        # Si el proveedor ya tenía ese texto como alias se respeta el existente
+        existentes = set(SupplierAlias.objects.filter(
+            texto_original__in={texto for _, _, texto in alias}
+        ).values_list('proveedor', 'consola', 'texto_original'))
+        nuevos = [a for clave_alias, a in alias.items() if clave_alias not in existentes]
+        SupplierAlias.objects.bulk_create(nuevos, batch_size=500)
+    return {
+        'grupos': len(propuestas),
+        'eliminados': len(destino_por_id),
+        'alias_movidos': alias_movidos,
+        'alias_creados': len(nuevos),
+    }
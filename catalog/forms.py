@@ -1,11 +1,13 @@
 from django import forms
-import os
-from django.conf import settings
-from django.utils.text import slugify
 from .models import Juego
+from . import procesamiento_portadas
 
 class JuegoAdminForm(forms.ModelForm):
-    nueva_portada = forms.ImageField(required=False, label="Subir nueva portada")
+    nueva_portada = forms.ImageField(
+        required=False,
+        label="Subir nueva portada",
+        help_text="Se optimiza en segundo plano; hasta entonces se sigue viendo la portada actual"
+    )
 
     class Meta:
         model = Juego
@@ -15,25 +17,17 @@ class JuegoAdminForm(forms.ModelForm):
         instance = super().save(commit=False)
 
         nueva_imagen = self.cleaned_data.get("nueva_portada")
-
-        if nueva_imagen:
-            # Crear nombre normalizado por el nombre del juego
-            nombre_archivo = slugify(instance.nombre) + ".jpg"
-
-            # Ruta absoluta a static/img/
-            carpeta_destino = os.path.join(settings.BASE_DIR, "static", "img")
-            os.makedirs(carpeta_destino, exist_ok=True)
-
-            ruta_final = os.path.join(carpeta_destino, nombre_archivo)
-
-            # Guardar el archivo subido
-            with open(ruta_final, "wb+") as destino:
-                for chunk in nueva_imagen.chunks():
-                    destino.write(chunk)
-
-            # Guardar ruta en el modelo
-            instance.imagen = f"img/{nombre_archivo}"
+        # Original tal como llegó, nombrado por su hash (el juego puede no tener id todavía)
+        self.portada_original = procesamiento_portadas.guardar_original(nueva_imagen) if nueva_imagen else None
 
         if commit:
             instance.save()
+            self.encolar_portada()
         return instance
+
+    def encolar_portada(self):
+        """Llamar con el juego ya guardado (el admin lo hace en save_model)"""
+        if getattr(self, 'portada_original', None):
+            ruta, hash_original = self.portada_original
+            procesamiento_portadas.encolar(self.instance, ruta, hash_original)
+            self.portada_original = None
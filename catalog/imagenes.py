@@ -0,0 +1,136 @@
+# catalog/imagenes.py
+"""
+Índice de metadatos de las portadas de static/img: ancho, alto y un
+placeholder diminuto en base64. Lo usa el template tag `cover_img` para
+emitir width/height sin abrir las imágenes en cada request.
+
+Se genera con `python manage.py indexar_imagenes` y se actualiza al subir
+una portada desde el admin.
+
+Las portadas que se generan en producción (subidas desde el admin, ver
+catalog/procesamiento_portadas.py) no van a static: se guardan en el storage
+por defecto (MEDIA_ROOT/portadas/) porque no pasan por collectstatic ni por
+su manifest. `Juego.imagen` guarda las dos clases de ruta; `url_imagen` y
+`ruta_archivo` resuelven cada una en su lugar.
+"""
+import base64
+import io
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.templatetags.static import static
+
+EXTENSIONES_IMAGEN = ('.jpg', '.jpeg', '.png', '.webp')
+# Lado mayor del placeholder; el navegador lo escala y queda borroso
+LADO_PLACEHOLDER = 12
+# Portadas procesadas, relativas al storage por defecto (MEDIA_ROOT)
+SUBDIRECTORIO_MEDIA = 'portadas'
+
+
+def ruta_indice():
+    return Path(getattr(settings, 'INDICE_IMAGENES', settings.BASE_DIR / 'indice_imagenes.json'))
+
+
+def directorio_estaticos():
+    return Path(settings.STATICFILES_DIRS[0])
+
+
+def es_media(nombre):
+    return (nombre or '').startswith(SUBDIRECTORIO_MEDIA + '/')
+
+
+def ruta_archivo(nombre):
+    """Archivo en disco de una ruta de Juego.imagen (media o estática)"""
+    if es_media(nombre):
+        return Path(default_storage.path(nombre))
+    return directorio_estaticos() / nombre
+
+
+def url_imagen(nombre):
+    """URL pública de una ruta de Juego.imagen (media o estática)"""
+    if es_media(nombre):
+        return default_storage.url(nombre)
+    return static(nombre)
+
+
+def describir_imagen(ruta):
+    """{'w': ancho, 'h': alto, 'ph': data URI del placeholder} o None si no se puede abrir"""
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(ruta) as imagen:
+            ancho, alto = imagen.size
+            miniatura = imagen.convert('RGB')
+            miniatura.thumbnail((LADO_PLACEHOLDER, LADO_PLACEHOLDER))
+            buffer = io.BytesIO()
+            miniatura.save(buffer, 'WEBP', quality=30)
+    except (OSError, UnidentifiedImageError):
+        return None
+
+    placeholder = base64.b64encode(buffer.getvalue()).decode('ascii')
+    return {'w': ancho, 'h': alto, 'ph': f'data:image/webp;base64,{placeholder}'}
+
+
+def generar_indice(subdirectorio='img'):
+    """Recorre static/<subdirectorio> y escribe el índice. Devuelve (indice, ilegibles)."""
+    base = directorio_estaticos()
+    indice = {}
+    ilegibles = []
+    for ruta in sorted((base / subdirectorio).rglob('*')):
+        if ruta.suffix.lower() not in EXTENSIONES_IMAGEN:
+            continue
+        nombre = ruta.relative_to(base).as_posix()
+        datos = describir_imagen(ruta)
+        if datos is None:
+            ilegibles.append(nombre)
+            continue
+        indice[nombre] = datos
+    guardar_indice(indice)
+    return indice, ilegibles
+
+
+def guardar_indice(indice):
+    destino = ruta_indice()
+    temporal = destino.with_suffix('.tmp')
+    # Una imagen por línea, así los cambios del índice se leen bien en un diff
+    lineas = (
+        f'{json.dumps(nombre, ensure_ascii=False)}: {json.dumps(indice[nombre], sort_keys=True)}'
+        for nombre in sorted(indice)
+    )
+    temporal.write_text('{\n' + ',\n'.join(lineas) + '\n}\n', encoding='utf-8')
+    os.replace(temporal, destino)
+
+
+@lru_cache(maxsize=2)
+def _leer_indice(ruta, mtime):
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+
+def cargar_indice():
+    """Índice en memoria; se relee solo si el archivo cambió"""
+    ruta = ruta_indice()
+    try:
+        mtime = os.path.getmtime(ruta)
+    except OSError:
+        return {}
+    return _leer_indice(str(ruta), mtime)
+
+
+def buscar_imagen(nombre):
+    return cargar_indice().get(nombre)
+
+
+def actualizar_entrada(nombre):
+    """Recalcula la entrada de una imagen (p. ej. después de subir una portada)"""
+    datos = describir_imagen(ruta_archivo(nombre))
+    indice = dict(cargar_indice())
+    if datos is None:
+        indice.pop(nombre, None)
+    else:
+        indice[nombre] = datos
+    guardar_indice(indice)
@@ -0,0 +1,132 @@
+# catalog/importacion.py
+"""
+Utilidades compartidas por los comandos de importación de stock
+(ps4, ps5, secus): hash del archivo, lotes, corridas reanudables y
+cache de alias de proveedor.
+"""
+import hashlib
+from itertools import islice
+
+from django.utils import timezone
+
+from .models import ImportRun, Juego, SupplierAlias
+
+TAMANO_LOTE = 200
+
+
+def calcular_hash_archivo(ruta, tamano_bloque=65536):
+    """Devuelve el SHA-256 del archivo"""
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(tamano_bloque), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def en_lotes(iterable, tamano=TAMANO_LOTE):
+    """Agrupa un iterable en listas de hasta `tamano` elementos"""
+    iterador = iter(iterable)
+    while True:
+        lote = list(islice(iterador, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+def corrida_incompleta(comando, hash_archivo):
+    """Última corrida sin terminar para el mismo comando y archivo, o None"""
+    return ImportRun.objects.filter(
+        comando=comando,
+        hash_archivo=hash_archivo,
+        etapa__in=['procesando', 'reconciliando', 'fallida'],
+    ).order_by('-fecha_inicio').first()
+
+
+def iniciar_corrida(comando, ruta, reanudar=False):
+    """
+    Crea una corrida nueva o, con `reanudar`, retoma la última incompleta
+    del mismo archivo. Devuelve (corrida, reanudada, pendiente) donde
+    `pendiente` es una corrida incompleta que se ignoró por no pedir --resume.
+    """
+    hash_archivo = calcular_hash_archivo(ruta)
+    pendiente = corrida_incompleta(comando, hash_archivo)
+
+    if reanudar and pendiente:
+        pendiente.marcar_etapa('procesando')
+        return pendiente, True, None
+
+    corrida = ImportRun.objects.create(
+        comando=comando,
+        archivo=str(ruta),
+        hash_archivo=hash_archivo,
+    )
+    return corrida, False, pendiente
+
+
+class CacheAlias:
+    """
+    Alias de un proveedor cargados en memoria para toda la corrida, con sus
+    juegos (un in_bulk la primera vez que se busca). Los aciertos y alias
+    nuevos se escriben con `guardar()` al cerrar cada lote.
+    """
+
+    def __init__(self, proveedor):
+        self.proveedor = proveedor
+        self.alias = {
+            (alias.consola, alias.texto_original): alias
+            for alias in SupplierAlias.objects.filter(proveedor=proveedor)
+        }
+        self.juegos = None
+        self.pendientes = {}
+        self.aciertos = 0
+        self.fallos = 0
+
+    def buscar(self, texto, consola):
+        """Juego asociado al texto crudo, o None si hay que hacer fuzzy matching"""
+        clave = (consola, texto)
+        alias = self.alias.get(clave)
+        if alias is not None and self.juegos is None:
+            self.juegos = Juego.objects.in_bulk({a.juego_id for a in self.alias.values()})
+        juego = self.juegos.get(alias.juego_id) if alias else None
+        if juego is None:
+            self.fallos += 1
+            return None
+
+        alias.ultima_vez = timezone.now()
+        self.pendientes[clave] = alias
+        self.aciertos += 1
+        return juego
+
+    def registrar(self, texto, consola, juego, score):
+        """Agrega el resultado de un fuzzy matching como alias nuevo"""
+        if len(texto) > SupplierAlias._meta.get_field('texto_original').max_length:
+            return
+        clave = (consola, texto)
+        alias = SupplierAlias(
+            texto_original=texto,
+            proveedor=self.proveedor,
+            consola=consola,
+            juego_id=juego.id,
+            score=score,
+            ultima_vez=timezone.now(),
+        )
+        self.alias[clave] = alias
+        self.pendientes[clave] = alias
+        if self.juegos is not None:
+            self.juegos[juego.id] = juego
+
+    def guardar(self):
+        """Escribe los alias pendientes. Llamar dentro de la transacción del lote."""
+        nuevos = [alias for alias in self.pendientes.values() if alias.pk is None]
+        vistos = [alias for alias in self.pendientes.values() if alias.pk is not None]
+        if nuevos:
+            # Si otro proceso ya creó el alias, se respeta el existente
+            SupplierAlias.objects.bulk_create(
+                nuevos,
+                update_conflicts=True,
+                unique_fields=['proveedor', 'consola', 'texto_original'],
+                update_fields=['ultima_vez'],
+            )
+        if vistos:
+            SupplierAlias.objects.bulk_update(vistos, ['ultima_vez'])
+        self.pendientes.clear()
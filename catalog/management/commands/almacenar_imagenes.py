@@ -0,0 +1,83 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from catalog.almacen_imagenes import almacenar, asignar_juegos, hash_archivo, imagenes_sueltas, mismo_archivo
+from catalog.imagenes import cargar_indice, directorio_estaticos, guardar_indice
+
+
+def megabytes(cantidad):
+    return f'{cantidad / 1024 / 1024:.1f} MB'
+
+
+class Command(BaseCommand):
+    help = (
+        'Pasa las imágenes de static/img al almacén por contenido (static/img/cas): '
+        'una copia por imagen distinta, los nombres viejos quedan como hardlinks y '
+        'Juego.imagen apunta al blob. Se puede correr de nuevo después de cada importación.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo contar duplicados y el espacio a recuperar'
+        )
+        parser.add_argument(
+            '--sin-juegos',
+            action='store_true',
+            help='No cambiar Juego.imagen (solo deduplicar el disco)'
+        )
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        base = directorio_estaticos()
+        dry_run = options['dry_run']
+
+        if dry_run:
+            vistos = {}
+            total = duplicados = recuperables = 0
+            for ruta in imagenes_sueltas():
+                total += 1
+                hash_contenido = hash_archivo(ruta)
+                if hash_contenido in vistos and not mismo_archivo(ruta, vistos[hash_contenido]):
+                    duplicados += 1
+                    recuperables += ruta.stat().st_size
+                vistos.setdefault(hash_contenido, ruta)
+            self.stdout.write(self.style.WARNING('🔍 MODO SIMULACIÓN'))
+            self.stdout.write(f'🖼️  Imágenes: {total} ({len(vistos)} distintas)')
+            self.stdout.write(f'♻️  Duplicadas: {duplicados} ({megabytes(recuperables)} a recuperar)')
+            return
+
+        blobs_por_nombre = {}
+        nuevos = enlazadas = 0
+        liberados = 0
+        # El índice se escribe una sola vez al final, no por cada blob
+        indice = dict(cargar_indice())
+        for ruta in imagenes_sueltas():
+            ya_enlazado = ruta.stat().st_nlink > 1
+            blob, nuevo = almacenar(ruta, indice=indice)
+            nuevos += nuevo
+            if not nuevo and not ya_enlazado:
+                # El contenido ya estaba en el almacén: este archivo era una copia
+                enlazadas += 1
+                liberados += blob.tamano
+            blobs_por_nombre[ruta.relative_to(base).as_posix()] = blob
+
+        if nuevos:
+            guardar_indice(indice)
+
+        asignados = 0 if options['sin_juegos'] else asignar_juegos(blobs_por_nombre)
+        if asignados:
+            from catalog.signals import notificar_catalogo_actualizado
+
+            notificar_catalogo_actualizado('almacenar_imagenes')
+
+        self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
+        self.stdout.write(self.style.SUCCESS('📊 ALMACÉN DE IMÁGENES'))
+        self.stdout.write(self.style.SUCCESS(f'{"="*60}'))
+        self.stdout.write(f'🖼️  Nombres revisados: {len(blobs_por_nombre)}')
+        self.stdout.write(self.style.SUCCESS(f'✅ Blobs nuevos: {nuevos}'))
+        self.stdout.write(self.style.SUCCESS(f'♻️  Copias reemplazadas por hardlinks: {enlazadas} ({megabytes(liberados)})'))
+        self.stdout.write(self.style.SUCCESS(f'🎮 Juegos apuntando al almacén: {asignados}'))
+        self.stdout.write(f'⏱️  {time.perf_counter() - inicio:.1f}s')
@@ -0,0 +1,168 @@
+import csv
+import os
+import time
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from catalog.models import Juego
+from catalog.similitud import MOTORES, obtener_motor
+from catalog.management.commands.ps5 import Command as ComandoPS5
+
+ARCHIVOS_STOCK = {
+    'stock_ps4.csv': 'ps4',
+    'stock_ps5.csv': 'ps5',
+    'stock_secus.csv': None,  # la consola sale del nombre
+}
+
+UMBRALES = (0.85, 0.90)
+
+
+class Command(BaseCommand):
+    help = 'Compara velocidad y coincidencia de los motores de similitud sobre los stock_*.csv'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--motores',
+            nargs='+',
+            choices=sorted(MOTORES),
+            default=sorted(MOTORES),
+            help='Motores a comparar (la referencia siempre es sequencematcher)'
+        )
+        parser.add_argument(
+            '--calibrar',
+            action='store_true',
+            help='Calcular los cortes de cada motor que mejor reproducen los umbrales 0.85/0.90'
+        )
+        parser.add_argument(
+            '--columna-nombre',
+            type=str,
+            default='JUEGOS',
+            help='Nombre de la columna con el nombre del juego'
+        )
+
+    def leer_consultas(self, col_nombre, normalizador):
+        """Lee los nombres de los CSV de stock y los normaliza como los importadores"""
+        consultas = []
+        for archivo, consola in ARCHIVOS_STOCK.items():
+            ruta = os.path.join(settings.BASE_DIR, archivo)
+            if not os.path.exists(ruta):
+                self.stdout.write(self.style.WARNING(f'⚠️  No se encontró {archivo}, se omite'))
+                continue
+
+            with open(ruta, 'r', encoding='utf-8-sig') as file:
+                content = file.read().replace('�', '').replace('"', '').replace("'", "")
+
+            reader = csv.DictReader(content.splitlines(), delimiter=';')
+            if reader.fieldnames:
+                reader.fieldnames = [name.strip().upper() for name in reader.fieldnames]
+            if col_nombre not in (reader.fieldnames or []):
+                continue
+
+            for row in reader:
+                nombre = (row.get(col_nombre) or '').strip()
+                if not nombre:
+                    continue
+                consola_fila = consola or ('ps5' if 'PS5' in nombre.upper() else 'ps4')
+                nombre_base, _ = normalizador.limpiar_nombre_base(nombre)
+                consultas.append((consola_fila, nombre_base.lower()))
+        return consultas
+
+    def leer_catalogo(self, normalizador):
+        """Nombres normalizados del catálogo por consola"""
+        catalogo = {'ps4': [], 'ps5': []}
+        for nombre, consola in Juego.objects.values_list('nombre', 'consola'):
+            if consola in catalogo:
+                catalogo[consola].append(normalizador.limpiar_nombre_cacheado(nombre)[0].lower())
+        return catalogo
+
+    def calcular_corte(self, pares, umbral):
+        """
+        Corte del score crudo que maximiza la coincidencia con
+        `SequenceMatcher >= umbral`. `pares` es una lista de (referencia, crudo).
+        """
+        pares = sorted(pares, key=lambda p: p[1], reverse=True)
+        positivos_totales = sum(1 for ref, _ in pares if ref >= umbral)
+        # Con corte por encima de todo: aciertos = todos los negativos
+        aciertos = len(pares) - positivos_totales
+        mejor_aciertos, mejor_i = aciertos, -1
+        for i, (ref, crudo) in enumerate(pares):
+            aciertos += 1 if ref >= umbral else -1
+            if aciertos > mejor_aciertos:
+                mejor_aciertos, mejor_i = aciertos, i
+        if mejor_i < 0:
+            return 1.0, mejor_aciertos / len(pares) if pares else 1.0
+        # Punto medio entre el último par aceptado y el siguiente
+        corte = pares[mejor_i][1]
+        if mejor_i + 1 < len(pares):
+            corte = (corte + pares[mejor_i + 1][1]) / 2
+        return round(corte, 4), mejor_aciertos / len(pares)
+
+    def handle(self, *args, **options):
+        normalizador = ComandoPS5()
+        consultas = self.leer_consultas(options['columna_nombre'], normalizador)
+        catalogo = self.leer_catalogo(normalizador)
+
+        if not consultas or not any(catalogo.values()):
+            self.stdout.write(self.style.ERROR('❌ Faltan datos: se necesitan CSV de stock y juegos en la BD'))
+            return
+
+        self.stdout.write(f'📁 Consultas: {len(consultas)}')
+        self.stdout.write(f'💾 Catálogo: PS4={len(catalogo["ps4"])} PS5={len(catalogo["ps5"])}')
+
+        referencia = obtener_motor('sequencematcher')
+        motores = ['sequencematcher'] + [m for m in options['motores'] if m != 'sequencematcher']
+
+        resultados_ref = None
+        for nombre_motor in motores:
+            # Sin calibrar para poder recalcular los cortes desde cero
+            motor = obtener_motor(nombre_motor, calibracion={} if options['calibrar'] else None)
+
+            inicio = time.perf_counter()
+            resultados = [motor.score(q, catalogo[c], minimo=0.85) for c, q in consultas]
+            duracion = time.perf_counter() - inicio
+
+            if resultados_ref is None:
+                resultados_ref = resultados
+                tiempo_ref = duracion
+
+            self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
+            self.stdout.write(self.style.SUCCESS(f'⚙️  {nombre_motor}'))
+            self.stdout.write(f'   Tiempo: {duracion:.3f}s ({duracion / len(consultas) * 1000:.2f} ms/consulta)')
+            if nombre_motor != 'sequencematcher':
+                self.stdout.write(f'   Aceleración vs SequenceMatcher: x{tiempo_ref / duracion:.1f}')
+
+            self.reportar_coincidencia(resultados_ref, resultados)
+
+            if options['calibrar'] and nombre_motor != 'sequencematcher':
+                self.calibrar(referencia, motor, consultas, catalogo)
+
+    def reportar_coincidencia(self, resultados_ref, resultados):
+        """Coincidencia de decisiones (umbral 0.85) y del mejor candidato"""
+        pares_iguales = pares_totales = mejores_iguales = 0
+        for ref, otro in zip(resultados_ref, resultados):
+            for a, b in zip(ref, otro):
+                if a >= 0.85 or b >= 0.85:
+                    pares_totales += 1
+                    pares_iguales += (a >= 0.85) == (b >= 0.85)
+            mejor_ref = max(range(len(ref)), key=ref.__getitem__) if ref and max(ref) >= 0.85 else None
+            mejor_otro = max(range(len(otro)), key=otro.__getitem__) if otro and max(otro) >= 0.85 else None
+            mejores_iguales += mejor_ref == mejor_otro
+
+        coincidencia_pares = pares_iguales / pares_totales * 100 if pares_totales else 100.0
+        self.stdout.write(f'   Coincidencia de pares >= 0.85: {coincidencia_pares:.2f}% ({pares_iguales}/{pares_totales})')
+        self.stdout.write(f'   Mismo mejor candidato: {mejores_iguales / len(resultados) * 100:.2f}%')
+
+    def calibrar(self, referencia, motor, consultas, catalogo):
+        """Muestra los cortes calibrados para pegar en settings.SIMILITUD_CALIBRACION"""
+        pares = []
+        for consola, consulta in consultas:
+            ref = referencia.score(consulta, catalogo[consola], minimo=0.6)
+            crudos = motor.score(consulta, catalogo[consola], minimo=0.6)
+            pares.extend((a, b) for a, b in zip(ref, crudos) if a or b)
+
+        cortes = {}
+        for umbral in UMBRALES:
+            corte, exactitud = self.calcular_corte(pares, umbral)
+            cortes[umbral] = corte
+            self.stdout.write(f'   Umbral {umbral:.2f} -> corte {corte:.4f} (coincidencia {exactitud * 100:.2f}%)')
+
+        self.stdout.write(self.style.WARNING(f"   SIMILITUD_CALIBRACION['{motor.nombre}'] = {cortes}"))
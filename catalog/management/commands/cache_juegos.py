@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from catalog import cache_juegos
+
+
+class Command(BaseCommand):
+    help = 'Métricas del cache de juegos por id (catalog/cache_juegos.py) e invalidación manual'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--invalidar',
+            action='store_true',
+            help='Incrementar la versión: todos los procesos vuelven a leer de la base'
+        )
+        parser.add_argument(
+            '--reiniciar-metricas',
+            action='store_true',
+            help='Poner los contadores en cero después de mostrarlos'
+        )
+
+    def handle(self, *args, **options):
+        if options['invalidar']:
+            cache_juegos.invalidar_todo()
+            self.stdout.write(self.style.SUCCESS('🧹 Cache de juegos invalidado'))
+
+        datos = cache_juegos.metricas()
+        self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
+        self.stdout.write(self.style.SUCCESS('📊 CACHE DE JUEGOS'))
+        self.stdout.write(self.style.SUCCESS(f'{"="*60}'))
+        self.stdout.write(f"🔢 Versión: {datos['version']}")
+        self.stdout.write(f"🔍 Consultas: {datos['consultas']}")
+        self.stdout.write(f"⚡ Aciertos en memoria del proceso: {datos['local']}")
+        self.stdout.write(f"📦 Aciertos en cache compartido: {datos['compartido']}")
+        self.stdout.write(f"🗄️  Leídos de la base: {datos['base']}")
+        self.stdout.write(f"🧹 Invalidaciones: {datos['invalidaciones']}")
+        estilo = self.style.SUCCESS if datos['tasa_aciertos'] >= 0.9 else self.style.WARNING
+        self.stdout.write(estilo(f"🎯 Tasa de aciertos: {datos['tasa_aciertos']:.1%}"))
+        self.stdout.write(
+            '   (los procesos suman sus contadores cada '
+            f'{cache_juegos.VOLCAR_METRICAS_CADA} consultas)'
+        )
+
+        if options['reiniciar_metricas']:
+            cache_juegos.reiniciar_metricas()
+            self.stdout.write(self.style.WARNING('Contadores en cero'))
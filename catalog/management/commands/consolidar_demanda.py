@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.demanda import calcular_popularidad, consolidar, purgar_eventos
+from catalog.models import Juego
+from catalog.signals import notificar_catalogo_actualizado
+
+
+class Command(BaseCommand):
+    help = (
+        'Resume los eventos de demanda (vistas, carrito, checkout) en totales por juego y día '
+        'y recalcula Juego.popularidad para ordenar el catálogo por "más vendidos"'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias',
+            type=int,
+            default=2,
+            help='Días hacia atrás a rehacer (incluye hoy)'
+        )
+        parser.add_argument(
+            '--purgar',
+            type=int,
+            default=90,
+            metavar='DIAS',
+            help='Borrar eventos crudos de más de DIAS días (0 para no borrar)'
+        )
+
+    def handle(self, *args, **options):
+        if options['dias'] < 1:
+            raise CommandError('--dias tiene que ser al menos 1')
+        if options['purgar'] and options['purgar'] < options['dias']:
+            raise CommandError('--purgar no puede ser menor que --dias: se perderían eventos sin consolidar')
+
+        inicio = time.perf_counter()
+        filas = consolidar(dias=options['dias'])
+        cambiados = calcular_popularidad()
+        borrados = purgar_eventos(options['purgar']) if options['purgar'] else 0
+        if cambiados:
+            notificar_catalogo_actualizado('consolidar_demanda')
+
+        self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
+        self.stdout.write(self.style.SUCCESS('📈 DEMANDA'))
+        self.stdout.write(self.style.SUCCESS(f'{"="*60}'))
+        self.stdout.write(self.style.SUCCESS(f'✅ Filas diarias escritas: {filas} (últimos {options["dias"]} días)'))
+        self.stdout.write(f'🔥 Popularidad actualizada: {cambiados} juegos')
+        self.stdout.write(f'🗑️  Eventos purgados: {borrados}')
+
+        top = Juego.objects.filter(disponible=True, popularidad__gt=0).order_by('-popularidad')[:10]
+        for juego in top:
+            self.stdout.write(f'   {juego.popularidad:>10.1f}  {juego.nombre} ({juego.consola})')
+        self.stdout.write(f'⏱️  {time.perf_counter() - inicio:.2f}s')
@@ -1,10 +1,10 @@
 import csv
 import os
 import re
-import shutil
 from django.core.management.base import BaseCommand
 from django.conf import settings
 from pathlib import Path
+from catalog.almacen_imagenes import enlazar
 
 class Command(BaseCommand):
     help = 'Busca y copia portadas de juegos PS4 desde el CSV a una carpeta destino'
@@ -202,7 +202,8 @@ class Command(BaseCommand):
                             destino = os.path.join(destino_path, imagen_encontrada)
                             
                             try:
-                                shutil.copy2(origen, destino)
+                                # Hardlink: la carpeta de destino no vuelve a ocupar los bytes
+                                enlazar(Path(origen), Path(destino))
                                 encontradas.append({
                                     'original': nombre_sucio,
                                     'limpio': nombre_busqueda,
@@ -1,7 +1,8 @@
 import os
-import shutil
+from pathlib import Path
 from django.core.management.base import BaseCommand
 from django.conf import settings
+from catalog.almacen_imagenes import enlazar
 
 
 class Command(BaseCommand):
@@ -51,7 +52,8 @@ class Command(BaseCommand):
             origen = os.path.join(carpeta_origen, archivo)
             destino = os.path.join(carpeta_destino, archivo)
             try:
-                shutil.copy2(origen, destino)
+                # Hardlink: la carpeta de destino no vuelve a ocupar los bytes
+                enlazar(Path(origen), Path(destino))
                 self.stdout.write(self.style.SUCCESS(f'✅ Copiado: {archivo}'))
             except Exception as e:
                 self.stdout.write(self.style.ERROR(f'Error copiando {archivo}: {str(e)}'))
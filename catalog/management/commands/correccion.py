@@ -1,6 +1,8 @@
 # catalog/management/commands/corregir_precios_secundarios.py
 from django.core.management.base import BaseCommand
 from catalog.models import Juego
+from catalog.reconciliacion import FILTRO_PRECIO_EQUIVOCADO, corregir_precios_secundarios
+from catalog.signals import notificar_catalogo_actualizado
 
 class Command(BaseCommand):
     help = 'Corrige juegos secundarios que tienen el precio en el campo equivocado'
@@ -9,60 +11,27 @@ class Command(BaseCommand):
         parser.add_argument(
             '--dry-run',
             action='store_true',
-            help='Simular sin hacer cambios reales'
+            help='Simular sin hacer cambios reales (solo cuenta los juegos afectados)'
         )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
         
-        # Buscar juegos secundarios con precio_secundario NULL pero precio válido
-        juegos_incorrectos = Juego.objects.filter(
-            es_solo_secundario=True,
-            precio_secundario__isnull=True,
-            precio__gt=0
-        )
+        # Con -v 2 se listan los juegos afectados antes de corregir
+        if options['verbosity'] >= 2:
+            juegos_incorrectos = Juego.objects.filter(FILTRO_PRECIO_EQUIVOCADO).values_list('nombre', 'precio', 'recargo')
+            for nombre, precio, recargo in juegos_incorrectos:
+                self.stdout.write(f"{'[DRY-RUN] ' if dry_run else ''}Corrigiendo: {nombre}")
+                self.stdout.write(f"  precio: {precio} -> 0 | precio_secundario: None -> {precio}")
+                self.stdout.write(f"  recargo: {recargo} -> 0 | recargo_secundario: None -> {recargo}")
         
-        total = juegos_incorrectos.count()
+        # Un solo UPDATE (o un solo COUNT en simulación)
+        corregidos = corregir_precios_secundarios(dry_run=dry_run)
         
-        if total == 0:
+        if corregidos == 0:
             self.stdout.write(self.style.SUCCESS('✅ No hay juegos con precios incorrectos'))
             return
         
-        self.stdout.write(self.style.WARNING(f'\n🔧 Encontrados {total} juegos para corregir\n'))
-        
-        corregidos = 0
-        errores = 0
-        
-        for juego in juegos_incorrectos:
-            try:
-                self.stdout.write(f"{'[DRY-RUN] ' if dry_run else ''}Corrigiendo: {juego.nombre}")
-                self.stdout.write(f"  precio: {juego.precio} -> 0")
-                self.stdout.write(f"  precio_secundario: None -> {juego.precio}")
-                self.stdout.write(f"  recargo: {juego.recargo} -> 0")
-                self.stdout.write(f"  recargo_secundario: None -> {juego.recargo}")
-                
-                if not dry_run:
-                    # Guardar valores originales
-                    precio_original = juego.precio
-                    recargo_original = juego.recargo
-                    
-                    # Mover precios a los campos correctos
-                    juego.precio_secundario = precio_original
-                    juego.recargo_secundario = recargo_original
-                    juego.precio = 0
-                    juego.recargo = 0
-                    juego.save()
-                    
-                    self.stdout.write(self.style.SUCCESS(f"  ✅ Corregido\n"))
-                else:
-                    self.stdout.write(self.style.WARNING(f"  ⚠️  Simulado\n"))
-                
-                corregidos += 1
-                
-            except Exception as e:
-                errores += 1
-                self.stdout.write(self.style.ERROR(f"  ❌ Error: {str(e)}\n"))
-        
         # Resumen
         self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
         self.stdout.write(self.style.SUCCESS('📊 RESUMEN'))
@@ -70,11 +39,8 @@ class Command(BaseCommand):
         
         if dry_run:
             self.stdout.write(self.style.WARNING(f'🔍 MODO SIMULACIÓN - No se hicieron cambios reales'))
-        
-        self.stdout.write(self.style.SUCCESS(f'✅ Juegos corregidos: {corregidos}'))
-        
-        if errores > 0:
-            self.stdout.write(self.style.ERROR(f'❌ Errores: {errores}'))
-        
-        if dry_run:
-            self.stdout.write(self.style.WARNING(f'\n💡 Ejecuta sin --dry-run para aplicar los cambios'))
\ No newline at end of file
+            self.stdout.write(self.style.WARNING(f'🔧 Juegos a corregir: {corregidos}'))
+            self.stdout.write(self.style.WARNING(f'\n💡 Ejecuta sin --dry-run para aplicar los cambios'))
+        else:
+            notificar_catalogo_actualizado('correccion')
+            self.stdout.write(self.style.SUCCESS(f'✅ Juegos corregidos: {corregidos}'))
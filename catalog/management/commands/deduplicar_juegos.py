@@ -0,0 +1,175 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.duplicados import UMBRAL_SIMILITUD, buscar_duplicados, fusionar
+from catalog.similitud import MOTORES
+from catalog.signals import notificar_catalogo_actualizado
+
+COLUMNAS_CSV = ['grupo', 'confirmar', 'score', 'conflictos', 'accion', 'id', 'nombre', 'precio', 'precio_secundario', 'disponible']
+CONFIRMADO = {'si', 'sí', 's', 'x', '1', 'true'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Busca juegos duplicados (ej. "X PS4" y "X PS4 (SECUNDARIO)") por nombre normalizado y '
+        'similitud, propone fusiones y aplica las confirmadas dejando alias para las próximas importaciones'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--umbral',
+            type=float,
+            default=UMBRAL_SIMILITUD,
+            help='Score mínimo para considerar dos nombres el mismo juego'
+        )
+        parser.add_argument(
+            '--matcher',
+            type=str,
+            choices=sorted(MOTORES),
+            default='indel',
+            help='Motor de similitud'
+        )
+        parser.add_argument(
+            '--consola',
+            type=str,
+            choices=['ps4', 'ps5'],
+            default=None,
+            help='Limitar a una consola'
+        )
+        parser.add_argument(
+            '--csv',
+            type=str,
+            default=None,
+            help='Escribir las propuestas en este CSV para revisarlas (columna "confirmar")'
+        )
+        parser.add_argument(
+            '--aplicar',
+            type=str,
+            default=None,
+            metavar='CSV',
+            help='Aplicar los grupos marcados en la columna "confirmar" de un CSV generado con --csv'
+        )
+        parser.add_argument(
+            '--aplicar-exactos',
+            action='store_true',
+            help='Aplicar sin revisión los grupos con score 1.0 (misma clave) y sin conflictos'
+        )
+        parser.add_argument(
+            '--forzar',
+            action='store_true',
+            help='Aplicar también grupos con conflictos de precio (gana el precio más reciente)'
+        )
+        parser.add_argument(
+            '--limite',
+            type=int,
+            default=30,
+            help='Grupos a mostrar en consola'
+        )
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        propuestas = buscar_duplicados(umbral=options['umbral'], motor=options['matcher'], consola=options['consola'])
+        segundos = time.perf_counter() - inicio
+
+        if options['aplicar']:
+            confirmadas = self.leer_confirmados(options['aplicar'], propuestas)
+        elif options['aplicar_exactos']:
+            confirmadas = [p for p in propuestas if p.score == 1.0]
+        else:
+            confirmadas = None
+
+        if confirmadas is None:
+            self.mostrar(propuestas, options['limite'])
+            if options['csv']:
+                self.escribir_csv(options['csv'], propuestas)
+                self.stdout.write(self.style.SUCCESS(f"\n📁 Propuestas en {options['csv']}"))
+                self.stdout.write(f"   Marcá 'si' en la columna confirmar y corré --aplicar {options['csv']}")
+            self.stdout.write(f'⏱️  {segundos:.2f}s')
+            return
+
+        con_conflicto = [p for p in confirmadas if p.conflictos]
+        if con_conflicto and not options['forzar']:
+            for propuesta in con_conflicto:
+                self.stdout.write(self.style.WARNING(
+                    f"⚠️  Grupo de #{propuesta.conservar['id']} omitido: {', '.join(propuesta.conflictos)} (usá --forzar)"
+                ))
+            confirmadas = [p for p in confirmadas if not p.conflictos]
+
+        resultado = fusionar(confirmadas)
+        if resultado['eliminados']:
+            notificar_catalogo_actualizado('deduplicar_juegos')
+
+        self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
+        self.stdout.write(self.style.SUCCESS('📊 FUSIÓN DE DUPLICADOS'))
+        self.stdout.write(self.style.SUCCESS(f'{"="*60}'))
+        self.stdout.write(self.style.SUCCESS(f"✅ Grupos fusionados: {resultado['grupos']}"))
+        self.stdout.write(self.style.SUCCESS(f"🗑️  Juegos eliminados: {resultado['eliminados']}"))
+        self.stdout.write(f"🔗 Alias movidos: {resultado['alias_movidos']} | creados: {resultado['alias_creados']}")
+        self.stdout.write(f'⏱️  {time.perf_counter() - inicio:.2f}s')
+
+    def mostrar(self, propuestas, limite):
+        eliminables = sum(len(p.eliminar) for p in propuestas)
+        exactos = sum(1 for p in propuestas if p.score == 1.0)
+        self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
+        self.stdout.write(self.style.SUCCESS('🔍 DUPLICADOS'))
+        self.stdout.write(self.style.SUCCESS(f'{"="*60}'))
+        self.stdout.write(f'👯 Grupos: {len(propuestas)} ({exactos} exactos) | juegos a eliminar: {eliminables}')
+
+        for propuesta in propuestas[:limite]:
+            conservar = propuesta.conservar
+            estilo = self.style.WARNING if propuesta.conflictos else self.style.SUCCESS
+            self.stdout.write(estilo(f"\n[{propuesta.score:.2f}] ✅ #{conservar['id']} {conservar['nombre']}"))
+            for juego in propuesta.eliminar:
+                self.stdout.write(f"       ➜ #{juego['id']} {juego['nombre']}")
+            if propuesta.cambios:
+                cambios = ', '.join(f'{campo}={valor}' for campo, valor in propuesta.cambios.items() if campo != 'descripcion')
+                self.stdout.write(f'       ✏️  {cambios}')
+            if propuesta.conflictos:
+                self.stdout.write(self.style.WARNING(f"       ⚠️  Conflicto: {', '.join(propuesta.conflictos)}"))
+        if len(propuestas) > limite:
+            self.stdout.write(f'\n... y {len(propuestas) - limite} grupos más (ver --csv)')
+
+    def escribir_csv(self, ruta, propuestas):
+        with open(ruta, 'w', encoding='utf-8-sig', newline='') as archivo:
+            escritor = csv.DictWriter(archivo, fieldnames=COLUMNAS_CSV)
+            escritor.writeheader()
+            for numero, propuesta in enumerate(propuestas, 1):
+                for accion, juego in [('conservar', propuesta.conservar)] + [('eliminar', j) for j in propuesta.eliminar]:
+                    escritor.writerow({
+                        'grupo': numero,
+                        # Los exactos sin conflictos vienen confirmados; el resto se revisa a mano
+                        'confirmar': 'si' if propuesta.score == 1.0 and not propuesta.conflictos else '',
+                        'score': propuesta.score,
+                        'conflictos': '; '.join(propuesta.conflictos),
+                        'accion': accion,
+                        'id': juego['id'],
+                        'nombre': juego['nombre'],
+                        'precio': juego['precio'],
+                        'precio_secundario': juego['precio_secundario'] or '',
+                        'disponible': juego['disponible'],
+                    })
+
+    def leer_confirmados(self, ruta, propuestas):
+        """Propuestas actuales cuyos ids coinciden con un grupo confirmado del CSV"""
+        try:
+            with open(ruta, encoding='utf-8-sig', newline='') as archivo:
+                filas = list(csv.DictReader(archivo))
+        except FileNotFoundError:
+            raise CommandError(f'No se encontró {ruta}')
+
+        grupos = {}
+        for fila in filas:
+            grupo = grupos.setdefault(fila['grupo'], {'confirmado': False, 'ids': set()})
+            grupo['confirmado'] |= fila['confirmar'].strip().lower() in CONFIRMADO
+            grupo['ids'].add(int(fila['id']))
+        confirmados = {frozenset(g['ids']) for g in grupos.values() if g['confirmado']}
+
+        # El catálogo pudo cambiar desde que se generó el CSV: solo se aplica lo que sigue igual
+        vigentes = [p for p in propuestas if frozenset(p.ids) in confirmados]
+        if len(vigentes) < len(confirmados):
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  {len(confirmados) - len(vigentes)} grupos del CSV ya no coinciden con el catálogo y se omiten'
+            ))
+        return vigentes
@@ -0,0 +1,49 @@
+import os
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from django.utils import timezone
+from catalog.snapshot import ErrorSnapshot, exportar, formatos_disponibles, TAMANO_LOTE_SNAPSHOT
+
+
+class Command(BaseCommand):
+    help = 'Exporta Juego, ResenaCliente, SupplierAlias e ImagenBlob a un snapshot columnar comprimido'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--salida',
+            type=str,
+            default=None,
+            help='Directorio del snapshot (por defecto snapshots/catalogo-<fecha>)'
+        )
+        parser.add_argument(
+            '--formato',
+            type=str,
+            choices=['parquet', 'binario'],
+            default=None,
+            help='parquet (requiere pyarrow) o binario (gzip). Por defecto parquet si está disponible'
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANO_LOTE_SNAPSHOT,
+            help='Filas por row group / bloque'
+        )
+
+    def handle(self, *args, **options):
+        formato = options['formato'] or formatos_disponibles()[0]
+        salida = options['salida'] or os.path.join(
+            settings.BASE_DIR, 'snapshots', f"catalogo-{timezone.now():%Y%m%d-%H%M%S}"
+        )
+
+        try:
+            manifiesto = exportar(salida, formato=formato, tamano_lote=options['lote'])
+        except ErrorSnapshot as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
+        self.stdout.write(self.style.SUCCESS(f'📦 SNAPSHOT EXPORTADO ({formato})'))
+        self.stdout.write(self.style.SUCCESS(f'{"="*60}'))
+        for etiqueta, tabla in manifiesto['tablas'].items():
+            tamano = os.path.getsize(os.path.join(salida, tabla['archivo']))
+            self.stdout.write(f"   {etiqueta}: {tabla['filas']} filas ({tamano / 1024:.1f} KB)")
+        self.stdout.write(self.style.SUCCESS(f'📁 {salida}'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from catalog.almacen_imagenes import recolectar
+
+
+class Command(BaseCommand):
+    help = (
+        'Borra los blobs de static/img/cas y las portadas procesadas de '
+        'MEDIA_ROOT/portadas que ningún juego usa. Correr `collectstatic` después.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo listar lo que se borraría'
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        resultado = recolectar(dry_run=dry_run)
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('🔍 MODO SIMULACIÓN'))
+        if options['verbosity'] >= 2 or dry_run:
+            for nombre in resultado['archivos']:
+                self.stdout.write(f'   🗑️  {nombre}')
+
+        verbo = 'a borrar' if dry_run else 'borrados'
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Archivos {verbo}: {len(resultado['archivos'])} "
+            f"({resultado['bytes'] / 1024 / 1024:.1f} MB)"
+        ))
@@ -0,0 +1,65 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from catalog.signals import notificar_catalogo_actualizado
+from catalog.snapshot import ErrorSnapshot, importar, leer_manifiesto, TAMANO_LOTE_SNAPSHOT
+
+
+class Command(BaseCommand):
+    help = 'Reemplaza Juego, ResenaCliente y SupplierAlias con el contenido de un snapshot (los juegos que siguen conservan portadas subidas y demanda; los ImagenBlob que falten se agregan)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('directorio', type=str, help='Directorio generado por exportar_catalogo')
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANO_LOTE_SNAPSHOT,
+            help='Filas por bulk_create'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Cargar y verificar todo, pero deshacer la transacción al final'
+        )
+        parser.add_argument(
+            '--noinput', '--no-input',
+            action='store_false',
+            dest='interactive',
+            help='No pedir confirmación'
+        )
+
+    def handle(self, *args, **options):
+        directorio = options['directorio']
+        dry_run = options['dry_run']
+
+        try:
+            manifiesto = leer_manifiesto(directorio)
+        except ErrorSnapshot as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f"📦 Snapshot {manifiesto['formato']} del {manifiesto['creado']}")
+        for etiqueta, tabla in manifiesto['tablas'].items():
+            self.stdout.write(f"   {etiqueta}: {tabla['filas']} filas")
+
+        if options['interactive'] and not dry_run:
+            respuesta = input('⚠️  Se van a REEMPLAZAR estas tablas. Escribí "si" para continuar: ')
+            if respuesta.strip().lower() not in ('si', 'sí'):
+                self.stdout.write(self.style.WARNING('Cancelado'))
+                return
+
+        inicio = time.perf_counter()
+        try:
+            cargadas = importar(directorio, tamano_lote=options['lote'], dry_run=dry_run)
+        except ErrorSnapshot as e:
+            raise CommandError(f'❌ {e}. No se modificó la base.')
+        duracion = time.perf_counter() - inicio
+        if not dry_run:
+            notificar_catalogo_actualizado('importar_catalogo')
+
+        self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
+        self.stdout.write(self.style.SUCCESS('📊 RESUMEN'))
+        self.stdout.write(self.style.SUCCESS(f'{"="*60}'))
+        if dry_run:
+            self.stdout.write(self.style.WARNING('🔍 MODO SIMULACIÓN - Se deshicieron los cambios'))
+        for etiqueta, filas in cargadas.items():
+            self.stdout.write(self.style.SUCCESS(f'✅ {etiqueta}: {filas} filas'))
+        self.stdout.write(f'⏱️  {duracion:.2f}s')
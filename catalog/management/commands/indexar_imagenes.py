@@ -0,0 +1,19 @@
+import time
+from django.core.management.base import BaseCommand
+from catalog.imagenes import generar_indice, ruta_indice
+
+
+class Command(BaseCommand):
+    help = 'Genera el índice de dimensiones y placeholders de static/img (lo usa {% cover_img %})'
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        indice, ilegibles = generar_indice()
+        duracion = time.perf_counter() - inicio
+
+        self.stdout.write(self.style.SUCCESS(f'✅ {len(indice)} imágenes indexadas en {duracion:.1f}s'))
+        self.stdout.write(f'📁 {ruta_indice()}')
+        if ilegibles:
+            self.stdout.write(self.style.WARNING(f'⚠️  {len(ilegibles)} imágenes no se pudieron abrir:'))
+            for nombre in ilegibles:
+                self.stdout.write(f'   - {nombre}')
@@ -0,0 +1,63 @@
+import os
+import shutil
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from catalog.prerender import construir, directorio
+
+
+class Command(BaseCommand):
+    help = (
+        'Pre-renderiza a HTML estático el detalle de cada juego, las primeras páginas de cada '
+        'listado y el sitemap.xml. Solo vuelve a renderizar lo que cambió desde el último build.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--paginas',
+            type=int,
+            default=settings.PRERENDER_PAGINAS,
+            help='Páginas de cada listado (general, ps4, ps5) a pre-renderizar'
+        )
+        parser.add_argument(
+            '--procesos',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Procesos que renderizan en paralelo'
+        )
+        parser.add_argument(
+            '--todo',
+            action='store_true',
+            help='Renderizar todas las páginas aunque no hayan cambiado'
+        )
+        parser.add_argument(
+            '--limpiar',
+            action='store_true',
+            help='Borrar las páginas generadas (el sitio vuelve a servir todo desde las vistas)'
+        )
+
+    def handle(self, *args, **options):
+        if options['limpiar']:
+            shutil.rmtree(directorio(), ignore_errors=True)
+            self.stdout.write(self.style.SUCCESS(f'🗑️  {directorio()} borrado'))
+            return
+
+        inicio = time.perf_counter()
+        resultado = construir(paginas=options['paginas'], procesos=options['procesos'], todo=options['todo'])
+
+        self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
+        self.stdout.write(self.style.SUCCESS('📄 PRE-RENDER DEL CATÁLOGO'))
+        self.stdout.write(self.style.SUCCESS(f'{"="*60}'))
+        self.stdout.write(f"📄 Páginas: {resultado['paginas']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Renderizadas: {resultado['renderizadas']} ({resultado['bytes'] / 1024:.0f} KB)"
+        ))
+        self.stdout.write(f"⏭️  Sin cambios: {resultado['sin_cambios']}")
+        self.stdout.write(f"🗑️  Borradas: {resultado['borradas']}")
+        self.stdout.write(f"🗺️  URLs en el sitemap: {resultado['en_sitemap']}")
+        self.stdout.write(f"📁 {directorio()} (versión del catálogo {resultado['version']})")
+        if not settings.PRERENDER_SERVIR:
+            self.stdout.write(self.style.WARNING('⚠️  PRERENDER_SERVIR no está activo: las páginas no se sirven'))
+        self.stdout.write(f'⏱️  {time.perf_counter() - inicio:.1f}s')
@@ -0,0 +1,52 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from catalog import trabajos
+
+
+class Command(BaseCommand):
+    help = (
+        'Corre las importaciones de stock encoladas desde el admin. Con '
+        'IMPORTACIONES_WORKER=comando es el único worker; con el valor por defecto '
+        'sirve para vaciar la cola si el proceso web se reinició.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--esperar',
+            action='store_true',
+            help='Quedarse esperando trabajos nuevos en lugar de terminar'
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=2.0,
+            help='Segundos entre consultas a la cola con --esperar'
+        )
+        parser.add_argument(
+            '--reencolar',
+            action='store_true',
+            help='Volver a la cola todos los trabajos que quedaron "corriendo" (se reanudan desde su checkpoint); '
+                 'sin esta opción solo los que no avanzan hace IMPORTACIONES_COLGADO_MINUTOS'
+        )
+
+    def handle(self, *args, **options):
+        minutos = None if options['reencolar'] else settings.IMPORTACIONES_COLGADO_MINUTOS
+        reencolados = trabajos.reencolar_colgados(minutos)
+        if reencolados:
+            self.stdout.write(self.style.WARNING(f'🔁 Trabajos reencolados: {reencolados}'))
+
+        total = 0
+        while True:
+            corridos = trabajos.procesar_pendientes()
+            if corridos:
+                total += corridos
+                self.stdout.write(self.style.SUCCESS(f'✅ Importaciones corridas: {corridos}'))
+            if not options['esperar']:
+                break
+            time.sleep(options['intervalo'])
+
+        if not total:
+            self.stdout.write('No hay importaciones pendientes')
@@ -0,0 +1,66 @@
+import hashlib
+import time
+
+from django.core.management.base import BaseCommand
+
+from catalog import procesamiento_portadas
+from catalog.imagenes import directorio_estaticos
+from catalog.models import Juego, PortadaSubida
+
+
+class Command(BaseCommand):
+    help = (
+        'Procesa las portadas subidas desde el admin que quedaron pendientes '
+        '(o todas, con PORTADAS_WORKER=comando). Con --existentes también optimiza '
+        'las portadas que todavía se sirven desde static/img sin procesar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--existentes',
+            action='store_true',
+            help='Encolar y procesar las portadas actuales que todavía no están en media (portadas/)'
+        )
+        parser.add_argument(
+            '--limite',
+            type=int,
+            default=None,
+            help='Con --existentes: cantidad máxima de juegos'
+        )
+
+    def encolar_existentes(self, limite):
+        base = directorio_estaticos()
+        juegos = (
+            Juego.objects.exclude(imagen__startswith=procesamiento_portadas.SUBDIRECTORIO + '/')
+            .exclude(imagen__in=['', 'img/default.jpg', 'img/default.png'])
+            .exclude(portadas_subidas__estado='pendiente')
+            .only('id', 'imagen')
+            .order_by('id')
+        )
+        hashes = {}
+        encoladas = faltantes = 0
+        for juego in juegos[:limite] if limite else juegos:
+            ruta = base / juego.imagen
+            if not ruta.is_file():
+                faltantes += 1
+                continue
+            if ruta not in hashes:
+                hashes[ruta] = hashlib.sha256(ruta.read_bytes()).hexdigest()
+            # El original es el archivo que ya se servía: no se copia
+            PortadaSubida.objects.create(juego=juego, hash_original=hashes[ruta], original=str(ruta))
+            encoladas += 1
+        return encoladas, faltantes
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        if options['existentes']:
+            encoladas, faltantes = self.encolar_existentes(options['limite'])
+            self.stdout.write(f'📥 Portadas existentes encoladas: {encoladas}')
+            if faltantes:
+                self.stdout.write(self.style.WARNING(f'⚠️  Juegos con imagen inexistente en static: {faltantes}'))
+
+        procesadas, fallidas = procesamiento_portadas.procesar_pendientes()
+        self.stdout.write(self.style.SUCCESS(f'✅ Portadas procesadas: {procesadas}'))
+        if fallidas:
+            self.stdout.write(self.style.ERROR(f'❌ Portadas ilegibles: {fallidas} (ver el admin de Portadas subidas)'))
+        self.stdout.write(f'⏱️  {time.perf_counter() - inicio:.1f}s')
@@ -6,13 +6,28 @@ import unicodedata
 from decimal import Decimal
 from django.core.management.base import BaseCommand
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from catalog.models import Juego
-from difflib import SequenceMatcher
+from catalog.busqueda import candidatos_similares
+from catalog.importacion import iniciar_corrida, en_lotes, CacheAlias, TAMANO_LOTE
+from catalog.similitud import MOTORES, obtener_motor
+from catalog.signals import notificar_catalogo_actualizado
+from catalog.salud import PORTADAS_POR_DEFECTO
+
+# Campos que escribe la importación de stock primario
+CAMPOS_STOCK = ['precio', 'recargo', 'disponible', 'imagen', 'fecha_actualizacion']
 
 class Command(BaseCommand):
     help = 'Actualiza stock de PS4 desde CSV'
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.motor = obtener_motor()
+        self._nombres_limpios = {}
+        self.alias = None
+        self.ultimo_score = 0.0
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--file',
@@ -38,6 +53,24 @@ class Command(BaseCommand):
             default='DISPONIBLE',
             help='Nombre de la columna con disponibilidad (0=False, vacío=True)'
         )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANO_LOTE,
+            help='Filas por transacción (cada lote confirmado es un checkpoint)'
+        )
+        parser.add_argument(
+            '--matcher',
+            type=str,
+            choices=sorted(MOTORES),
+            default='sequencematcher',
+            help='Motor de similitud para el matcheo de nombres'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Reanudar la última corrida incompleta de este archivo desde su checkpoint'
+        )
 
     def quitar_acentos(self, texto):
         """Elimina acentos y diacríticos de un texto"""
@@ -121,6 +154,25 @@ class Command(BaseCommand):
         
         return nombre, version
 
+    def limpiar_nombre_cacheado(self, nombre):
+        """limpiar_nombre_base memoizado: los nombres del catálogo se repiten en cada búsqueda"""
+        if nombre not in self._nombres_limpios:
+            self._nombres_limpios[nombre] = self.limpiar_nombre_base(nombre)
+        return self._nombres_limpios[nombre]
+
+    def buscar_juego(self, nombre_csv):
+        """Busca primero en los alias del proveedor; el fuzzy matching solo corre si no hay alias"""
+        if self.alias is not None:
+            juego = self.alias.buscar(nombre_csv, 'ps4')
+            if juego:
+                self.stdout.write(f"\n🔗 Alias: '{nombre_csv}' → '{juego.nombre}'")
+                return juego
+        
+        juego = self.buscar_juego_exacto(nombre_csv)
+        if juego and self.alias is not None:
+            self.alias.registrar(nombre_csv, 'ps4', juego, self.ultimo_score)
+        return juego
+
     def buscar_juego_exacto(self, nombre_csv):
         """Busca el juego con coincidencia EXACTA incluyendo versión"""
         nombre_base, version_csv = self.limpiar_nombre_base(nombre_csv)
@@ -129,17 +181,20 @@ class Command(BaseCommand):
         self.stdout.write(f"   Nombre base: '{nombre_base}'")
         self.stdout.write(f"   Versión detectada: {version_csv}")
         
-        # Obtener todos los PS4
-        juegos_ps4 = Juego.objects.filter(consola='ps4')
+        # Candidatos PS4 (en PostgreSQL, prefiltrados con el índice trigram)
+        juegos_ps4 = list(candidatos_similares(Juego.objects.filter(consola='ps4'), nombre_base))
+        limpios = [self.limpiar_nombre_cacheado(juego.nombre) for juego in juegos_ps4]
+        
+        # Similitud del nombre base contra todos los candidatos de una vez
+        ratios = self.motor.score(
+            nombre_base.lower(),
+            [nombre_bd.lower() for nombre_bd, _ in limpios],
+            minimo=0.85
+        )
         
         candidatos = []
         
-        for juego in juegos_ps4:
-            nombre_bd, version_bd = self.limpiar_nombre_base(juego.nombre)
-            
-            # Calcular similitud del nombre base
-            ratio_nombre = SequenceMatcher(None, nombre_base.lower(), nombre_bd.lower()).ratio()
-            
+        for juego, (nombre_bd, version_bd), ratio_nombre in zip(juegos_ps4, limpios, ratios):
             # El nombre debe ser MUY similar
             if ratio_nombre < 0.85:
                 continue
@@ -182,6 +237,7 @@ class Command(BaseCommand):
             return None
         
         mejor = candidatos[0]
+        self.ultimo_score = mejor['score']
         
         # Requerir score mínimo de 0.90 para aceptar
         if mejor['score'] >= 0.90:
@@ -281,37 +337,20 @@ class Command(BaseCommand):
         return f"{nombre}_{consola}.jpg"
 
     def generar_reporte_portadas_no_encontradas(self, juegos_actualizados):
-        """Genera un reporte de las portadas que no se encontraron"""
+        """Genera un reporte de las portadas que no se encontraron (una sola consulta)"""
         self.stdout.write(self.style.WARNING(f'\n{"🚨 REPORTE DE PORTADAS NO ENCONTRADAS 🚨":=^60}'))
         
-        juegos_sin_portada = Juego.objects.filter(
-            consola='ps4', 
-            disponible=True,
-            imagen="img/default.jpg"
-        ) | Juego.objects.filter(
-            consola='ps4', 
-            disponible=True,
-            imagen="img/default.png"
-        ) | Juego.objects.filter(
-            consola='ps4', 
-            disponible=True,
-            imagen__isnull=True
-        )
+        imagenes = Juego.objects.filter(consola='ps4', disponible=True).values_list('nombre', 'imagen')
+        sin_portada = [nombre for nombre, imagen in imagenes if imagen in PORTADAS_POR_DEFECTO or imagen is None]
         
-        total_sin_portada = juegos_sin_portada.count()
-        self.stdout.write(self.style.ERROR(f'Juegos PS4 SIN portada: {total_sin_portada}'))
+        self.stdout.write(self.style.ERROR(f'Juegos PS4 SIN portada: {len(sin_portada)}'))
         
-        if total_sin_portada > 0:
+        if sin_portada:
             self.stdout.write("\n📋 Lista de juegos PS4 sin portada:")
-            for juego in juegos_sin_portada:
-                self.stdout.write(f"   • {juego.nombre}")
-        
-        juegos_con_portada = Juego.objects.filter(
-            consola='ps4', 
-            disponible=True
-        ).exclude(imagen="img/default.jpg").exclude(imagen="img/default.png").exclude(imagen__isnull=True)
-        
-        self.stdout.write(self.style.SUCCESS(f'\n✅ Juegos PS4 CON portada: {juegos_con_portada.count()}'))
+            for nombre in sin_portada:
+                self.stdout.write(f"   • {nombre}")
+
+        self.stdout.write(self.style.SUCCESS(f'\n✅ Juegos PS4 CON portada: {len(imagenes) - len(sin_portada)}'))
 
     def handle(self, *args, **options):
         csv_filename = options['file']
@@ -319,16 +358,29 @@ class Command(BaseCommand):
         col_nombre = options['columna_nombre']
         col_precio = options['columna_precio']
         col_disponible = options['columna_disponible']
+        tamano_lote = options['lote']
+        self.motor = obtener_motor(options['matcher'])
+        self.alias = CacheAlias('primario')
         
         if not os.path.exists(csv_path):
             self.stdout.write(self.style.ERROR(f'No se encontro {csv_path}'))
             return
         
-        juegos_en_stock_ids = []
-        actualizados = 0
+        corrida, reanudada, pendiente = iniciar_corrida('ps4', csv_path, reanudar=options['resume'])
+        if reanudada:
+            self.stdout.write(self.style.WARNING(
+                f'⏩ Reanudando corrida #{corrida.id} desde la línea {corrida.checkpoint + 1}'
+            ))
+        elif pendiente:
+            self.stdout.write(self.style.WARNING(
+                f'Hay una corrida incompleta de este archivo (#{pendiente.id}, línea {pendiente.checkpoint}). '
+                f'Usá --resume para continuarla.'
+            ))
+        
+        contadores = {'actualizados': 0, 'desactivados_por_csv': 0, 'no_encontrados': 0, 'errores': 0}
+        contadores.update(corrida.contadores)
         errores = []
         no_encontrados = []
-        desactivados_por_csv = 0
         
         try:
             with open(csv_path, 'r', encoding='utf-8-sig') as file:
@@ -344,87 +396,118 @@ class Command(BaseCommand):
                 
                 if col_nombre not in csv_reader.fieldnames:
                     self.stdout.write(self.style.ERROR(f'No se encontro la columna "{col_nombre}"'))
+                    corrida.marcar_etapa('fallida', f'Falta la columna {col_nombre}')
                     return
                 
                 if col_precio not in csv_reader.fieldnames:
                     self.stdout.write(self.style.ERROR(f'No se encontro la columna "{col_precio}"'))
+                    corrida.marcar_etapa('fallida', f'Falta la columna {col_precio}')
                     return
                 
                 tiene_columna_disponible = col_disponible in csv_reader.fieldnames
                 if not tiene_columna_disponible:
                     self.stdout.write(self.style.WARNING(f'No se encontró la columna "{col_disponible}". Usando disponible=True por defecto.'))
                 
-                for linea_num, row in enumerate(csv_reader, start=2):
-                    try:
-                        nombre_sucio = row.get(col_nombre, '').strip()
-                        if not nombre_sucio:
-                            continue
-                        
-                        # Determinar disponibilidad
-                        if tiene_columna_disponible:
-                            disponible_str = row.get(col_disponible, '')
-                            disponible = self.determinar_disponibilidad(disponible_str)
-                        else:
-                            disponible = True
-                        
-                        # Buscar juego con coincidencia exacta
-                        juego = self.buscar_juego_exacto(nombre_sucio)
-                        
-                        if not juego:
-                            no_encontrados.append(nombre_sucio)
-                            self.stdout.write(self.style.WARNING(f'NO ENCONTRADO: {nombre_sucio}'))
-                            continue
-                        
-                        # Obtener y limpiar precio
-                        precio = self.limpiar_precio(row.get(col_precio, ''))
-                        recargo = self.calcular_recargo(precio)
-                        
-                        # Actualizar
-                        juego.precio = precio
-                        juego.recargo = recargo
-                        juego.disponible = disponible
-                        if not juego.imagen or "default" in juego.imagen:
-                            juego.imagen = self.buscar_imagen_existente(juego.nombre)
-                        juego.save()
-                        
-                        juegos_en_stock_ids.append(juego.id)
-                        actualizados += 1
-                        
-                        if not disponible:
-                            desactivados_por_csv += 1
+                for lote in en_lotes(enumerate(csv_reader, start=2), tamano_lote):
+                    # Al reanudar, las líneas ya confirmadas se saltean sin buscar coincidencias
+                    lote = [(linea_num, row) for linea_num, row in lote if linea_num > corrida.checkpoint]
+                    if not lote:
+                        continue
+                    
+                    with transaction.atomic():
+                        juegos_lote = {}
                         
-                        estado = "NO DISPONIBLE" if not disponible else "OK"
-                        self.stdout.write(
-                            self.style.SUCCESS(f'✓ {estado}: {juego.nombre} - ${precio}')
-                        )
+                        for linea_num, row in lote:
+                            try:
+                                nombre_sucio = row.get(col_nombre, '').strip()
+                                if not nombre_sucio:
+                                    continue
+                                
+                                # Determinar disponibilidad
+                                if tiene_columna_disponible:
+                                    disponible_str = row.get(col_disponible, '')
+                                    disponible = self.determinar_disponibilidad(disponible_str)
+                                else:
+                                    disponible = True
+                                
+                                # Buscar juego con coincidencia exacta
+                                juego = self.buscar_juego(nombre_sucio)
+                                
+                                if not juego:
+                                    no_encontrados.append(nombre_sucio)
+                                    contadores['no_encontrados'] += 1
+                                    self.stdout.write(self.style.WARNING(f'NO ENCONTRADO: {nombre_sucio}'))
+                                    continue
+                                
+                                # Obtener y limpiar precio
+                                precio = self.limpiar_precio(row.get(col_precio, ''))
+                                recargo = self.calcular_recargo(precio)
+                                
+                                # Actualizar (se escribe al cerrar el lote)
+                                juego.precio = precio
+                                juego.recargo = recargo
+                                juego.disponible = disponible
+                                if not juego.imagen or "default" in juego.imagen:
+                                    juego.imagen = self.buscar_imagen_existente(juego.nombre)
+                                juego.fecha_actualizacion = timezone.now()
+                                juegos_lote[juego.id] = juego
+                                
+                                contadores['actualizados'] += 1
+                                
+                                if not disponible:
+                                    contadores['desactivados_por_csv'] += 1
+                                
+                                estado = "NO DISPONIBLE" if not disponible else "OK"
+                                self.stdout.write(
+                                    self.style.SUCCESS(f'✓ {estado}: {juego.nombre} - ${precio}')
+                                )
+                                
+                            except Exception as e:
+                                error_msg = f'Linea {linea_num}: {str(e)}'
+                                errores.append(error_msg)
+                                contadores['errores'] += 1
+                                self.stdout.write(self.style.ERROR(error_msg))
+                                continue
                         
-                    except Exception as e:
-                        error_msg = f'Linea {linea_num}: {str(e)}'
-                        errores.append(error_msg)
-                        self.stdout.write(self.style.ERROR(error_msg))
-                        continue
+                        # Un UPDATE por lote y el checkpoint en la misma transacción
+                        if juegos_lote:
+                            Juego.objects.bulk_update(juegos_lote.values(), CAMPOS_STOCK)
+                        self.alias.guardar()
+                        corrida.guardar_checkpoint(lote[-1][0], juegos_lote.keys(), contadores, len(lote))
         
         except Exception as e:
+            corrida.marcar_etapa('fallida', str(e))
             self.stdout.write(self.style.ERROR(f'Error: {str(e)}'))
+            self.stdout.write(self.style.WARNING(
+                f'Corrida #{corrida.id} detenida en la línea {corrida.checkpoint}. Usá --resume para continuar.'
+            ))
+            # Los lotes confirmados antes del error ya cambiaron el catálogo
+            notificar_catalogo_actualizado('ps4')
             return
         
         # Desactivar juegos no en stock
-        if juegos_en_stock_ids:
-            juegos_a_desactivar = Juego.objects.filter(consola='ps4').exclude(id__in=juegos_en_stock_ids)
-            desactivados_count = juegos_a_desactivar.update(disponible=False)
-        else:
-            desactivados_count = 0
+        corrida.marcar_etapa('reconciliando')
+        juegos_en_stock_ids = corrida.ids_en_stock
+        with transaction.atomic():
+            if juegos_en_stock_ids:
+                juegos_a_desactivar = Juego.objects.filter(consola='ps4').exclude(id__in=juegos_en_stock_ids)
+                desactivados_count = juegos_a_desactivar.update(disponible=False)
+            else:
+                desactivados_count = 0
+            corrida.marcar_etapa('completada')
+        notificar_catalogo_actualizado('ps4')
         
         # Resultados
         self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
-        self.stdout.write(self.style.SUCCESS(f'ACTUALIZADOS: {actualizados}'))
+        self.stdout.write(self.style.SUCCESS(f'ACTUALIZADOS: {contadores["actualizados"]}'))
         self.stdout.write(self.style.SUCCESS(f'DESACTIVADOS: {desactivados_count}'))
-        self.stdout.write(self.style.WARNING(f'DESACTIVADOS (por CSV): {desactivados_por_csv}'))
-        self.stdout.write(self.style.WARNING(f'NO ENCONTRADOS: {len(no_encontrados)}'))
+        self.stdout.write(self.style.WARNING(f'DESACTIVADOS (por CSV): {contadores["desactivados_por_csv"]}'))
+        self.stdout.write(self.style.WARNING(f'NO ENCONTRADOS: {contadores["no_encontrados"]}'))
+        self.stdout.write(f'RESUELTOS POR ALIAS: {self.alias.aciertos} (fuzzy: {self.alias.fallos})')
         
         if no_encontrados:
             self.stdout.write(self.style.WARNING("\nJuegos no encontrados en BD:"))
             for nombre in no_encontrados[:20]:
                 self.stdout.write(f"  - {nombre}")
         
-        self.generar_reporte_portadas_no_encontradas(actualizados)
\ No newline at end of file
+        self.generar_reporte_portadas_no_encontradas(contadores['actualizados'])
@@ -0,0 +1,134 @@
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def percentil_ponderado(valores, p):
+    """Percentil de [(valor, peso)]: cada registro muestreado representa `peso` requests"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    total = sum(peso for _, peso in ordenados)
+    objetivo = total * p / 100
+    acumulado = 0.0
+    for valor, peso in ordenados:
+        acumulado += peso
+        if acumulado >= objetivo:
+            return valor
+    return ordenados[-1][0]
+
+
+class Command(BaseCommand):
+    help = 'p50/p95/p99 por nombre de URL a partir del log de requests (CaSy/rendimiento.py)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--archivo',
+            type=str,
+            default=str(settings.LOG_REQUESTS),
+            help='Log JSON de requests (se leen también los rotados .1, .2, ...)'
+        )
+        parser.add_argument(
+            '--horas',
+            type=float,
+            default=None,
+            help='Solo las últimas N horas'
+        )
+        parser.add_argument(
+            '--url',
+            type=str,
+            default='',
+            help='Solo URLs cuyo nombre contenga este texto'
+        )
+        parser.add_argument(
+            '--solo-lentos',
+            action='store_true',
+            help='Solo los requests que superaron REQUEST_LENTO_MS'
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Salida en JSON'
+        )
+
+    def archivos(self, base):
+        base = Path(base)
+        rotados = sorted(base.parent.glob(base.name + '.*'), key=lambda r: r.suffix)
+        return [r for r in [base, *rotados] if r.is_file()]
+
+    def leer(self, archivos, desde, filtro_url, solo_lentos):
+        for ruta in archivos:
+            with open(ruta, encoding='utf-8') as archivo:
+                for linea in archivo:
+                    try:
+                        registro = json.loads(linea)
+                    except json.JSONDecodeError:
+                        continue
+                    if desde and registro.get('ts', 0) < desde:
+                        continue
+                    if filtro_url and filtro_url not in registro.get('url', ''):
+                        continue
+                    if solo_lentos and not registro.get('lento'):
+                        continue
+                    yield registro
+
+    def handle(self, *args, **options):
+        archivos = self.archivos(options['archivo'])
+        if not archivos:
+            raise CommandError(f"❌ No hay log en {options['archivo']} (¿se corrió el sitio con MEDIR_REQUESTS=1?)")
+
+        desde = time.time() - options['horas'] * 3600 if options['horas'] else None
+        por_url = defaultdict(list)
+        for registro in self.leer(archivos, desde, options['url'], options['solo_lentos']):
+            por_url[registro.get('url', '?')].append(registro)
+
+        filas = []
+        for url, registros in por_url.items():
+            # Sin ponderar cuando se filtran solo los lentos (ya no es una muestra del total)
+            pesos = [1.0 if options['solo_lentos'] else r.get('peso', 1.0) for r in registros]
+            totales = list(zip((r['total_ms'] for r in registros), pesos))
+            peso_total = sum(pesos)
+
+            def promedio(campo):
+                return sum(r.get(campo, 0) * p for r, p in zip(registros, pesos)) / peso_total
+
+            filas.append({
+                'url': url,
+                'registros': len(registros),
+                'requests_estimados': round(peso_total),
+                'lentos': sum(1 for r in registros if r.get('lento')),
+                'p50_ms': round(percentil_ponderado(totales, 50), 1),
+                'p95_ms': round(percentil_ponderado(totales, 95), 1),
+                'p99_ms': round(percentil_ponderado(totales, 99), 1),
+                'consultas_prom': round(promedio('consultas'), 1),
+                'db_ms_prom': round(promedio('db_ms'), 1),
+                'plantillas_ms_prom': round(promedio('plantillas_ms'), 1),
+            })
+        filas.sort(key=lambda f: f['p95_ms'], reverse=True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(filas, indent=2, ensure_ascii=False))
+            return
+
+        if not filas:
+            self.stdout.write(self.style.WARNING('⚠️  No hay registros con esos filtros'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'\n{"="*100}'))
+        self.stdout.write(self.style.SUCCESS(f'📊 REQUESTS POR URL ({", ".join(str(a) for a in archivos)})'))
+        self.stdout.write(self.style.SUCCESS(f'{"="*100}'))
+        self.stdout.write(
+            f"{'url':<32}{'reg':>6}{'≈req':>8}{'lentos':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'SQL':>7}{'db ms':>8}{'tpl ms':>8}"
+        )
+        for fila in filas:
+            linea = (
+                f"{fila['url'][:31]:<32}{fila['registros']:>6}{fila['requests_estimados']:>8}{fila['lentos']:>8}"
+                f"{fila['p50_ms']:>9}{fila['p95_ms']:>9}{fila['p99_ms']:>9}"
+                f"{fila['consultas_prom']:>7}{fila['db_ms_prom']:>8}{fila['plantillas_ms_prom']:>8}"
+            )
+            estilo = self.style.WARNING if fila['p95_ms'] >= settings.REQUEST_LENTO_MS else self.style.SUCCESS
+            self.stdout.write(estilo(linea))
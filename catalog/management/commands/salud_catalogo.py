@@ -0,0 +1,116 @@
+import csv
+import io
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.salud import PROBLEMAS, analizar, filas_csv
+
+ETIQUETAS = {
+    'sin_portada': '🖼️  Sin portada',
+    'portada_inexistente': '❓ Portada inexistente',
+    'portada_rota': '💥 Portada rota o sin indexar',
+    'imagenes_huerfanas': '🗑️  Imágenes huérfanas',
+    'precio_invalido': '💸 Precio inválido',
+    'secundario_sin_precio': '🔁 Secundario sin precio',
+    'secundario_inconsistente': '⚠️  Secundario inconsistente',
+    'nombres_duplicados': '👯 Nombres duplicados',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Chequeo de salud del catálogo en una pasada (una consulta + un recorrido de static/img): '
+        'portadas faltantes/rotas/huérfanas, precios inválidos, secundarios sin precio y duplicados'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--formato',
+            type=str,
+            choices=['texto', 'json', 'csv'],
+            default='texto',
+            help='texto (resumen en consola), json (todo el detalle) o csv (un hallazgo por fila)'
+        )
+        parser.add_argument(
+            '--salida',
+            type=str,
+            default=None,
+            help='Archivo donde escribir el json/csv (por defecto, la salida estándar)'
+        )
+        parser.add_argument(
+            '--solo-disponibles',
+            action='store_true',
+            help='Ignorar los juegos no disponibles'
+        )
+        parser.add_argument(
+            '--estricto',
+            action='store_true',
+            help='Terminar con error si hay algún problema (para cron/CI)'
+        )
+        parser.add_argument(
+            '--limite',
+            type=int,
+            default=10,
+            help='Ejemplos por problema en el formato texto'
+        )
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        resultado = analizar(solo_disponibles=options['solo_disponibles'])
+        resultado['resumen']['segundos'] = round(time.perf_counter() - inicio, 3)
+        formato = options['formato']
+
+        if formato == 'texto':
+            self.escribir_texto(resultado, options['limite'])
+        else:
+            destino = open(options['salida'], 'w', encoding='utf-8', newline='') if options['salida'] else None
+            try:
+                self.escribir(resultado, formato, destino or self.stdout)
+            finally:
+                if destino:
+                    destino.close()
+            if options['salida']:
+                self.stderr.write(f"📁 {options['salida']}")
+
+        total = sum(resultado['resumen'][problema] for problema in PROBLEMAS)
+        if options['estricto'] and total:
+            raise CommandError(f'{total} problemas en el catálogo')
+
+    def escribir(self, resultado, formato, destino):
+        if formato == 'json':
+            contenido = json.dumps(resultado, ensure_ascii=False, indent=2, default=str) + '\n'
+        else:
+            buffer = io.StringIO()
+            escritor = csv.DictWriter(buffer, fieldnames=['problema', 'id', 'nombre', 'consola', 'detalle'])
+            escritor.writeheader()
+            escritor.writerows(filas_csv(resultado))
+            contenido = buffer.getvalue()
+        if destino is self.stdout:
+            self.stdout.write(contenido, ending='')
+        else:
+            destino.write(contenido)
+
+    def escribir_texto(self, resultado, limite):
+        resumen = resultado['resumen']
+        self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
+        self.stdout.write(self.style.SUCCESS('🩺 SALUD DEL CATÁLOGO'))
+        self.stdout.write(self.style.SUCCESS(f'{"="*60}'))
+        self.stdout.write(f"🎮 Juegos: {resumen['juegos']} | 🖼️  Imágenes en disco: {resumen['imagenes']}")
+
+        for problema in PROBLEMAS:
+            cantidad = resumen[problema]
+            estilo = self.style.SUCCESS if cantidad == 0 else self.style.WARNING
+            self.stdout.write(estilo(f'\n{ETIQUETAS[problema]}: {cantidad}'))
+            for item in resultado[problema][:limite]:
+                if 'nombre' in item:
+                    self.stdout.write(f"   • #{item['id']} {item['nombre']} ({item['consola']})")
+                elif 'ids' in item:
+                    self.stdout.write(f"   • {item['nombre_normalizado']} ({item['consola']}): {item['ids']}")
+                else:
+                    self.stdout.write(f"   • {item['imagen']}")
+            if cantidad > limite:
+                self.stdout.write(f'   ... y {cantidad - limite} más')
+
+        self.stdout.write(f"\n⏱️  {resumen['segundos']}s")
@@ -5,13 +5,24 @@ import unicodedata
 from decimal import Decimal
 from django.core.management.base import BaseCommand
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from catalog.models import Juego
-from difflib import SequenceMatcher
+from catalog.busqueda import candidatos_similares
+from catalog.importacion import iniciar_corrida, en_lotes, CacheAlias, TAMANO_LOTE
+from catalog.reconciliacion import FILTRO_PRECIO_EQUIVOCADO, corregir_precios_secundarios, reconciliar_secundarios
+from catalog.similitud import MOTORES, obtener_motor
+from catalog.signals import notificar_catalogo_actualizado
 
 class Command(BaseCommand):
     help = 'Actualiza juegos secundarios - agrega precio secundario si existe o crea nuevo juego'
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.motor = obtener_motor()
+        self._nombres_limpios = {}
+        self.alias = None
+        self.ultimo_score = 0.0
+
     def add_arguments(self, parser):
         parser.add_argument('--file', type=str, default='stock_secus.csv', help='CSV con juegos secundarios')
         parser.add_argument('--columna-nombre', type=str, default='JUEGOS', help='Nombre de la columna con el nombre del juego')
@@ -21,7 +32,10 @@ class Command(BaseCommand):
         parser.add_argument('--mostrar-portadas-faltantes', action='store_true', help='Mostrar lista de portadas faltantes')
         parser.add_argument('--debug', action='store_true', help='Mostrar información de depuración')
         parser.add_argument('--corregir-precios', action='store_true', help='Corregir juegos secundarios con precios en campos equivocados')
-        parser.add_argument('--dry-run', action='store_true', help='Simular sin hacer cambios reales')
+        parser.add_argument('--dry-run', action='store_true', help='Con --corregir-precios: solo contar los juegos afectados')
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help='Filas por transacción (cada lote confirmado es un checkpoint)')
+        parser.add_argument('--matcher', type=str, choices=sorted(MOTORES), default='sequencematcher', help='Motor de similitud para el matcheo de nombres')
+        parser.add_argument('--resume', action='store_true', help='Reanudar la última corrida incompleta de este archivo desde su checkpoint')
 
     def detectar_consola(self, nombre):
         """Detecta la consola del juego basándose en el nombre"""
@@ -38,52 +52,19 @@ class Command(BaseCommand):
         # Por defecto, PS4 (para backwards compatibility)
         return 'ps4'
 
-    def corregir_precios_secundarios(self, dry_run=False):
-        """Corrige juegos secundarios que tienen el precio en el campo equivocado"""
-        juegos_incorrectos = Juego.objects.filter(
-            es_solo_secundario=True,
-            precio_secundario__isnull=True,
-            precio__gt=0
-        )
-        
-        total = juegos_incorrectos.count()
-        
+    def corregir_precios_secundarios(self, dry_run=False, verbosidad=1):
+        """Corrige juegos secundarios que tienen el precio en el campo equivocado (un solo UPDATE)"""
+        if verbosidad >= 2:
+            for nombre, precio in Juego.objects.filter(FILTRO_PRECIO_EQUIVOCADO).values_list('nombre', 'precio'):
+                self.stdout.write(f"{'[DRY-RUN] ' if dry_run else ''}{nombre}: precio {precio} -> precio_secundario")
+
+        total = corregir_precios_secundarios(dry_run=dry_run)
+
         if total == 0:
             self.stdout.write(self.style.SUCCESS('✅ No hay juegos con precios incorrectos'))
-            return 0, 0
-        
-        self.stdout.write(self.style.WARNING(f'\n🔧 CORRECCIÓN DE PRECIOS - Encontrados {total} juegos para corregir\n'))
-        
-        corregidos = 0
-        errores = 0
-        
-        for juego in juegos_incorrectos:
-            try:
-                self.stdout.write(f"{'[DRY-RUN] ' if dry_run else ''}Corrigiendo: {juego.nombre}")
-                self.stdout.write(f"  precio: {juego.precio} -> 0")
-                self.stdout.write(f"  precio_secundario: None -> {juego.precio}")
-                
-                if not dry_run:
-                    precio_original = juego.precio
-                    recargo_original = juego.recargo
-                    
-                    juego.precio_secundario = precio_original
-                    juego.recargo_secundario = recargo_original
-                    juego.precio = 0
-                    juego.recargo = 0
-                    juego.save()
-                    
-                    self.stdout.write(self.style.SUCCESS(f"  ✅ Corregido\n"))
-                else:
-                    self.stdout.write(self.style.WARNING(f"  ⚠️  Simulado\n"))
-                
-                corregidos += 1
-                
-            except Exception as e:
-                errores += 1
-                self.stdout.write(self.style.ERROR(f"  ❌ Error: {str(e)}\n"))
-        
-        return corregidos, errores
+        else:
+            self.stdout.write(self.style.WARNING(f'\n🔧 CORRECCIÓN DE PRECIOS - {total} juegos para corregir\n'))
+        return total
 
     def quitar_acentos(self, texto):
         """Elimina acentos y diacríticos de un texto"""
@@ -168,6 +149,25 @@ class Command(BaseCommand):
         
         return nombre, version
 
+    def limpiar_nombre_cacheado(self, nombre):
+        """limpiar_nombre_base memoizado: los nombres del catálogo se repiten en cada búsqueda"""
+        if nombre not in self._nombres_limpios:
+            self._nombres_limpios[nombre] = self.limpiar_nombre_base(nombre)
+        return self._nombres_limpios[nombre]
+
+    def buscar_juego(self, nombre_csv, consola):
+        """Busca primero en los alias del proveedor; el fuzzy matching solo corre si no hay alias"""
+        if self.alias is not None:
+            juego = self.alias.buscar(nombre_csv, consola)
+            if juego:
+                self.stdout.write(f"\n🔗 Alias: '{nombre_csv}' → '{juego.nombre}'")
+                return juego
+        
+        juego = self.buscar_juego_exacto(nombre_csv, consola)
+        if juego and self.alias is not None:
+            self.alias.registrar(nombre_csv, consola, juego, self.ultimo_score)
+        return juego
+
     def buscar_juego_exacto(self, nombre_csv, consola):
         """Busca el juego con coincidencia EXACTA incluyendo versión"""
         nombre_base, version_csv = self.limpiar_nombre_base(nombre_csv)
@@ -177,17 +177,20 @@ class Command(BaseCommand):
         self.stdout.write(f"   Versión detectada: {version_csv}")
         self.stdout.write(f"   Consola: {consola}")
         
-        # Obtener todos los juegos de la consola
-        juegos_consola = Juego.objects.filter(consola=consola)
+        # Candidatos de la consola (en PostgreSQL, prefiltrados con el índice trigram)
+        juegos_consola = list(candidatos_similares(Juego.objects.filter(consola=consola), nombre_base))
+        limpios = [self.limpiar_nombre_cacheado(juego.nombre) for juego in juegos_consola]
+        
+        # Similitud del nombre base contra todos los candidatos de una vez
+        ratios = self.motor.score(
+            nombre_base.lower(),
+            [nombre_bd.lower() for nombre_bd, _ in limpios],
+            minimo=0.85
+        )
         
         candidatos = []
         
-        for juego in juegos_consola:
-            nombre_bd, version_bd = self.limpiar_nombre_base(juego.nombre)
-            
-            # Calcular similitud del nombre base
-            ratio_nombre = SequenceMatcher(None, nombre_base.lower(), nombre_bd.lower()).ratio()
-            
+        for juego, (nombre_bd, version_bd), ratio_nombre in zip(juegos_consola, limpios, ratios):
             # El nombre debe ser MUY similar
             if ratio_nombre < 0.85:
                 continue
@@ -230,6 +233,7 @@ class Command(BaseCommand):
             return None
         
         mejor = candidatos[0]
+        self.ultimo_score = mejor['score']
         
         # Requerir score mínimo de 0.90 para aceptar
         if mejor['score'] >= 0.90:
@@ -381,10 +385,125 @@ class Command(BaseCommand):
         
         return variaciones[:5]
 
+    def procesar_fila(self, row, col_nombre, col_precio, col_disponible, tiene_columna_disponible,
+                      solo_actualizar, debug, contadores, no_encontrados, juegos_procesados):
+        """
+        Procesa una fila del CSV de secundarios. Devuelve el id del juego
+        que quedó con precio secundario, o None si la fila se omitió.
+        """
+        nombre_sucio = row.get(col_nombre, '').strip()
+        if not nombre_sucio:
+            return None
+        
+        # ⭐ DETECTAR CONSOLA AUTOMÁTICAMENTE DEL NOMBRE
+        consola = self.detectar_consola(nombre_sucio)
+        self.stdout.write(f"\n📀 Consola detectada para '{nombre_sucio}': {consola.upper()}")
+        
+        if tiene_columna_disponible:
+            disponible_str = row.get(col_disponible, '')
+            if disponible_str is None:
+                disponible_str = ''
+            disponible = self.determinar_disponibilidad(disponible_str)
+        else:
+            disponible = True
+        
+        if not disponible:
+            contadores['omitidos'] += 1
+            if debug:
+                self.stdout.write(f"  ⏭️  OMITIDO (no disponible): {nombre_sucio}")
+            return None
+        
+        precio_str = row.get(col_precio, '').strip()
+        precio_secundario = self.limpiar_precio(precio_str)
+        recargo_secundario = self.calcular_recargo(precio_secundario)
+        
+        # Usar la búsqueda con la consola correcta
+        juego_existente = self.buscar_juego(nombre_sucio, consola)
+        
+        if juego_existente:
+            if juego_existente.imagen == "img/default.jpg" or not juego_existente.imagen:
+                nueva_imagen = self.buscar_imagen(nombre_sucio, consola)
+                if nueva_imagen != "img/default.jpg":
+                    juego_existente.imagen = nueva_imagen
+            
+            if juego_existente.precio == Decimal('0.0'):
+                if "(SECUNDARIO)" not in juego_existente.nombre.upper():
+                    juego_existente.nombre = f"{juego_existente.nombre} (SECUNDARIO)"
+                
+                juego_existente.es_solo_secundario = True
+                juego_existente.tiene_secundario = False
+                contadores['convertidos'] += 1
+            else:
+                juego_existente.es_solo_secundario = False
+                juego_existente.tiene_secundario = True
+            
+            estaba_desactivado = not juego_existente.disponible
+            if estaba_desactivado:
+                contadores['reactivados'] += 1
+                juego_existente.disponible = True
+            
+            juego_existente.precio_secundario = precio_secundario
+            juego_existente.recargo_secundario = recargo_secundario
+            juego_existente.save()
+            
+            contadores['actualizados'] += 1
+            
+            juegos_procesados.append({
+                'nombre': juego_existente.nombre,
+                'consola': consola,
+                'imagen': juego_existente.imagen
+            })
+            
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ AGREGADO PRECIO SECUNDARIO: {juego_existente.nombre} - ${precio_secundario}'
+            ))
+            return juego_existente.id
+        
+        if solo_actualizar:
+            self.stdout.write(self.style.WARNING(f'⏭️  OMITIDO: {nombre_sucio}'))
+            no_encontrados.append(nombre_sucio)
+            contadores['no_encontrados'] += 1
+            return None
+        
+        nombre_con_identificador = f"{nombre_sucio} (SECUNDARIO)"
+        imagen = self.buscar_imagen(nombre_sucio, consola)
+        
+        nuevo_juego = Juego.objects.create(
+            nombre=nombre_con_identificador,
+            precio=0,
+            recargo=0,
+            consola=consola,
+            disponible=True,
+            imagen=imagen,
+            es_solo_secundario=True,
+            precio_secundario=precio_secundario,
+            recargo_secundario=recargo_secundario,
+            tiene_secundario=False
+        )
+        
+        contadores['creados'] += 1
+        
+        juegos_procesados.append({
+            'nombre': nuevo_juego.nombre,
+            'consola': consola,
+            'imagen': nuevo_juego.imagen
+        })
+        
+        # El texto crudo queda asociado al juego creado para las próximas corridas
+        if self.alias is not None:
+            self.alias.registrar(nombre_sucio, consola, nuevo_juego, 1.0)
+        
+        self.stdout.write(self.style.WARNING(
+            f'🆕 CREADO: {nuevo_juego.nombre} - ${precio_secundario}'
+        ))
+        return nuevo_juego.id
+
     def handle(self, *args, **options):
         if options['corregir_precios']:
             dry_run = options['dry_run']
-            corregidos, errores = self.corregir_precios_secundarios(dry_run)
+            corregidos = self.corregir_precios_secundarios(dry_run, options['verbosity'])
+            if corregidos and not dry_run:
+                notificar_catalogo_actualizado('secus')
             
             self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
             self.stdout.write(self.style.SUCCESS('📊 RESUMEN DE CORRECCIÓN'))
@@ -394,10 +513,6 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.WARNING(f'🔍 MODO SIMULACIÓN'))
             
             self.stdout.write(self.style.SUCCESS(f'✅ Juegos corregidos: {corregidos}'))
-            
-            if errores > 0:
-                self.stdout.write(self.style.ERROR(f'❌ Errores: {errores}'))
-            
             return
         
         csv_filename = options['file']
@@ -407,20 +522,37 @@ class Command(BaseCommand):
         col_disponible = options['columna_disponible']
         solo_actualizar = options['solo_actualizar']
         debug = options.get('debug', False)
+        tamano_lote = options['lote']
+        self.motor = obtener_motor(options['matcher'])
+        self.alias = CacheAlias('secundario')
         
         if not os.path.exists(csv_path):
             self.stdout.write(self.style.ERROR(f'No se encontró {csv_path}'))
             return
         
-        actualizados_existentes = 0
-        creados_nuevos = 0
+        corrida, reanudada, pendiente = iniciar_corrida('secus', csv_path, reanudar=options['resume'])
+        if reanudada:
+            self.stdout.write(self.style.WARNING(
+                f'⏩ Reanudando corrida #{corrida.id} desde la línea {corrida.checkpoint + 1}'
+            ))
+        elif pendiente:
+            self.stdout.write(self.style.WARNING(
+                f'Hay una corrida incompleta de este archivo (#{pendiente.id}, línea {pendiente.checkpoint}). '
+                f'Usá --resume para continuarla.'
+            ))
+        
+        contadores = {
+            'actualizados': 0,
+            'creados': 0,
+            'omitidos': 0,
+            'reactivados': 0,
+            'convertidos': 0,
+            'no_encontrados': 0,
+            'errores': 0,
+        }
+        contadores.update(corrida.contadores)
         errores = []
         no_encontrados = []
-        omitidos_no_disponibles = 0
-        reactivados = 0
-        convertidos_a_solo_secundario = 0
-        secundarios_ids = []
-        secundarios_disponibles_ids = []
         juegos_procesados = []
         
         try:
@@ -437,152 +569,73 @@ class Command(BaseCommand):
                 
                 if col_nombre not in csv_reader.fieldnames:
                     self.stdout.write(self.style.ERROR(f'No se encontró la columna "{col_nombre}"'))
+                    corrida.marcar_etapa('fallida', f'Falta la columna {col_nombre}')
                     return
                 
                 if col_precio not in csv_reader.fieldnames:
                     self.stdout.write(self.style.ERROR(f'No se encontró la columna "{col_precio}"'))
+                    corrida.marcar_etapa('fallida', f'Falta la columna {col_precio}')
                     return
                 
                 tiene_columna_disponible = col_disponible in csv_reader.fieldnames
                 
-                for linea_num, row in enumerate(csv_reader, start=2):
-                    try:
-                        nombre_sucio = row.get(col_nombre, '').strip()
-                        if not nombre_sucio:
-                            continue
-                        
-                        # ⭐ DETECTAR CONSOLA AUTOMÁTICAMENTE DEL NOMBRE
-                        consola = self.detectar_consola(nombre_sucio)
-                        self.stdout.write(f"\n📀 Consola detectada para '{nombre_sucio}': {consola.upper()}")
-                        
-                        if tiene_columna_disponible:
-                            disponible_str = row.get(col_disponible, '')
-                            if disponible_str is None:
-                                disponible_str = ''
-                            disponible = self.determinar_disponibilidad(disponible_str)
-                        else:
-                            disponible = True
-                        
-                        if not disponible:
-                            omitidos_no_disponibles += 1
-                            if debug:
-                                self.stdout.write(f"  ⏭️  OMITIDO (no disponible): {nombre_sucio}")
-                            continue
-                        
-                        precio_str = row.get(col_precio, '').strip()
-                        precio_secundario = self.limpiar_precio(precio_str)
-                        recargo_secundario = self.calcular_recargo(precio_secundario)
-                        
-                        # Usar la búsqueda con la consola correcta
-                        juego_existente = self.buscar_juego_exacto(nombre_sucio, consola)
+                for lote in en_lotes(enumerate(csv_reader, start=2), tamano_lote):
+                    # Al reanudar, las líneas ya confirmadas se saltean sin buscar coincidencias
+                    lote = [(linea_num, row) for linea_num, row in lote if linea_num > corrida.checkpoint]
+                    if not lote:
+                        continue
+                    
+                    # Las filas se escriben dentro de la transacción del lote (los juegos
+                    # creados tienen que ser visibles para las filas siguientes) y cada
+                    # fila usa un savepoint para que un error no invalide el lote entero.
+                    with transaction.atomic():
+                        secundarios_lote = []
                         
-                        if juego_existente:
-                            if juego_existente.imagen == "img/default.jpg" or not juego_existente.imagen:
-                                nueva_imagen = self.buscar_imagen(nombre_sucio, consola)
-                                if nueva_imagen != "img/default.jpg":
-                                    juego_existente.imagen = nueva_imagen
-                            
-                            if juego_existente.precio == Decimal('0.0'):
-                                if "(SECUNDARIO)" not in juego_existente.nombre.upper():
-                                    juego_existente.nombre = f"{juego_existente.nombre} (SECUNDARIO)"
+                        for linea_num, row in lote:
+                            try:
+                                with transaction.atomic():
+                                    juego_id = self.procesar_fila(
+                                        row, col_nombre, col_precio, col_disponible,
+                                        tiene_columna_disponible, solo_actualizar, debug,
+                                        contadores, no_encontrados, juegos_procesados
+                                    )
+                                if juego_id:
+                                    secundarios_lote.append(juego_id)
                                 
-                                juego_existente.es_solo_secundario = True
-                                juego_existente.tiene_secundario = False
-                                convertidos_a_solo_secundario += 1
-                            else:
-                                juego_existente.es_solo_secundario = False
-                                juego_existente.tiene_secundario = True
-                            
-                            estaba_desactivado = not juego_existente.disponible
-                            if estaba_desactivado:
-                                reactivados += 1
-                                juego_existente.disponible = True
-                            
-                            juego_existente.precio_secundario = precio_secundario
-                            juego_existente.recargo_secundario = recargo_secundario
-                            juego_existente.save()
-                            
-                            secundarios_ids.append(juego_existente.id)
-                            secundarios_disponibles_ids.append(juego_existente.id)
-                            actualizados_existentes += 1
-                            
-                            juegos_procesados.append({
-                                'nombre': juego_existente.nombre,
-                                'consola': consola,
-                                'imagen': juego_existente.imagen
-                            })
-                            
-                            self.stdout.write(self.style.SUCCESS(
-                                f'✅ AGREGADO PRECIO SECUNDARIO: {juego_existente.nombre} - ${precio_secundario}'
-                            ))
-                        
-                        else:
-                            if solo_actualizar:
-                                self.stdout.write(self.style.WARNING(f'⏭️  OMITIDO: {nombre_sucio}'))
-                                no_encontrados.append(nombre_sucio)
+                            except Exception as e:
+                                error_msg = f'Línea {linea_num}: {str(e)}'
+                                errores.append(error_msg)
+                                contadores['errores'] += 1
+                                self.stdout.write(self.style.ERROR(error_msg))
                                 continue
-                            
-                            nombre_con_identificador = f"{nombre_sucio} (SECUNDARIO)"
-                            imagen = self.buscar_imagen(nombre_sucio, consola)
-                            
-                            nuevo_juego = Juego.objects.create(
-                                nombre=nombre_con_identificador,
-                                precio=0,
-                                recargo=0,
-                                consola=consola,
-                                disponible=True,
-                                imagen=imagen,
-                                es_solo_secundario=True,
-                                precio_secundario=precio_secundario,
-                                recargo_secundario=recargo_secundario,
-                                tiene_secundario=False
-                            )
-                            
-                            secundarios_ids.append(nuevo_juego.id)
-                            secundarios_disponibles_ids.append(nuevo_juego.id)
-                            creados_nuevos += 1
-                            
-                            juegos_procesados.append({
-                                'nombre': nuevo_juego.nombre,
-                                'consola': consola,
-                                'imagen': nuevo_juego.imagen
-                            })
-                            
-                            self.stdout.write(self.style.WARNING(
-                                f'🆕 CREADO: {nuevo_juego.nombre} - ${precio_secundario}'
-                            ))
                         
-                    except Exception as e:
-                        error_msg = f'Línea {linea_num}: {str(e)}'
-                        errores.append(error_msg)
-                        self.stdout.write(self.style.ERROR(error_msg))
-                        continue
+                        self.alias.guardar()
+                        corrida.guardar_checkpoint(lote[-1][0], secundarios_lote, contadores, len(lote))
         
         except Exception as e:
+            corrida.marcar_etapa('fallida', str(e))
             self.stdout.write(self.style.ERROR(f'Error: {str(e)}'))
+            self.stdout.write(self.style.WARNING(
+                f'Corrida #{corrida.id} detenida en la línea {corrida.checkpoint}. Usá --resume para continuar.'
+            ))
+            # Los lotes confirmados antes del error ya cambiaron el catálogo
+            notificar_catalogo_actualizado('secus')
             return
         
-        if secundarios_disponibles_ids:
-            juegos_a_desactivar_secundario = Juego.objects.filter(
-                tiene_secundario=True
-            ).exclude(id__in=secundarios_disponibles_ids)
-            
-            for juego in juegos_a_desactivar_secundario:
-                juego.precio_secundario = None
-                juego.recargo_secundario = None
-                juego.tiene_secundario = False
-                juego.save()
-            
-            desactivados_secundario_count = juegos_a_desactivar_secundario.count()
-            
-            juegos_solo_secundarios = Juego.objects.filter(
-                es_solo_secundario=True
-            ).exclude(id__in=secundarios_disponibles_ids)
+        corrida.marcar_etapa('reconciliando')
+        secundarios_disponibles_ids = corrida.ids_en_stock
+        
+        with transaction.atomic():
+            if secundarios_disponibles_ids:
+                desactivados = reconciliar_secundarios(secundarios_disponibles_ids)
+                desactivados_secundario_count = desactivados['secundarios_a_limpiar']
+                desactivados_solo_secundario = desactivados['solo_secundarios_a_desactivar']
+            else:
+                desactivados_secundario_count = 0
+                desactivados_solo_secundario = 0
             
-            desactivados_solo_secundario = juegos_solo_secundarios.update(disponible=False)
-        else:
-            desactivados_secundario_count = 0
-            desactivados_solo_secundario = 0
+            corrida.marcar_etapa('completada')
+        notificar_catalogo_actualizado('secus')
         
         if juegos_procesados:
             portadas_faltantes = self.verificar_portadas_faltantes(juegos_procesados)
@@ -601,16 +654,17 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
         self.stdout.write(self.style.SUCCESS('📊 RESUMEN'))
         self.stdout.write(self.style.SUCCESS(f'{"="*60}'))
-        self.stdout.write(self.style.SUCCESS(f'✅ Actualizados: {actualizados_existentes}'))
-        self.stdout.write(self.style.SUCCESS(f'🔄 Reactivados: {reactivados}'))
-        self.stdout.write(self.style.SUCCESS(f'⚡ Convertidos: {convertidos_a_solo_secundario}'))
-        self.stdout.write(self.style.WARNING(f'🆕 Creados: {creados_nuevos}'))
+        self.stdout.write(self.style.SUCCESS(f'✅ Actualizados: {contadores["actualizados"]}'))
+        self.stdout.write(self.style.SUCCESS(f'🔄 Reactivados: {contadores["reactivados"]}'))
+        self.stdout.write(self.style.SUCCESS(f'⚡ Convertidos: {contadores["convertidos"]}'))
+        self.stdout.write(self.style.WARNING(f'🆕 Creados: {contadores["creados"]}'))
         self.stdout.write(self.style.ERROR(f'🔴 Desactivados (precios): {desactivados_secundario_count}'))
         self.stdout.write(self.style.ERROR(f'🔴 Desactivados (juegos): {desactivados_solo_secundario}'))
-        self.stdout.write(self.style.WARNING(f'⏭️  Omitidos: {omitidos_no_disponibles}'))
-        self.stdout.write(self.style.WARNING(f'🔍 No encontrados: {len(no_encontrados)}'))
+        self.stdout.write(self.style.WARNING(f'⏭️  Omitidos: {contadores["omitidos"]}'))
+        self.stdout.write(self.style.WARNING(f'🔍 No encontrados: {contadores["no_encontrados"]}'))
+        self.stdout.write(f'🔗 Resueltos por alias: {self.alias.aciertos} (fuzzy: {self.alias.fallos})')
         
         if no_encontrados and len(no_encontrados) <= 10:
             self.stdout.write(self.style.WARNING("\nNo encontrados:"))
             for nombre in no_encontrados:
-                self.stdout.write(f"  - {nombre}")
\ No newline at end of file
+                self.stdout.write(f"  - {nombre}")
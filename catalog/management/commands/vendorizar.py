@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from CaSy.vendor import ErrorVendor, construir, directorio_cache, directorio_vendor
+
+
+class Command(BaseCommand):
+    help = 'Copia Bootstrap, Font Awesome (recortado), Poppins y htmx a static/vendor desde el cache local'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cache',
+            type=str,
+            default=None,
+            help='Directorio del cache (por defecto settings.VENDOR_CACHE)'
+        )
+        parser.add_argument(
+            '--descargar',
+            action='store_true',
+            help='Descargar al cache las versiones fijadas que falten'
+        )
+
+    def handle(self, *args, **options):
+        cache = options['cache'] or directorio_cache()
+        try:
+            manifiesto = construir(cache, descargar=options['descargar'])
+        except ErrorVendor as e:
+            raise CommandError(f'❌ {e}\n💡 Copiá los archivos al cache o usá --descargar')
+
+        self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
+        self.stdout.write(self.style.SUCCESS('📦 DEPENDENCIAS VENDORIZADAS'))
+        self.stdout.write(self.style.SUCCESS(f'{"="*60}'))
+        self.stdout.write(f'📁 {directorio_vendor()}')
+        self.stdout.write(f"🎨 CSS: {', '.join(manifiesto['css'])}")
+        self.stdout.write(f"⚙️  JS (defer): {manifiesto['js']}")
+        self.stdout.write(f"🔤 Íconos: {len(manifiesto['iconos'])} ({', '.join(manifiesto['iconos'])})")
+        self.stdout.write(self.style.WARNING('💡 Corré collectstatic para publicar los archivos con hash'))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-19 10:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0011_alter_resenacliente_imagen'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('comando', models.CharField(help_text='Comando que ejecutó la importación (ps4, ps5, secus)', max_length=20)),
+                ('archivo', models.CharField(max_length=255)),
+                ('hash_archivo', models.CharField(help_text='SHA-256 del archivo importado', max_length=64)),
+                ('etapa', models.CharField(choices=[('procesando', 'Procesando filas'), ('reconciliando', 'Reconciliando catálogo'), ('completada', 'Completada'), ('fallida', 'Fallida')], default='procesando', max_length=20)),
+                ('checkpoint', models.PositiveIntegerField(default=0, help_text='Última línea del CSV confirmada en la base')),
+                ('filas_procesadas', models.PositiveIntegerField(default=0)),
+                ('contadores', models.JSONField(blank=True, default=dict)),
+                ('ids_en_stock', models.JSONField(blank=True, default=list, help_text='IDs de juegos vistos en el archivo (se usan en la reconciliación final)')),
+                ('error', models.TextField(blank=True, default='')),
+                ('fecha_inicio', models.DateTimeField(auto_now_add=True)),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True)),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Corrida de importación',
+                'verbose_name_plural': 'Corridas de importación',
+                'ordering': ['-fecha_inicio'],
+                'indexes': [models.Index(fields=['comando', 'hash_archivo', 'etapa'], name='catalog_imp_comando_1aeb65_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:04
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0012_importrun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SupplierAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('texto_original', models.CharField(help_text='Nombre tal cual aparece en el CSV del proveedor', max_length=255)),
+                ('proveedor', models.CharField(choices=[('primario', 'Proveedor primario'), ('secundario', 'Proveedor secundario')], max_length=20)),
+                ('consola', models.CharField(choices=[('ps4', 'PlayStation 4'), ('ps5', 'PlayStation 5')], max_length=10)),
+                ('score', models.FloatField(default=0, help_text='Score del matcheo que generó el alias')),
+                ('confirmado', models.BooleanField(default=False, help_text='Confirmado o corregido a mano desde el admin')),
+                ('ultima_vez', models.DateTimeField(default=django.utils.timezone.now, help_text='Última vez que apareció en un archivo del proveedor')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('juego', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alias', to='catalog.juego')),
+            ],
+            options={
+                'verbose_name': 'Alias de proveedor',
+                'verbose_name_plural': 'Alias de proveedor',
+                'constraints': [models.UniqueConstraint(fields=('proveedor', 'consola', 'texto_original'), name='alias_unico_por_proveedor')],
+            },
+        ),
+    ]
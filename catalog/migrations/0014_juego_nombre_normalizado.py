@@ -0,0 +1,54 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:25
+
+from django.db import migrations, models
+
+from catalog.busqueda import normalizar_nombre
+
+# Solo PostgreSQL: pg_trgm y los índices GIN del buscador y del matcheo
+INDICES_TRIGRAMA = [
+    'CREATE INDEX IF NOT EXISTS catalog_juego_nombre_norm_trgm '
+    'ON catalog_juego USING gin (nombre_normalizado gin_trgm_ops)',
+    # nombre__icontains (búsqueda del admin) compila a UPPER("nombre"::text) LIKE ...
+    'CREATE INDEX IF NOT EXISTS catalog_juego_nombre_upper_trgm '
+    'ON catalog_juego USING gin ((UPPER("nombre"::text)) gin_trgm_ops)',
+]
+
+
+def completar_nombre_normalizado(apps, schema_editor):
+    Juego = apps.get_model('catalog', 'Juego')
+    juegos = list(Juego.objects.using(schema_editor.connection.alias).only('id', 'nombre'))
+    for juego in juegos:
+        juego.nombre_normalizado = normalizar_nombre(juego.nombre)
+    Juego.objects.using(schema_editor.connection.alias).bulk_update(juegos, ['nombre_normalizado'], batch_size=500)
+
+
+def crear_indices_trigrama(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for sql in INDICES_TRIGRAMA:
+        schema_editor.execute(sql)
+
+
+def borrar_indices_trigrama(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS catalog_juego_nombre_norm_trgm')
+    schema_editor.execute('DROP INDEX IF EXISTS catalog_juego_nombre_upper_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0013_supplieralias'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='juego',
+            name='nombre_normalizado',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Nombre sin acentos ni signos, para búsqueda (índice trigram en PostgreSQL)', max_length=200),
+        ),
+        migrations.RunPython(completar_nombre_normalizado, migrations.RunPython.noop),
+        migrations.RunPython(crear_indices_trigrama, borrar_indices_trigrama),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0014_juego_nombre_normalizado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrabajoImportacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('comando', models.CharField(choices=[('ps4', 'Stock PS4'), ('ps5', 'Stock PS5'), ('secus', 'Stock secundario')], max_length=20)),
+                ('archivo', models.CharField(help_text='Ruta del CSV guardado en IMPORTACIONES_DIR', max_length=255)),
+                ('nombre_original', models.CharField(max_length=255)),
+                ('hash_archivo', models.CharField(max_length=64)),
+                ('usuario', models.CharField(blank=True, default='', max_length=150)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('corriendo', 'Corriendo'), ('terminado', 'Terminado'), ('fallido', 'Fallido')], default='pendiente', max_length=20)),
+                ('reanudar', models.BooleanField(default=False, help_text='Correr el comando con --resume (trabajos reencolados tras una caída)')),
+                ('error', models.TextField(blank=True, default='')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_inicio', models.DateTimeField(blank=True, null=True)),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True)),
+                ('corrida', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='trabajos', to='catalog.importrun')),
+            ],
+            options={
+                'verbose_name': 'Trabajo de importación',
+                'verbose_name_plural': 'Trabajos de importación',
+                'ordering': ['-fecha_creacion'],
+                'indexes': [models.Index(fields=['estado', 'fecha_creacion'], name='catalog_tra_estado_31b64e_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0015_trabajoimportacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortadaSubida',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash_original', models.CharField(help_text='SHA-256 del archivo subido', max_length=64)),
+                ('original', models.CharField(help_text='Ruta del original en PORTADAS_ORIGINALES_DIR', max_length=255)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('procesada', 'Procesada'), ('fallida', 'Fallida')], default='pendiente', max_length=20)),
+                ('imagen', models.CharField(blank=True, default='', help_text='Versión grande generada', max_length=200)),
+                ('error', models.TextField(blank=True, default='')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_proceso', models.DateTimeField(blank=True, null=True)),
+                ('juego', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='portadas_subidas', to='catalog.juego')),
+            ],
+            options={
+                'verbose_name': 'Portada subida',
+                'verbose_name_plural': 'Portadas subidas',
+                'ordering': ['-fecha_creacion'],
+                'indexes': [models.Index(fields=['estado', 'fecha_creacion'], name='catalog_por_estado_540689_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0016_portadasubida'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImagenBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash', models.CharField(max_length=64, unique=True)),
+                ('extension', models.CharField(max_length=10)),
+                ('tamano', models.PositiveBigIntegerField(help_text='Bytes')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Imagen (blob)',
+                'verbose_name_plural': 'Imágenes (blobs)',
+            },
+        ),
+        migrations.AddField(
+            model_name='juego',
+            name='imagen_blob',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Contenido de la portada en el almacén por hash (python manage.py almacenar_imagenes)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='juegos', to='catalog.imagenblob'),
+        ),
+    ]
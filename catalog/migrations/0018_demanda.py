@@ -0,0 +1,52 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:55
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0017_imagenblob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventoJuego',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('juego_id', models.PositiveIntegerField()),
+                ('tipo', models.CharField(choices=[('vista', 'Vista del detalle'), ('carrito', 'Agregado al carrito'), ('checkout', 'Checkout')], max_length=10)),
+                ('cantidad', models.PositiveIntegerField(default=1)),
+                ('fecha', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Evento de juego',
+                'verbose_name_plural': 'Eventos de juegos',
+            },
+        ),
+        migrations.AddField(
+            model_name='juego',
+            name='popularidad',
+            field=models.FloatField(db_index=True, default=0, editable=False, help_text='Score de demanda precalculado (python manage.py consolidar_demanda)'),
+        ),
+        migrations.CreateModel(
+            name='DemandaDiaria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dia', models.DateField()),
+                ('vistas', models.PositiveIntegerField(default=0)),
+                ('carritos', models.PositiveIntegerField(default=0)),
+                ('checkouts', models.PositiveIntegerField(default=0, help_text='Unidades en pedidos')),
+                ('juego', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='demanda', to='catalog.juego')),
+            ],
+            options={
+                'verbose_name': 'Demanda diaria',
+                'verbose_name_plural': 'Demanda diaria',
+                'ordering': ['-dia'],
+                'indexes': [models.Index(fields=['dia'], name='catalog_dem_dia_a833c4_idx')],
+                'constraints': [models.UniqueConstraint(fields=('juego', 'dia'), name='demanda_juego_dia_unica')],
+            },
+        ),
+    ]
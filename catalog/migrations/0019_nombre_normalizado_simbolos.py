@@ -0,0 +1,28 @@
+from django.db import migrations
+
+from catalog.busqueda import normalizar_nombre
+
+SIMBOLOS = ('™', '®', '℠', '©', '℗')
+
+
+def recalcular(apps, schema_editor):
+    """Los nombres con ™/® quedaron normalizados con 'tm'/'r' pegado a la palabra"""
+    Juego = apps.get_model('catalog', 'Juego')
+    alias = schema_editor.connection.alias
+    juegos = []
+    for juego in Juego.objects.using(alias).only('id', 'nombre', 'nombre_normalizado'):
+        if any(simbolo in juego.nombre for simbolo in SIMBOLOS):
+            juego.nombre_normalizado = normalizar_nombre(juego.nombre)
+            juegos.append(juego)
+    Juego.objects.using(alias).bulk_update(juegos, ['nombre_normalizado'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0018_demanda'),
+    ]
+
+    operations = [
+        migrations.RunPython(recalcular, migrations.RunPython.noop),
+    ]
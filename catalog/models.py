@@ -1,8 +1,11 @@
 # catalog/models.py
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 from decimal import Decimal
 
+from .busqueda import normalizar_nombre
+
 class Juego(models.Model):
     CONSOLAS = [
         ('ps4', 'PlayStation 4'),
@@ -10,6 +13,13 @@ class Juego(models.Model):
     ]
     
     nombre = models.CharField(max_length=200)
+    nombre_normalizado = models.CharField(
+        max_length=200,
+        blank=True,
+        default='',
+        editable=False,
+        help_text="Nombre sin acentos ni signos, para búsqueda (índice trigram en PostgreSQL)"
+    )
     consola = models.CharField(max_length=10, choices=CONSOLAS)
     destacado = models.BooleanField(default=False)
     descripcion = models.TextField(
@@ -48,7 +58,22 @@ class Juego(models.Model):
     
     # CAMPOS EXISTENTES
     imagen = models.CharField(max_length=200, default='img/default.jpg')
+    imagen_blob = models.ForeignKey(
+        'ImagenBlob',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='juegos',
+        help_text="Contenido de la portada en el almacén por hash (python manage.py almacenar_imagenes)"
+    )
     disponible = models.BooleanField(default=True)
+    popularidad = models.FloatField(
+        default=0,
+        db_index=True,
+        editable=False,
+        help_text="Score de demanda precalculado (python manage.py consolidar_demanda)"
+    )
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_actualizacion = models.DateTimeField(auto_now=True)
     
@@ -57,6 +82,13 @@ class Juego(models.Model):
         verbose_name = 'Juego'
         verbose_name_plural = 'Juegos'
     
+    def save(self, *args, **kwargs):
+        self.nombre_normalizado = normalizar_nombre(self.nombre)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'nombre' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'nombre_normalizado'}
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         if self.tiene_secundario:
             return f"{self.nombre} ({self.consola.upper()}) - Primario: ${self.precio} | Secundario: ${self.precio_secundario}"
@@ -129,4 +161,271 @@ class ResenaCliente(models.Model):
         import os
         from django.conf import settings
         ruta_imagen = os.path.join(settings.STATICFILES_DIRS[0], self.get_nombre_archivo_imagen())
-        return os.path.exists(ruta_imagen)
\ No newline at end of file
+        return os.path.exists(ruta_imagen)
+
+class ImportRun(models.Model):
+    """
+    Historial de corridas de importación de stock (ps4, ps5, secus).
+    Guarda el hash del archivo, la etapa y un checkpoint para poder
+    reanudar una corrida que se cortó a mitad del CSV.
+    """
+    ETAPAS = [
+        ('procesando', 'Procesando filas'),
+        ('reconciliando', 'Reconciliando catálogo'),
+        ('completada', 'Completada'),
+        ('fallida', 'Fallida'),
+    ]
+
+    comando = models.CharField(max_length=20, help_text="Comando que ejecutó la importación (ps4, ps5, secus)")
+    archivo = models.CharField(max_length=255)
+    hash_archivo = models.CharField(max_length=64, help_text="SHA-256 del archivo importado")
+    etapa = models.CharField(max_length=20, choices=ETAPAS, default='procesando')
+    checkpoint = models.PositiveIntegerField(
+        default=0,
+        help_text="Última línea del CSV confirmada en la base"
+    )
+    filas_procesadas = models.PositiveIntegerField(default=0)
+    contadores = models.JSONField(default=dict, blank=True)
+    ids_en_stock = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="IDs de juegos vistos en el archivo (se usan en la reconciliación final)"
+    )
+    error = models.TextField(blank=True, default='')
+    fecha_inicio = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+    fecha_fin = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-fecha_inicio']
+        verbose_name = 'Corrida de importación'
+        verbose_name_plural = 'Corridas de importación'
+        indexes = [
+            models.Index(fields=['comando', 'hash_archivo', 'etapa']),
+        ]
+
+    def __str__(self):
+        return f"{self.comando} #{self.id} - {self.get_etapa_display()} (línea {self.checkpoint})"
+
+    def guardar_checkpoint(self, linea, ids_nuevos, contadores, filas):
+        """Confirma el avance de un lote. Llamar dentro de la misma transacción del lote."""
+        self.checkpoint = linea
+        self.filas_procesadas += filas
+        self.ids_en_stock = self.ids_en_stock + list(ids_nuevos)
+        self.contadores = dict(contadores)
+        self.save(update_fields=[
+            'checkpoint', 'filas_procesadas', 'ids_en_stock', 'contadores', 'fecha_actualizacion'
+        ])
+
+    def marcar_etapa(self, etapa, error=''):
+        """Cambia la etapa de la corrida (y registra el error si falló)"""
+        self.etapa = etapa
+        self.error = error
+        self.fecha_fin = timezone.now() if etapa in ('completada', 'fallida') else None
+        self.save(update_fields=['etapa', 'error', 'fecha_fin', 'fecha_actualizacion'])
+
+
+class SupplierAlias(models.Model):
+    """
+    Texto crudo de un proveedor (tal cual viene en el CSV) ya resuelto a un Juego.
+    Los importadores lo consultan antes del fuzzy matching.
+    """
+    PROVEEDORES = [
+        ('primario', 'Proveedor primario'),
+        ('secundario', 'Proveedor secundario'),
+    ]
+
+    texto_original = models.CharField(max_length=255, help_text="Nombre tal cual aparece en el CSV del proveedor")
+    proveedor = models.CharField(max_length=20, choices=PROVEEDORES)
+    consola = models.CharField(max_length=10, choices=Juego.CONSOLAS)
+    juego = models.ForeignKey(Juego, on_delete=models.CASCADE, related_name='alias')
+    score = models.FloatField(default=0, help_text="Score del matcheo que generó el alias")
+    confirmado = models.BooleanField(
+        default=False,
+        help_text="Confirmado o corregido a mano desde el admin"
+    )
+    ultima_vez = models.DateTimeField(
+        default=timezone.now,
+        help_text="Última vez que apareció en un archivo del proveedor"
+    )
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Alias de proveedor'
+        verbose_name_plural = 'Alias de proveedor'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['proveedor', 'consola', 'texto_original'],
+                name='alias_unico_por_proveedor',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.texto_original} → {self.juego.nombre}"
+
+
+class TrabajoImportacion(models.Model):
+    """
+    Importación de stock subida desde el admin, en cola para correr en segundo
+    plano (ver catalog/trabajos.py). El avance fila a fila queda en la
+    ImportRun que crea el comando; acá se guarda el archivo y el estado del trabajo.
+    """
+    COMANDOS = [
+        ('ps4', 'Stock PS4'),
+        ('ps5', 'Stock PS5'),
+        ('secus', 'Stock secundario'),
+    ]
+    ESTADOS = [
+        ('pendiente', 'Pendiente'),
+        ('corriendo', 'Corriendo'),
+        ('terminado', 'Terminado'),
+        ('fallido', 'Fallido'),
+    ]
+
+    comando = models.CharField(max_length=20, choices=COMANDOS)
+    archivo = models.CharField(max_length=255, help_text="Ruta del CSV guardado en IMPORTACIONES_DIR")
+    nombre_original = models.CharField(max_length=255)
+    hash_archivo = models.CharField(max_length=64)
+    usuario = models.CharField(max_length=150, blank=True, default='')
+    estado = models.CharField(max_length=20, choices=ESTADOS, default='pendiente')
+    reanudar = models.BooleanField(
+        default=False,
+        help_text="Correr el comando con --resume (trabajos reencolados tras una caída)"
+    )
+    corrida = models.ForeignKey(
+        ImportRun,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='trabajos'
+    )
+    error = models.TextField(blank=True, default='')
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_inicio = models.DateTimeField(null=True, blank=True)
+    fecha_fin = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-fecha_creacion']
+        verbose_name = 'Trabajo de importación'
+        verbose_name_plural = 'Trabajos de importación'
+        indexes = [
+            models.Index(fields=['estado', 'fecha_creacion']),
+        ]
+
+    def __str__(self):
+        return f"{self.comando} #{self.id} - {self.nombre_original} ({self.get_estado_display()})"
+
+    @property
+    def archivo_salida(self):
+        """Salida del comando (lo que mostraría en consola)"""
+        return self.archivo + '.log'
+
+    @property
+    def terminado(self):
+        return self.estado in ('terminado', 'fallido')
+
+
+class PortadaSubida(models.Model):
+    """
+    Portada subida desde el admin. El original queda guardado por hash y un
+    worker genera las versiones WebP optimizadas (ver catalog/procesamiento_portadas.py);
+    al terminar, `Juego.imagen` pasa a apuntar a la versión grande.
+    """
+    ESTADOS = [
+        ('pendiente', 'Pendiente'),
+        ('procesada', 'Procesada'),
+        ('fallida', 'Fallida'),
+    ]
+
+    juego = models.ForeignKey(Juego, on_delete=models.CASCADE, related_name='portadas_subidas')
+    hash_original = models.CharField(max_length=64, help_text="SHA-256 del archivo subido")
+    original = models.CharField(max_length=255, help_text="Ruta del original en PORTADAS_ORIGINALES_DIR")
+    estado = models.CharField(max_length=20, choices=ESTADOS, default='pendiente')
+    imagen = models.CharField(max_length=200, blank=True, default='', help_text="Versión grande generada")
+    error = models.TextField(blank=True, default='')
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_proceso = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-fecha_creacion']
+        verbose_name = 'Portada subida'
+        verbose_name_plural = 'Portadas subidas'
+        indexes = [
+            models.Index(fields=['estado', 'fecha_creacion']),
+        ]
+
+    def __str__(self):
+        return f"{self.juego.nombre} - {self.hash_original[:12]} ({self.get_estado_display()})"
+
+
+class ImagenBlob(models.Model):
+    """
+    Imagen del almacén por contenido (catalog/almacen_imagenes.py): un archivo
+    por SHA-256 en static/img/cas/, compartido por todos los juegos y nombres
+    viejos que tengan la misma imagen.
+    """
+    hash = models.CharField(max_length=64, unique=True)
+    extension = models.CharField(max_length=10)
+    tamano = models.PositiveBigIntegerField(help_text="Bytes")
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Imagen (blob)'
+        verbose_name_plural = 'Imágenes (blobs)'
+
+    def __str__(self):
+        return self.ruta
+
+    @property
+    def ruta(self):
+        """Ruta estática, p. ej. img/cas/3f/3f2a...c1.jpg"""
+        return f'img/cas/{self.hash[:2]}/{self.hash}{self.extension}'
+
+
+class EventoJuego(models.Model):
+    """
+    Evento de demanda crudo (vista del detalle, agregado al carrito, checkout).
+    Solo se agregan, en lote, desde catalog/demanda.py; `consolidar_demanda`
+    los resume en DemandaDiaria y borra los viejos.
+    """
+    TIPOS = [
+        ('vista', 'Vista del detalle'),
+        ('carrito', 'Agregado al carrito'),
+        ('checkout', 'Checkout'),
+    ]
+
+    # Sin FK: el evento se encola sin consultar la base y el juego puede borrarse antes del lote
+    juego_id = models.PositiveIntegerField()
+    tipo = models.CharField(max_length=10, choices=TIPOS)
+    cantidad = models.PositiveIntegerField(default=1)
+    fecha = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name = 'Evento de juego'
+        verbose_name_plural = 'Eventos de juegos'
+
+    def __str__(self):
+        return f"#{self.juego_id} {self.tipo} x{self.cantidad} ({self.fecha:%Y-%m-%d %H:%M})"
+
+
+class DemandaDiaria(models.Model):
+    """Totales por juego y día, armados por `python manage.py consolidar_demanda`"""
+    juego = models.ForeignKey(Juego, on_delete=models.CASCADE, related_name='demanda')
+    dia = models.DateField()
+    vistas = models.PositiveIntegerField(default=0)
+    carritos = models.PositiveIntegerField(default=0)
+    checkouts = models.PositiveIntegerField(default=0, help_text="Unidades en pedidos")
+
+    class Meta:
+        ordering = ['-dia']
+        verbose_name = 'Demanda diaria'
+        verbose_name_plural = 'Demanda diaria'
+        constraints = [
+            models.UniqueConstraint(fields=['juego', 'dia'], name='demanda_juego_dia_unica'),
+        ]
+        indexes = [
+            models.Index(fields=['dia']),
+        ]
+
+    def __str__(self):
+        return f"{self.juego_id} {self.dia}: {self.vistas}/{self.carritos}/{self.checkouts}"
@@ -0,0 +1,317 @@
+# catalog/prerender.py
+"""
+Páginas del catálogo pre-renderizadas a HTML estático.
+
+`python manage.py prerender_catalogo` escribe en PRERENDER_DIR el detalle de
+cada juego disponible, las primeras PRERENDER_PAGINAS páginas de cada listado
+(general, ps4, ps5) y un sitemap.xml:
+
+    manifiesto.json          ruta -> archivo y firma, versión del catálogo
+    juego/<id>.html
+    listado/<nombre>/<pagina>.html
+    sitemap.xml
+
+Solo se vuelven a renderizar las páginas cuya firma cambió. La de un detalle
+sale de la fila (fecha_actualizacion más los campos que muestra, porque los
+UPDATE masivos y los save(update_fields=...) no siempre la tocan) y de la
+entrada de su portada en el índice de imágenes; la de un listado, de las
+firmas de sus juegos y el total. Si cambian los templates o el manifest de
+estáticos se renderiza todo.
+
+Con PRERENDER_SERVIR, `PrerenderMiddleware` responde esas rutas con el
+archivo, sin vista ni base, mientras la versión del cache de juegos
+(catalog/cache_juegos.py) sea la misma con la que se armó: después de una
+importación se vuelve a las vistas hasta el próximo prerender. Guardar un
+juego (admin) borra su página y los listados. Las respuestas llevan un ETag
+de la firma de la página (ver catalog/condicional.py).
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.paginator import Page, Paginator
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpRequest, HttpResponse
+from django.middleware.csrf import get_token
+from django.template.loader import get_template, render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from .cache_juegos import version_actual
+from .condicional import agregar_validadores, etag, responder_304
+from .imagenes import buscar_imagen
+from .models import Juego
+from .procesamiento_portadas import variantes
+from .views import LISTADOS, POR_PAGINA, contexto_listado
+
+PLANTILLAS = ('catalog/lista.html', 'catalog/detalle.html', 'base.html')
+CAMPOS_FIRMA = [campo.attname for campo in Juego._meta.concrete_fields if campo.attname != 'popularidad']
+RUTA_SITEMAP = '/sitemap.xml'
+TIPOS_CONTENIDO = {'.html': 'text/html; charset=utf-8', '.xml': 'application/xml; charset=utf-8'}
+
+
+def directorio():
+    return Path(settings.PRERENDER_DIR)
+
+
+def ruta_manifiesto():
+    return directorio() / 'manifiesto.json'
+
+
+def _hash(*partes):
+    return hashlib.md5(json.dumps(partes, default=str, sort_keys=True).encode()).hexdigest()
+
+
+def _escribir(destino, contenido):
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporal = destino.with_name(f'.{destino.name}.{os.getpid()}.tmp')
+    temporal.write_bytes(contenido)
+    os.replace(temporal, destino)
+
+
+def firma_base():
+    """Cambia si cambian los templates o los nombres con hash de los estáticos"""
+    partes = [Path(get_template(nombre).origin.name).read_text(encoding='utf-8') for nombre in PLANTILLAS]
+    manifiesto_estaticos = Path(settings.STATIC_ROOT) / 'staticfiles.json'
+    partes.append(manifiesto_estaticos.read_text(encoding='utf-8') if manifiesto_estaticos.exists() else '')
+    return _hash(*partes)
+
+
+def firma_juego(juego):
+    portadas = [buscar_imagen(juego.imagen)] + [buscar_imagen(v) for v in variantes(juego.imagen).values()]
+    return _hash([getattr(juego, campo) for campo in CAMPOS_FIRMA], portadas)
+
+
+def planificar(paginas):
+    """Páginas a generar con su firma; una consulta por todo el catálogo disponible"""
+    base = firma_base()
+    juegos = list(Juego.objects.filter(disponible=True).order_by('nombre'))
+    firmas = {juego.id: firma_juego(juego) for juego in juegos}
+    tareas = []
+
+    for juego in juegos:
+        tareas.append({
+            'ruta': reverse('catalogo:detalle', args=[juego.get_slug()]),
+            'archivo': f'juego/{juego.id}.html',
+            'firma': _hash(base, firmas[juego.id]),
+            'plantilla': 'catalog/detalle.html',
+            'contexto': {'juego': juego},
+            'modificado': juego.fecha_actualizacion,
+        })
+
+    for nombre, (titulo, filtros) in LISTADOS.items():
+        del_listado = [j for j in juegos if all(getattr(j, campo) == valor for campo, valor in filtros.items())]
+        paginator = Paginator(del_listado, POR_PAGINA)
+        ruta = reverse(f'catalogo:{nombre}')
+        for numero in range(1, min(paginas, paginator.num_pages) + 1):
+            objetos = list(paginator.page(numero))
+            tareas.append({
+                'ruta': ruta if numero == 1 else f'{ruta}?page={numero}',
+                'archivo': f'listado/{nombre}/{numero}.html',
+                'firma': _hash(base, paginator.count, numero, [firmas[j.id] for j in objetos]),
+                'plantilla': 'catalog/lista.html',
+                # Solo los juegos de la página: el Page se arma de nuevo en el proceso que renderiza
+                'contexto': {'juegos': objetos, 'numero': numero, 'total': paginator.count, 'titulo': titulo},
+                'modificado': max((j.fecha_actualizacion for j in objetos), default=None),
+            })
+    return tareas
+
+
+def _request(ruta):
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = ruta
+    request.META = {'SERVER_NAME': 'localhost', 'SERVER_PORT': '80'}
+    return request
+
+
+def renderizar(tarea):
+    """Renderiza y escribe una página; devuelve los bytes escritos"""
+    contexto = dict(tarea['contexto'])
+    if tarea['plantilla'] == 'catalog/lista.html':
+        paginator = Paginator([], POR_PAGINA)
+        paginator.count = contexto['total']
+        pagina = Page(contexto['juegos'], contexto['numero'], paginator)
+        contexto = contexto_listado(pagina, contexto['titulo'])
+    # El HTML es el mismo para todos: el token va en la cookie, de donde lo lee htmx
+    contexto['csrf_token'] = ''
+    html = render_to_string(tarea['plantilla'], contexto, request=_request(tarea['ruta'])).encode()
+    _escribir(directorio() / tarea['archivo'], html)
+    return len(html)
+
+
+def _ejecutor(procesos):
+    # Renderizar templates es CPU: procesos (fork, ya con Django cargado) donde se pueda
+    if procesos > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        connections.close_all()
+        return ProcessPoolExecutor(procesos, mp_context=multiprocessing.get_context('fork'))
+    return ThreadPoolExecutor(max(procesos, 1))
+
+
+def escribir_sitemap(tareas):
+    """sitemap.xml con los detalles y la primera página de cada listado"""
+    sitio = settings.SITIO_URL.rstrip('/')
+    urls = []
+    for tarea in tareas:
+        if '?' in tarea['ruta']:
+            continue
+        lastmod = f"<lastmod>{tarea['modificado']:%Y-%m-%d}</lastmod>" if tarea['modificado'] else ''
+        urls.append(f"  <url><loc>{escape(sitio + tarea['ruta'])}</loc>{lastmod}</url>")
+    contenido = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        + '\n'.join(urls)
+        + '\n</urlset>\n'
+    )
+    _escribir(directorio() / 'sitemap.xml', contenido.encode())
+    return len(urls)
+
+
+def cargar_manifiesto():
+    try:
+        with open(ruta_manifiesto(), encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return {}
+
+
+def construir(paginas=None, procesos=None, todo=False):
+    """Renderiza lo que cambió desde el último build y actualiza manifiesto y sitemap"""
+    paginas = paginas or settings.PRERENDER_PAGINAS
+    procesos = procesos or os.cpu_count() or 1
+    # Se lee antes que la base: si una importación la cambia durante el build, no se sirve
+    version = version_actual()
+    previas = {} if todo else cargar_manifiesto().get('paginas', {})
+    tareas = planificar(paginas)
+
+    pendientes = [
+        tarea for tarea in tareas
+        if previas.get(tarea['ruta'], {}).get('firma') != tarea['firma']
+        or not (directorio() / tarea['archivo']).exists()
+    ]
+    with _ejecutor(procesos) as ejecutor:
+        escritos = sum(ejecutor.map(renderizar, pendientes, chunksize=max(1, len(pendientes) // (procesos * 4))))
+
+    vigentes = {tarea['archivo'] for tarea in tareas}
+    borradas = 0
+    for datos in previas.values():
+        if datos['archivo'] not in vigentes and datos['archivo'] != 'sitemap.xml':
+            (directorio() / datos['archivo']).unlink(missing_ok=True)
+            borradas += 1
+
+    en_sitemap = escribir_sitemap(tareas)
+    paginas_manifiesto = {tarea['ruta']: {'archivo': tarea['archivo'], 'firma': tarea['firma']} for tarea in tareas}
+    paginas_manifiesto[RUTA_SITEMAP] = {'archivo': 'sitemap.xml', 'firma': ''}
+    manifiesto = {'version': version, 'fecha': timezone.now().isoformat(), 'paginas': paginas_manifiesto}
+    _escribir(ruta_manifiesto(), json.dumps(manifiesto, ensure_ascii=False, indent=1).encode())
+    return {
+        'paginas': len(tareas),
+        'renderizadas': len(pendientes),
+        'sin_cambios': len(tareas) - len(pendientes),
+        'borradas': borradas,
+        'bytes': escritos,
+        'en_sitemap': en_sitemap,
+        'version': version,
+    }
+
+
+class _Manifiesto:
+    """Manifiesto en memoria, releído cuando cambia el archivo"""
+    mtime = None
+    datos = {}
+
+
+def manifiesto_vigente():
+    """Páginas servibles, o None si no hay build o el catálogo cambió desde el último"""
+    try:
+        mtime = os.stat(ruta_manifiesto()).st_mtime
+    except OSError:
+        return None
+    if mtime != _Manifiesto.mtime:
+        _Manifiesto.datos, _Manifiesto.mtime = cargar_manifiesto(), mtime
+    if _Manifiesto.datos.get('version') != version_actual():
+        return None
+    return _Manifiesto.datos.get('paginas')
+
+
+def clave_request(request):
+    """Ruta del manifiesto para el request, o None si lleva parámetros que cambian el contenido"""
+    if not request.GET:
+        return request.path
+    pagina = request.GET.get('page', '')
+    if list(request.GET) == ['page'] and pagina.isdigit():
+        return request.path if int(pagina) == 1 else f'{request.path}?page={int(pagina)}'
+    return None
+
+
+def respuesta_prerenderizada(request):
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    clave = clave_request(request)
+    paginas = manifiesto_vigente() if clave is not None else None
+    datos = paginas.get(clave) if paginas else None
+    if datos is None:
+        return None
+    ruta = directorio() / datos['archivo']
+    try:
+        contenido = ruta.read_bytes()
+    except OSError:
+        # Borrada al guardar el juego: la vista la genera hasta el próximo prerender
+        return None
+    etag_actual = etag('prerender', datos['firma']) if datos['firma'] else None
+    no_modificada = responder_304(request, etag_actual)
+    if no_modificada is not None:
+        return no_modificada
+    respuesta = HttpResponse(contenido, content_type=TIPOS_CONTENIDO.get(ruta.suffix, 'text/html; charset=utf-8'))
+    respuesta['X-Prerender'] = '1'
+    agregar_validadores(respuesta, etag_actual)
+    # Que CsrfViewMiddleware deje la cookie: los botones del carrito la necesitan
+    get_token(request)
+    return respuesta
+
+
+class PrerenderMiddleware:
+    """Ir al final de MIDDLEWARE: la respuesta pasa igual por CSRF, clickjacking, etc."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PRERENDER_SERVIR', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return respuesta_prerenderizada(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        respuesta = respuesta_prerenderizada(request)
+        if respuesta is None:
+            respuesta = await self.get_response(request)
+        return respuesta
+
+
+def descartar_juego(sender=None, instance=None, **kwargs):
+    """post_save / post_delete: la página del juego y los listados vuelven a la vista"""
+    base = directorio()
+    if instance is None or instance.pk is None or not base.exists():
+        return
+    (base / 'juego' / f'{instance.pk}.html').unlink(missing_ok=True)
+    for archivo in (base / 'listado').glob('*/*.html'):
+        archivo.unlink(missing_ok=True)
+
+
+def conectar():
+    post_save.connect(descartar_juego, sender=Juego, dispatch_uid='prerender_save')
+    post_delete.connect(descartar_juego, sender=Juego, dispatch_uid='prerender_delete')
@@ -0,0 +1,178 @@
+# catalog/procesamiento_portadas.py
+"""
+Portadas subidas desde el admin.
+
+El formulario guarda el original tal como llegó, nombrado por su SHA-256, en
+PORTADAS_ORIGINALES_DIR (fuera de static: no se sirve ni se colecta) y crea
+una PortadaSubida pendiente. Un worker la procesa en segundo plano:
+
+- decodifica, rota según EXIF y descarta los metadatos (GPS, cámara...);
+- genera un WebP por cada ancho de TAMANOS_PORTADA en MEDIA_ROOT/portadas/
+  (no en static: se crean después de collectstatic y no estarían en su
+  manifest), con nombre `<hash>_<ancho>.webp` (escritura a un temporal + os.replace);
+- actualiza el índice de imágenes y, en una transacción, cambia
+  `Juego.imagen` a la versión más grande si sigue siendo la última subida.
+
+Mientras tanto el juego sigue mostrando la portada anterior. Con
+PORTADAS_WORKER='comando' el proceso web solo encola y las procesa
+`python manage.py procesar_portadas`.
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .imagenes import SUBDIRECTORIO_MEDIA, actualizar_entrada, ruta_archivo
+from .models import Juego, PortadaSubida
+
+logger = logging.getLogger(__name__)
+
+SUBDIRECTORIO = SUBDIRECTORIO_MEDIA
+CALIDAD_WEBP = 80
+_VARIANTE = re.compile(r'^portadas/(?P<hash>[0-9a-f]+)_(?P<ancho>\d+)\.webp$')
+
+_lock = threading.Lock()
+_ejecutor = None
+
+
+def tamanos():
+    return tuple(sorted(getattr(settings, 'TAMANOS_PORTADA', (300, 600))))
+
+
+def nombre_variante(hash_original, ancho):
+    return f'{SUBDIRECTORIO}/{hash_original[:16]}_{ancho}.webp'
+
+
+def variantes(ruta):
+    """{ancho: ruta} de las versiones de una portada procesada, o {} si `ruta` no es una"""
+    match = _VARIANTE.match(ruta or '')
+    if match is None:
+        return {}
+    return {ancho: nombre_variante(match['hash'], ancho) for ancho in tamanos()}
+
+
+def guardar_original(archivo_subido):
+    """Guarda el upload por chunks con su hash como nombre; devuelve (ruta, sha256)"""
+    directorio = Path(settings.PORTADAS_ORIGINALES_DIR)
+    directorio.mkdir(parents=True, exist_ok=True)
+    extension = Path(archivo_subido.name).suffix.lower()[:10] or '.bin'
+    sha = hashlib.sha256()
+    temporal = directorio / f'.subiendo-{os.getpid()}-{threading.get_ident()}'
+    with open(temporal, 'wb') as destino:
+        for chunk in archivo_subido.chunks():
+            sha.update(chunk)
+            destino.write(chunk)
+    hash_original = sha.hexdigest()
+    ruta = directorio / f'{hash_original}{extension}'
+    os.replace(temporal, ruta)
+    return ruta, hash_original
+
+
+def encolar(juego, ruta, hash_original):
+    """Crea la PortadaSubida y la manda al worker cuando se confirme la transacción"""
+    portada = PortadaSubida.objects.create(juego=juego, hash_original=hash_original, original=str(ruta))
+    if settings.PORTADAS_WORKER == 'hilo':
+        transaction.on_commit(lambda: enviar(portada.id))
+    return portada
+
+
+def _ejecutor_portadas():
+    global _ejecutor
+    with _lock:
+        if _ejecutor is None:
+            _ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='portadas')
+        return _ejecutor
+
+
+def enviar(portada_id):
+    _ejecutor_portadas().submit(_tarea, portada_id)
+
+
+def _tarea(portada_id):
+    try:
+        close_old_connections()
+        procesar(PortadaSubida.objects.get(id=portada_id))
+    except Exception:
+        logger.exception('Falló el procesamiento de la portada #%s', portada_id)
+    finally:
+        connection.close()
+
+
+def _escribir_webp(imagen, destino):
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporal = destino.with_name(f'.{destino.name}.{os.getpid()}.tmp')
+    imagen.save(temporal, 'WEBP', quality=CALIDAD_WEBP, method=6)
+    os.replace(temporal, destino)
+
+
+def generar_variantes(ruta_original, hash_original):
+    """Escribe las versiones WebP (sin metadatos, orientadas); devuelve {ancho: ruta en media}"""
+    from PIL import Image, ImageOps
+
+    generadas = {}
+    with Image.open(ruta_original) as abierta:
+        imagen = ImageOps.exif_transpose(abierta)
+        # Sin transparencia ni paletas: las portadas son fotos/arte opaco
+        imagen = imagen.convert('RGB')
+        for ancho in tamanos():
+            nombre = nombre_variante(hash_original, ancho)
+            destino = ruta_archivo(nombre)
+            if not destino.exists():
+                copia = imagen.copy()
+                if copia.width > ancho:
+                    alto = round(copia.height * ancho / copia.width)
+                    copia = copia.resize((ancho, alto), Image.Resampling.LANCZOS)
+                # Un Image nuevo no arrastra exif/icc/xmp del original
+                _escribir_webp(copia, destino)
+            generadas[ancho] = nombre
+    return generadas
+
+
+def procesar(portada):
+    """Genera las variantes y cambia la portada del juego; deja el estado en la PortadaSubida"""
+    try:
+        generadas = generar_variantes(portada.original, portada.hash_original)
+    except Exception as e:
+        logger.warning('Portada #%s ilegible: %s', portada.id, e)
+        portada.estado = 'fallida'
+        portada.error = str(e)
+        portada.fecha_proceso = timezone.now()
+        portada.save(update_fields=['estado', 'error', 'fecha_proceso'])
+        return False
+
+    for nombre in generadas.values():
+        actualizar_entrada(nombre)
+    portada.imagen = generadas[max(generadas)]
+
+    with transaction.atomic():
+        portada.estado = 'procesada'
+        portada.error = ''
+        portada.fecha_proceso = timezone.now()
+        portada.save(update_fields=['estado', 'error', 'imagen', 'fecha_proceso'])
+        # Si mientras tanto se subió otra portada para el juego, gana la más nueva
+        ultima = PortadaSubida.objects.filter(juego_id=portada.juego_id).order_by('-id').values_list('id', flat=True).first()
+        if ultima == portada.id:
+            juego = Juego.objects.get(id=portada.juego_id)
+            juego.imagen = portada.imagen
+            juego.imagen_blob = None
+            # save() y no update(): post_save invalida el cache de juegos y los carruseles
+            juego.save(update_fields=['imagen', 'imagen_blob'])
+    return True
+
+
+def procesar_pendientes():
+    """Procesa en este proceso las portadas pendientes; devuelve (procesadas, fallidas)"""
+    procesadas = fallidas = 0
+    for portada in PortadaSubida.objects.filter(estado='pendiente').order_by('fecha_creacion'):
+        if procesar(portada):
+            procesadas += 1
+        else:
+            fallidas += 1
+    return procesadas, fallidas
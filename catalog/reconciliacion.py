@@ -0,0 +1,75 @@
+# catalog/reconciliacion.py
+"""
+Reconciliación y corrección de precios secundarios como UPDATE por conjunto.
+Cada operación es una sola sentencia SQL, sin importar el tamaño del catálogo.
+"""
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Juego
+
+# Secundarios con el precio cargado en los campos del primario
+FILTRO_PRECIO_EQUIVOCADO = Q(es_solo_secundario=True, precio_secundario__isnull=True, precio__gt=0)
+
+
+def _filtros_reconciliacion(ids_vistos):
+    no_vistos = ~Q(id__in=ids_vistos)
+    return {
+        'secundarios_a_limpiar': Q(tiene_secundario=True) & no_vistos,
+        'solo_secundarios_a_desactivar': Q(es_solo_secundario=True) & no_vistos,
+    }
+
+
+def contar_afectados(ids_vistos=None):
+    """
+    Cuenta en una sola consulta agregada las filas que tocarían la
+    corrección de precios y (si se pasan los ids vistos) la reconciliación.
+    """
+    filtros = {'precios_a_corregir': FILTRO_PRECIO_EQUIVOCADO}
+    if ids_vistos is not None:
+        filtros.update(_filtros_reconciliacion(ids_vistos))
+    return Juego.objects.aggregate(**{
+        nombre: Count('id', filter=filtro) for nombre, filtro in filtros.items()
+    })
+
+
+def corregir_precios_secundarios(dry_run=False):
+    """Mueve precio/recargo a los campos secundarios. Devuelve la cantidad de juegos."""
+    if dry_run:
+        return contar_afectados()['precios_a_corregir']
+
+    # En SQL todas las asignaciones leen los valores previos de la fila
+    return Juego.objects.filter(FILTRO_PRECIO_EQUIVOCADO).update(
+        precio_secundario=F('precio'),
+        recargo_secundario=F('recargo'),
+        precio=0,
+        recargo=0,
+        fecha_actualizacion=timezone.now(),
+    )
+
+
+def reconciliar_secundarios(ids_vistos, dry_run=False):
+    """
+    Limpia el precio secundario de los juegos que no aparecieron en el archivo
+    y desactiva los que solo existían como secundarios.
+    Devuelve {'secundarios_a_limpiar': n, 'solo_secundarios_a_desactivar': n}.
+    """
+    if dry_run:
+        conteos = contar_afectados(ids_vistos)
+        conteos.pop('precios_a_corregir')
+        return conteos
+
+    filtros = _filtros_reconciliacion(ids_vistos)
+    ahora = timezone.now()
+    return {
+        'secundarios_a_limpiar': Juego.objects.filter(filtros['secundarios_a_limpiar']).update(
+            precio_secundario=None,
+            recargo_secundario=None,
+            tiene_secundario=False,
+            fecha_actualizacion=ahora,
+        ),
+        'solo_secundarios_a_desactivar': Juego.objects.filter(filtros['solo_secundarios_a_desactivar']).update(
+            disponible=False,
+            fecha_actualizacion=ahora,
+        ),
+    }
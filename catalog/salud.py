@@ -0,0 +1,156 @@
+# catalog/salud.py
+"""
+Chequeo de salud del catálogo en una sola pasada: una consulta a Juego
+(solo las columnas necesarias) y un recorrido de static/img. Reemplaza a
+los reportes de portadas de ps4/ps5/secus, check_missing_games y
+diagnosticar_precios cuando lo que se quiere es un control barato para cron.
+
+Problemas que detecta (cada uno es una lista de dicts en el resultado):
+- sin_portada: juegos disponibles con la portada por defecto o vacía.
+- portada_inexistente: la ruta de Juego.imagen no existe en static/ (ni en
+  MEDIA_ROOT, para las portadas procesadas).
+- portada_rota: el archivo existe pero está vacío o no está en el índice de
+  imágenes (indexar_imagenes no lo pudo abrir, o nunca se indexó).
+- imagenes_huerfanas: portadas en disco que ningún juego usa, ni directamente
+  ni por hardlink (ver catalog/almacen_imagenes.py).
+- precio_invalido: juego disponible con precio primario en cero (salvo los
+  solo-secundarios) o con recargo negativo.
+- secundario_sin_precio: marcado como secundario sin precio secundario.
+- secundario_inconsistente: tiene_secundario y es_solo_secundario a la vez,
+  o precio secundario cargado sin ninguna de las dos marcas.
+- nombres_duplicados: juegos con el mismo nombre normalizado y consola.
+"""
+import os
+import re
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+
+from .imagenes import EXTENSIONES_IMAGEN, SUBDIRECTORIO_MEDIA, cargar_indice, directorio_estaticos
+from .models import Juego
+from .procesamiento_portadas import variantes
+
+PORTADAS_POR_DEFECTO = {'', 'img/default.jpg', 'img/default.png'}
+# Archivos de static/img que son portadas (el resto son logos, carruseles, avatares)
+_NOMBRE_PORTADA = re.compile(r'ps[45]|^img/cas/|^portadas/', re.IGNORECASE)
+
+CAMPOS = (
+    'id', 'nombre', 'nombre_normalizado', 'consola', 'disponible', 'imagen',
+    'precio', 'recargo', 'precio_secundario', 'recargo_secundario',
+    'tiene_secundario', 'es_solo_secundario',
+)
+PROBLEMAS = (
+    'sin_portada', 'portada_inexistente', 'portada_rota', 'imagenes_huerfanas',
+    'precio_invalido', 'secundario_sin_precio', 'secundario_inconsistente', 'nombres_duplicados',
+)
+
+
+def escanear_imagenes(subdirectorio='img', base=None):
+    """{ruta: (tamaño, (dispositivo, inodo))} de las imágenes bajo <base>/<subdirectorio> (por defecto static/)"""
+    base = Path(base) if base else directorio_estaticos()
+    archivos = {}
+    pendientes = [base / subdirectorio]
+    while pendientes:
+        try:
+            entradas = os.scandir(pendientes.pop())
+        except OSError:
+            continue
+        with entradas:
+            for entrada in entradas:
+                if entrada.name.startswith('.'):
+                    continue
+                if entrada.is_dir(follow_symlinks=False):
+                    pendientes.append(entrada.path)
+                elif os.path.splitext(entrada.name)[1].lower() in EXTENSIONES_IMAGEN:
+                    datos = entrada.stat()
+                    nombre = os.path.relpath(entrada.path, base).replace(os.sep, '/')
+                    archivos[nombre] = (datos.st_size, (datos.st_dev, datos.st_ino))
+    return archivos
+
+
+def _juego(fila, **extra):
+    return {'id': fila['id'], 'nombre': fila['nombre'], 'consola': fila['consola'], **extra}
+
+
+def analizar(solo_disponibles=False):
+    """Corre todos los chequeos y devuelve {'resumen': {...}, problema: [...]}"""
+    juegos = Juego.objects.order_by('id')
+    if solo_disponibles:
+        juegos = juegos.filter(disponible=True)
+    filas = list(juegos.values(*CAMPOS))
+    archivos = escanear_imagenes()
+    archivos.update(escanear_imagenes(SUBDIRECTORIO_MEDIA, base=settings.MEDIA_ROOT))
+    indice = cargar_indice()
+
+    resultado = {problema: [] for problema in PROBLEMAS}
+    en_uso = set()
+    por_nombre = defaultdict(list)
+
+    for fila in filas:
+        imagen = fila['imagen'] or ''
+        if imagen in PORTADAS_POR_DEFECTO:
+            if fila['disponible']:
+                resultado['sin_portada'].append(_juego(fila, imagen=imagen))
+        elif imagen not in archivos:
+            resultado['portada_inexistente'].append(_juego(fila, imagen=imagen))
+        else:
+            en_uso.add(imagen)
+            en_uso.update(variantes(imagen).values())
+            if archivos[imagen][0] == 0 or imagen not in indice:
+                resultado['portada_rota'].append(_juego(fila, imagen=imagen))
+
+        # Los solo-secundarios tienen precio primario 0 a propósito (ver secus.py)
+        if fila['disponible'] and not fila['es_solo_secundario'] and fila['precio'] <= 0:
+            resultado['precio_invalido'].append(_juego(fila, precio=fila['precio'], motivo='precio en cero'))
+        elif fila['recargo'] < 0 or (fila['recargo_secundario'] or 0) < 0:
+            resultado['precio_invalido'].append(_juego(fila, precio=fila['precio'], motivo='recargo negativo'))
+
+        secundario = fila['precio_secundario']
+        if (fila['tiene_secundario'] or fila['es_solo_secundario']) and not secundario:
+            resultado['secundario_sin_precio'].append(_juego(fila, precio_secundario=secundario))
+        elif fila['tiene_secundario'] and fila['es_solo_secundario']:
+            resultado['secundario_inconsistente'].append(
+                _juego(fila, precio_secundario=secundario, motivo='tiene_secundario y es_solo_secundario a la vez')
+            )
+        elif secundario and not (fila['tiene_secundario'] or fila['es_solo_secundario']):
+            resultado['secundario_inconsistente'].append(
+                _juego(fila, precio_secundario=secundario, motivo='precio secundario sin marcar como secundario')
+            )
+
+        por_nombre[(fila['nombre_normalizado'], fila['consola'])].append(fila['id'])
+
+    for (nombre_normalizado, consola), ids in sorted(por_nombre.items()):
+        if len(ids) > 1 and nombre_normalizado:
+            resultado['nombres_duplicados'].append(
+                {'nombre_normalizado': nombre_normalizado, 'consola': consola, 'ids': ids}
+            )
+
+    # Una imagen con otro nombre pero el mismo inodo que una en uso (hardlink) no es huérfana
+    inodos_en_uso = {archivos[nombre][1] for nombre in en_uso if nombre in archivos}
+    for nombre, (tamano, inodo) in sorted(archivos.items()):
+        if nombre in en_uso or inodo in inodos_en_uso or nombre in PORTADAS_POR_DEFECTO:
+            continue
+        if _NOMBRE_PORTADA.search(nombre):
+            resultado['imagenes_huerfanas'].append({'imagen': nombre, 'tamano': tamano})
+
+    resultado['resumen'] = {
+        'juegos': len(filas),
+        'imagenes': len(archivos),
+        **{problema: len(resultado[problema]) for problema in PROBLEMAS},
+    }
+    return resultado
+
+
+def filas_csv(resultado):
+    """Una fila (problema, id, nombre, consola, detalle) por hallazgo, para el CSV"""
+    for problema in PROBLEMAS:
+        for item in resultado[problema]:
+            detalle = {k: v for k, v in item.items() if k not in ('id', 'nombre', 'consola')}
+            yield {
+                'problema': problema,
+                'id': item.get('id', ''),
+                'nombre': item.get('nombre', ''),
+                'consola': item.get('consola', ''),
+                'detalle': '; '.join(f'{k}={v}' for k, v in detalle.items()),
+            }
@@ -0,0 +1,12 @@
+# catalog/signals.py
+from django.dispatch import Signal
+
+# Se envía al terminar una operación masiva sobre el catálogo (importaciones,
+# correcciones, snapshots). Los UPDATE por conjunto y bulk_update no disparan
+# post_save, así que quien cachee datos del catálogo tiene que escuchar esta señal.
+# Argumentos: origen (nombre del comando).
+catalogo_actualizado = Signal()
+
+
+def notificar_catalogo_actualizado(origen):
+    catalogo_actualizado.send(sender=None, origen=origen)
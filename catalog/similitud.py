@@ -0,0 +1,198 @@
+# catalog/similitud.py
+"""
+Motores de similitud de texto para el matcheo de nombres del catálogo.
+
+Todos los motores exponen `score(consulta, candidatos, minimo=0.0)`, que
+devuelve un score por candidato en la misma escala que
+`SequenceMatcher.ratio()`, así los umbrales existentes (0.85 / 0.90)
+siguen valiendo sin importar el motor elegido.
+
+- sequencematcher: difflib, el comportamiento histórico.
+- indel: LCS bit-paralelo (Allison-Dix / Hyyrö), ratio = 2*LCS / (len_a + len_b).
+- levenshtein: distancia de Levenshtein bit-paralela (Myers / Hyyrö).
+"""
+from bisect import bisect_right
+from difflib import SequenceMatcher
+
+from django.conf import settings
+
+# Puntos de calibración (score crudo del motor -> escala de SequenceMatcher).
+# Se regeneran con: python manage.py benchmark_similitud --calibrar
+# y se pueden sobreescribir con settings.SIMILITUD_CALIBRACION.
+CALIBRACION_POR_DEFECTO = {
+    'indel': {0.85: 0.8502, 0.90: 0.8990},
+    'levenshtein': {0.85: 0.7625, 0.90: 0.8944},
+}
+
+
+def tabla_patron(texto):
+    """Máscara de bits por carácter: bit i prendido si texto[i] == c"""
+    tabla = {}
+    for i, c in enumerate(texto):
+        tabla[c] = tabla.get(c, 0) | (1 << i)
+    return tabla
+
+
+def lcs_bitparalelo(tabla, largo, texto):
+    """Largo de la subsecuencia común más larga entre el patrón y `texto`"""
+    if not largo or not texto:
+        return 0
+    mascara = (1 << largo) - 1
+    v = mascara
+    for c in texto:
+        u = v & tabla.get(c, 0)
+        v = ((v + u) | (v - u)) & mascara
+    return largo - v.bit_count()
+
+
+def levenshtein_bitparalelo(tabla, largo, texto):
+    """Distancia de Levenshtein entre el patrón y `texto` (algoritmo de Myers)"""
+    if not largo:
+        return len(texto)
+    mascara = (1 << largo) - 1
+    ultimo = 1 << (largo - 1)
+    vp = mascara
+    vn = 0
+    distancia = largo
+    for c in texto:
+        eq = tabla.get(c, 0)
+        xv = eq | vn
+        xh = (((eq & vp) + vp) ^ vp) | eq
+        hp = vn | (~(xh | vp) & mascara)
+        hn = vp & xh
+        if hp & ultimo:
+            distancia += 1
+        elif hn & ultimo:
+            distancia -= 1
+        hp = ((hp << 1) | 1) & mascara
+        hn = (hn << 1) & mascara
+        vp = hn | (~(xv | hp) & mascara)
+        vn = hp & xv
+    return distancia
+
+
+class MotorSimilitud:
+    """Base de los motores. Las subclases implementan `_puntajes_crudos`."""
+    nombre = ''
+
+    def __init__(self, calibracion=None):
+        if calibracion is None:
+            calibracion = getattr(settings, 'SIMILITUD_CALIBRACION', {}).get(
+                self.nombre, CALIBRACION_POR_DEFECTO.get(self.nombre, {})
+            )
+        # Puntos (crudo, calibrado) ordenados, con los extremos fijos
+        puntos = {0.0: 0.0, 1.0: 1.0}
+        for umbral, crudo in calibracion.items():
+            puntos[float(crudo)] = float(umbral)
+        self._crudos = sorted(puntos)
+        self._calibrados = [puntos[c] for c in self._crudos]
+
+    def calibrar_valor(self, crudo):
+        """Lleva un score crudo a la escala de SequenceMatcher (lineal por tramos)"""
+        return self._interpolar(crudo, self._crudos, self._calibrados)
+
+    def valor_crudo(self, calibrado):
+        """Inversa de `calibrar_valor`"""
+        return self._interpolar(calibrado, self._calibrados, self._crudos)
+
+    @staticmethod
+    def _interpolar(valor, xs, ys):
+        if valor <= xs[0]:
+            return ys[0]
+        if valor >= xs[-1]:
+            return ys[-1]
+        i = bisect_right(xs, valor) - 1
+        x0, x1 = xs[i], xs[i + 1]
+        y0, y1 = ys[i], ys[i + 1]
+        if x1 == x0:
+            return y1
+        return y0 + (valor - x0) * (y1 - y0) / (x1 - x0)
+
+    def cota_largo(self, largo_a, largo_b):
+        """Cota superior del score crudo usando solo los largos (para descartar rápido)"""
+        total = largo_a + largo_b
+        return 2.0 * min(largo_a, largo_b) / total if total else 1.0
+
+    def score(self, consulta, candidatos, minimo=0.0):
+        """
+        Score de `consulta` contra cada candidato, en el mismo orden.
+        Los candidatos que por largo no pueden llegar a `minimo` se
+        devuelven con 0.0 sin calcular la similitud.
+        """
+        minimo_crudo = self.valor_crudo(minimo) if minimo > 0 else 0.0
+        largo = len(consulta)
+        indices = []
+        filtrados = []
+        for i, candidato in enumerate(candidatos):
+            if minimo_crudo and self.cota_largo(largo, len(candidato)) < minimo_crudo:
+                continue
+            indices.append(i)
+            filtrados.append(candidato)
+
+        resultado = [0.0] * len(candidatos)
+        for i, crudo in zip(indices, self._puntajes_crudos(consulta, filtrados)):
+            resultado[i] = self.calibrar_valor(crudo)
+        return resultado
+
+    def _puntajes_crudos(self, consulta, candidatos):
+        raise NotImplementedError
+
+
+class MotorSequenceMatcher(MotorSimilitud):
+    nombre = 'sequencematcher'
+
+    def __init__(self, calibracion=None):
+        # Es la escala de referencia: nunca se calibra
+        super().__init__(calibracion={})
+
+    def _puntajes_crudos(self, consulta, candidatos):
+        for candidato in candidatos:
+            yield SequenceMatcher(None, consulta, candidato).ratio()
+
+
+class MotorIndel(MotorSimilitud):
+    nombre = 'indel'
+
+    def _puntajes_crudos(self, consulta, candidatos):
+        # La tabla del patrón se arma una sola vez por consulta
+        tabla = tabla_patron(consulta)
+        largo = len(consulta)
+        for candidato in candidatos:
+            total = largo + len(candidato)
+            if not total:
+                yield 1.0
+                continue
+            yield 2.0 * lcs_bitparalelo(tabla, largo, candidato) / total
+
+
+class MotorLevenshtein(MotorSimilitud):
+    nombre = 'levenshtein'
+
+    def cota_largo(self, largo_a, largo_b):
+        mayor = max(largo_a, largo_b)
+        return 1.0 - abs(largo_a - largo_b) / mayor if mayor else 1.0
+
+    def _puntajes_crudos(self, consulta, candidatos):
+        tabla = tabla_patron(consulta)
+        largo = len(consulta)
+        for candidato in candidatos:
+            mayor = max(largo, len(candidato))
+            if not mayor:
+                yield 1.0
+                continue
+            yield 1.0 - levenshtein_bitparalelo(tabla, largo, candidato) / mayor
+
+
+MOTORES = {
+    MotorSequenceMatcher.nombre: MotorSequenceMatcher,
+    MotorIndel.nombre: MotorIndel,
+    MotorLevenshtein.nombre: MotorLevenshtein,
+}
+
+
+def obtener_motor(nombre='sequencematcher', calibracion=None):
+    """Instancia el motor por nombre (ver MOTORES)"""
+    try:
+        return MOTORES[nombre](calibracion=calibracion)
+    except KeyError:
+        raise ValueError(f"Motor de similitud desconocido: {nombre}")
@@ -0,0 +1,342 @@
+# catalog/snapshot.py
+"""
+Snapshots del catálogo (Juego, ResenaCliente y SupplierAlias) en formato
+columnar comprimido, para mover el estado entre entornos sin copiar
+db.sqlite3 ni rehacer las importaciones de stock.
+
+ImagenBlob viaja en el snapshot pero no se reemplaza: es un almacén por
+contenido, así que al importar se agregan los blobs que falten y
+Juego.imagen_blob se traduce por `hash` a la PK local.
+
+Juego tampoco se vacía: PortadaSubida y DemandaDiaria (que no están en el
+snapshot) lo referencian con CASCADE. Se borran solo los juegos que no están
+en el snapshot, con sus dependientes, y el resto se actualiza en su lugar.
+
+Un snapshot es un directorio con `manifest.json` y un archivo por tabla:
+- parquet: Parquet (requiere pyarrow), un row group por lote.
+- binario: gzip con una línea JSON por lote, cada una {columna: [valores]}.
+  Es el formato de respaldo cuando pyarrow no está instalado.
+"""
+import gzip
+import json
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .importacion import calcular_hash_archivo, en_lotes
+from .models import ImagenBlob, Juego, ResenaCliente, SupplierAlias
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+VERSION_SNAPSHOT = 2
+TAMANO_LOTE_SNAPSHOT = 5000
+
+# El orden importa: Juego referencia a ImagenBlob y SupplierAlias a Juego
+MODELOS_SNAPSHOT = [ImagenBlob, Juego, ResenaCliente, SupplierAlias]
+
+# Tablas por contenido: se agregan las filas que faltan (nunca se borran) y las
+# FK que apuntan a ellas se traducen por esta clave, porque las PK cambian entre bases
+CLAVE_NATURAL = {ImagenBlob: 'hash'}
+
+# Tablas con dependientes fuera del snapshot: se actualizan por PK en vez de vaciarse
+ACTUALIZAR_EN_LUGAR = {Juego}
+
+EXTENSIONES = {
+    'parquet': '.parquet',
+    'binario': '.jsonl.gz',
+}
+
+
+class ErrorSnapshot(Exception):
+    """El snapshot está incompleto, corrupto o no coincide con los modelos"""
+
+
+def formatos_disponibles():
+    return ['parquet', 'binario'] if pq else ['binario']
+
+
+def columnas_modelo(modelo):
+    """Columnas de la tabla (attname, así las FK se guardan como <campo>_id)"""
+    return [campo.attname for campo in modelo._meta.concrete_fields]
+
+
+def _codificar(valor):
+    """Lleva un valor de la BD a un tipo portable (Decimal y fechas como texto)"""
+    if isinstance(valor, (Decimal, datetime, date)):
+        return str(valor) if isinstance(valor, Decimal) else valor.isoformat()
+    return valor
+
+
+# ---------------------------------------------------------------------------
+# Escritura
+# ---------------------------------------------------------------------------
+
+def esquema_arrow(modelo):
+    """Esquema fijo por modelo, así un lote con una columna toda en NULL no cambia el tipo"""
+    tipos = {
+        'AutoField': pa.int64(),
+        'BigAutoField': pa.int64(),
+        'IntegerField': pa.int64(),
+        'PositiveIntegerField': pa.int64(),
+        'PositiveBigIntegerField': pa.int64(),
+        'ForeignKey': pa.int64(),
+        'BooleanField': pa.bool_(),
+        'FloatField': pa.float64(),
+    }
+    return pa.schema([
+        (campo.attname, tipos.get(campo.get_internal_type(), pa.string()))
+        for campo in modelo._meta.concrete_fields
+    ])
+
+
+def _escribir_parquet(ruta, modelo, columnas, lotes):
+    esquema = esquema_arrow(modelo)
+    with pq.ParquetWriter(ruta, esquema, compression='zstd') as escritor:
+        for lote in lotes:
+            escritor.write_table(pa.Table.from_pydict(
+                {col: [fila[i] for fila in lote] for i, col in enumerate(columnas)},
+                schema=esquema,
+            ))
+
+
+def _escribir_binario(ruta, modelo, columnas, lotes):
+    with gzip.open(ruta, 'wt', encoding='utf-8', compresslevel=9) as archivo:
+        for lote in lotes:
+            bloque = {col: [fila[i] for fila in lote] for i, col in enumerate(columnas)}
+            archivo.write(json.dumps(bloque, ensure_ascii=False, separators=(',', ':')))
+            archivo.write('\n')
+
+
+def exportar(directorio, formato='parquet', tamano_lote=TAMANO_LOTE_SNAPSHOT):
+    """
+    Escribe el snapshot en `directorio` y devuelve el manifiesto.
+    La lectura se hace dentro de una transacción para que las tablas sean consistentes.
+    """
+    if formato not in formatos_disponibles():
+        raise ErrorSnapshot(f"Formato no disponible: {formato} (instalá pyarrow para usar parquet)")
+
+    directorio = Path(directorio)
+    directorio.mkdir(parents=True, exist_ok=True)
+    escribir = _escribir_parquet if formato == 'parquet' else _escribir_binario
+
+    manifiesto = {
+        'version': VERSION_SNAPSHOT,
+        'formato': formato,
+        'creado': timezone.now().isoformat(),
+        'tablas': {},
+    }
+
+    with transaction.atomic():
+        for modelo in MODELOS_SNAPSHOT:
+            columnas = columnas_modelo(modelo)
+            filas = modelo.objects.order_by('pk').values_list(*columnas).iterator(chunk_size=tamano_lote)
+            contador = {'filas': 0}
+
+            def lotes():
+                for lote in en_lotes(filas, tamano_lote):
+                    contador['filas'] += len(lote)
+                    yield [[_codificar(valor) for valor in fila] for fila in lote]
+
+            nombre_archivo = modelo._meta.model_name + EXTENSIONES[formato]
+            ruta = directorio / nombre_archivo
+            escribir(ruta, modelo, columnas, lotes())
+
+            manifiesto['tablas'][modelo._meta.label_lower] = {
+                'archivo': nombre_archivo,
+                'columnas': columnas,
+                'filas': contador['filas'],
+                'sha256': calcular_hash_archivo(ruta),
+            }
+
+    (directorio / 'manifest.json').write_text(json.dumps(manifiesto, indent=2, ensure_ascii=False), encoding='utf-8')
+    return manifiesto
+
+
+# ---------------------------------------------------------------------------
+# Lectura
+# ---------------------------------------------------------------------------
+
+def _leer_parquet(ruta, columnas, tamano_lote):
+    if pq is None:
+        raise ErrorSnapshot("El snapshot es parquet y pyarrow no está instalado")
+    archivo = pq.ParquetFile(ruta)
+    for lote in archivo.iter_batches(batch_size=tamano_lote, columns=columnas):
+        yield {col: lote.column(col).to_pylist() for col in columnas}
+
+
+def _leer_binario(ruta, columnas, tamano_lote):
+    with gzip.open(ruta, 'rt', encoding='utf-8') as archivo:
+        for linea in archivo:
+            if linea.strip():
+                yield json.loads(linea)
+
+
+def leer_manifiesto(directorio):
+    """Lee y valida el manifiesto contra los modelos actuales"""
+    ruta = Path(directorio) / 'manifest.json'
+    if not ruta.exists():
+        raise ErrorSnapshot(f"No se encontró {ruta}")
+    manifiesto = json.loads(ruta.read_text(encoding='utf-8'))
+
+    if manifiesto.get('version') != VERSION_SNAPSHOT:
+        raise ErrorSnapshot(f"Versión de snapshot no soportada: {manifiesto.get('version')}")
+    if manifiesto.get('formato') not in EXTENSIONES:
+        raise ErrorSnapshot(f"Formato desconocido: {manifiesto.get('formato')}")
+
+    for modelo in MODELOS_SNAPSHOT:
+        tabla = manifiesto['tablas'].get(modelo._meta.label_lower)
+        if tabla is None:
+            raise ErrorSnapshot(f"Falta la tabla {modelo._meta.label_lower}")
+        esperadas = columnas_modelo(modelo)
+        if sorted(tabla['columnas']) != sorted(esperadas):
+            raise ErrorSnapshot(
+                f"Las columnas de {modelo._meta.label_lower} no coinciden con el modelo "
+                f"(faltan: {sorted(set(esperadas) - set(tabla['columnas']))}, "
+                f"sobran: {sorted(set(tabla['columnas']) - set(esperadas))}). "
+                f"¿Faltan migraciones?"
+            )
+    return manifiesto
+
+
+def verificar_archivos(directorio, manifiesto):
+    """Compara el SHA-256 de cada archivo con el del manifiesto"""
+    for etiqueta, tabla in manifiesto['tablas'].items():
+        ruta = Path(directorio) / tabla['archivo']
+        if not ruta.exists():
+            raise ErrorSnapshot(f"Falta el archivo {tabla['archivo']}")
+        if calcular_hash_archivo(ruta) != tabla['sha256']:
+            raise ErrorSnapshot(f"El hash de {tabla['archivo']} no coincide: el archivo está corrupto o fue modificado")
+
+
+@contextmanager
+def fechas_originales(modelo):
+    """Desactiva auto_now/auto_now_add para conservar las fechas del snapshot"""
+    campos = [
+        (campo, campo.auto_now, campo.auto_now_add)
+        for campo in modelo._meta.concrete_fields
+        if getattr(campo, 'auto_now', False) or getattr(campo, 'auto_now_add', False)
+    ]
+    for campo, _, _ in campos:
+        campo.auto_now = campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        for campo, auto_now, auto_now_add in campos:
+            campo.auto_now, campo.auto_now_add = auto_now, auto_now_add
+
+
+def _agregar_faltantes(modelo, instancias):
+    """Crea las filas que no existen por clave natural; devuelve {pk_snapshot: pk_local}"""
+    clave = CLAVE_NATURAL[modelo]
+    por_clave = {getattr(instancia, clave): instancia.pk for instancia in instancias}
+    existentes = set(modelo.objects.filter(**{f'{clave}__in': por_clave}).values_list(clave, flat=True))
+    nuevas = [instancia for instancia in instancias if getattr(instancia, clave) not in existentes]
+    for instancia in nuevas:
+        instancia.pk = None
+    modelo.objects.bulk_create(nuevas)
+    locales = dict(modelo.objects.filter(**{f'{clave}__in': por_clave}).values_list(clave, 'pk'))
+    return {pk: locales[valor] for valor, pk in por_clave.items()}
+
+
+def _borrar_sobrantes(modelo, leer, ruta, tamano_lote):
+    """Borra (con CASCADE) las filas cuya PK no está en el snapshot"""
+    pk = modelo._meta.pk.attname
+    en_snapshot = {valor for bloque in leer(ruta, [pk], tamano_lote) for valor in bloque[pk]}
+    sobrantes = set(modelo.objects.values_list('pk', flat=True)) - en_snapshot
+    for lote in en_lotes(sorted(sobrantes), tamano_lote):
+        modelo.objects.filter(pk__in=lote).delete()
+
+
+def importar(directorio, tamano_lote=TAMANO_LOTE_SNAPSHOT, dry_run=False):
+    """
+    Reemplaza las tablas del snapshot con su contenido, lote por lote y en una
+    sola transacción (las de CLAVE_NATURAL solo se completan y las de
+    ACTUALIZAR_EN_LUGAR se actualizan por PK). Si algún chequeo falla no queda
+    nada a medias.
+    Devuelve {label: filas_cargadas}.
+    """
+    directorio = Path(directorio)
+    manifiesto = leer_manifiesto(directorio)
+    verificar_archivos(directorio, manifiesto)
+    leer = _leer_parquet if manifiesto['formato'] == 'parquet' else _leer_binario
+
+    cargadas = {}
+    with transaction.atomic():
+        # Borrar en orden inverso por las FK
+        for modelo in reversed(MODELOS_SNAPSHOT):
+            if modelo in ACTUALIZAR_EN_LUGAR:
+                tabla = manifiesto['tablas'][modelo._meta.label_lower]
+                _borrar_sobrantes(modelo, leer, directorio / tabla['archivo'], tamano_lote)
+            elif modelo not in CLAVE_NATURAL:
+                modelo.objects.all().delete()
+
+        # {modelo referenciado: {pk_snapshot: pk_local}}
+        remapeos = {}
+
+        for modelo in MODELOS_SNAPSHOT:
+            etiqueta = modelo._meta.label_lower
+            tabla = manifiesto['tablas'][etiqueta]
+            campos = {campo.attname: campo for campo in modelo._meta.concrete_fields}
+            ruta = directorio / tabla['archivo']
+            total = 0
+            traducir = {
+                columna: remapeos[campo.related_model]
+                for columna, campo in campos.items()
+                if campo.is_relation and campo.related_model in remapeos
+            }
+
+            with fechas_originales(modelo):
+                for bloque in leer(ruta, tabla['columnas'], tamano_lote):
+                    largo = len(next(iter(bloque.values()), []))
+                    instancias = []
+                    for i in range(largo):
+                        valores = {
+                            columna: campos[columna].to_python(bloque[columna][i])
+                            for columna in tabla['columnas']
+                        }
+                        for columna, remapeo in traducir.items():
+                            valores[columna] = remapeo.get(valores[columna])
+                        instancias.append(modelo(**valores))
+                    if modelo in CLAVE_NATURAL:
+                        remapeos.setdefault(modelo, {}).update(_agregar_faltantes(modelo, instancias))
+                    elif modelo in ACTUALIZAR_EN_LUGAR:
+                        pk = modelo._meta.pk.attname
+                        modelo.objects.bulk_create(
+                            instancias,
+                            batch_size=tamano_lote,
+                            update_conflicts=True,
+                            unique_fields=[pk],
+                            update_fields=[columna for columna in tabla['columnas'] if columna != pk],
+                        )
+                    else:
+                        modelo.objects.bulk_create(instancias, batch_size=tamano_lote)
+                    total += largo
+
+            if total != tabla['filas']:
+                raise ErrorSnapshot(f"{etiqueta}: se cargaron {total} filas y el manifiesto dice {tabla['filas']}")
+            cargadas[etiqueta] = total
+
+        # FK huérfanas (p. ej. alias que apuntan a juegos que no están)
+        try:
+            connection.check_constraints(table_names=[m._meta.db_table for m in MODELOS_SNAPSHOT])
+        except Exception as e:
+            raise ErrorSnapshot(f"Chequeo de integridad fallido: {e}")
+
+        # Las PK se insertaron a mano: reacomodar las secuencias (PostgreSQL)
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), MODELOS_SNAPSHOT):
+                cursor.execute(sql)
+
+        if dry_run:
+            transaction.set_rollback(True)
+
+    return cargadas
@@ -0,0 +1,56 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+from django.utils.safestring import mark_safe
+
+from catalog.imagenes import buscar_imagen, url_imagen
+from catalog.procesamiento_portadas import variantes
+
+register = template.Library()
+
+
+@register.simple_tag
+def cover_img(ruta, alt='', clase='', indice=None, fallback='img/default.jpg', tamanos='(max-width: 576px) 50vw, 300px'):
+    """
+    <img> de una portada con width/height del índice de imágenes.
+    Las de la primera fila (indice < PORTADAS_PRIMERA_FILA) se piden con
+    prioridad alta; el resto con loading="lazy" y un placeholder borroso.
+    Las portadas optimizadas (portadas/, en media) llevan srcset con sus anchos;
+    `tamanos` es el atributo sizes.
+    Uso: {% cover_img juego.imagen juego.nombre clase="juego-imagen" indice=forloop.counter0 %}
+    """
+    ruta = ruta or fallback
+    datos = buscar_imagen(ruta)
+    primera_fila = indice is not None and indice < getattr(settings, 'PORTADAS_PRIMERA_FILA', 5)
+
+    atributos = [('src', url_imagen(ruta)), ('alt', alt)]
+    if clase:
+        atributos.append(('class', clase))
+    if datos:
+        atributos += [('width', datos['w']), ('height', datos['h'])]
+    anchos = variantes(ruta)
+    if anchos:
+        atributos += [
+            ('srcset', ', '.join(f'{url_imagen(nombre)} {ancho}w' for ancho, nombre in anchos.items())),
+            ('sizes', tamanos),
+        ]
+
+    if primera_fila:
+        atributos.append(('fetchpriority', 'high'))
+    else:
+        atributos += [('loading', 'lazy'), ('decoding', 'async')]
+        if datos:
+            atributos += [
+                ('style', f"background:url({datos['ph']}) center/cover no-repeat"),
+                ('onload', "this.style.background='none'"),
+            ]
+
+    atributos.append(('onerror', f"this.onerror=null; this.src='{static(fallback)}'"))
+    return mark_safe('<img ' + format_html_join(' ', '{}="{}"', atributos) + '>')
+
+
+@register.simple_tag
+def portada_url(ruta, fallback='img/default.jpg'):
+    """URL de Juego.imagen, esté en static o en media"""
+    return url_imagen(ruta or fallback)
@@ -1,3 +1,168 @@
-from django.test import TestCase
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from .busqueda import candidatos_similares, filtrar_por_nombre, normalizar_nombre
+from .models import ImagenBlob, Juego, SupplierAlias
+
+ES_POSTGRES = connection.vendor == 'postgresql'
+SIN_POSTGRES = 'Corre en la pasada de PostgreSQL de CaSy/pruebas.py (initdb/pg_ctl) o con DATABASE_URL=postgres://...'
+
+NOMBRES = [
+    "Marvel's Spider-Man 2 PS5",
+    'Marvel’s Spider-Man Miles Morales PS4',
+    'Pokémon™ Scarlet PS5',
+    'God of War Ragnarök PS4',
+    'Gran Turismo 7 PS5',
+]
+
+
+def crear_juegos(nombres=NOMBRES, using='default'):
+    # bulk_create: sin señales (cache, prerender) y con el nombre normalizado que pondría save()
+    return Juego.objects.using(using).bulk_create([
+        Juego(
+            nombre=nombre,
+            nombre_normalizado=normalizar_nombre(nombre),
+            consola='ps5' if 'PS5' in nombre else 'ps4',
+            precio=1000,
+        )
+        for nombre in nombres
+    ])
+
+
+class NormalizarNombreTests(TestCase):
+    def test_quita_acentos_signos_y_mayusculas(self):
+        self.assertEqual(normalizar_nombre("Marvel's Spider-Man 2™"), 'marvel s spider man 2')
+        self.assertEqual(normalizar_nombre('Pokémon™ Scarlet®'), 'pokemon scarlet')
+        self.assertEqual(normalizar_nombre(''), '')
+        self.assertEqual(normalizar_nombre(None), '')
+
+
+class FiltrarPorNombreTests(TestCase):
+    """Mismo resultado en SQLite (LIKE) y en PostgreSQL (índice trigram)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        crear_juegos()
+
+    def nombres(self, texto):
+        return sorted(filtrar_por_nombre(Juego.objects.all(), texto).values_list('nombre', flat=True))
+
+    def test_sin_acentos_ni_signos(self):
+        self.assertEqual(self.nombres('spiderman'), [])
+        self.assertEqual(len(self.nombres('spider-man')), 2)
+        self.assertEqual(self.nombres('POKEMON'), ['Pokémon™ Scarlet PS5'])
+        self.assertEqual(self.nombres('ragnarok'), ['God of War Ragnarök PS4'])
+
+    def test_marcas_registradas_no_se_pegan_a_la_palabra(self):
+        self.assertEqual(self.nombres('pokemon scarlet'), ['Pokémon™ Scarlet PS5'])
+
+    def test_texto_solo_con_signos_usa_el_nombre_original(self):
+        self.assertEqual(self.nombres('™'), ['Pokémon™ Scarlet PS5'])
+
+
+@skipUnless(ES_POSTGRES, SIN_POSTGRES)
+class TrigramaPostgresTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        crear_juegos()
+
+    def test_filtrar_usa_el_indice_gin(self):
+        consulta = filtrar_por_nombre(Juego.objects.all(), 'spider man')
+        with connection.cursor() as cursor:
+            # Con cinco filas el planner prefiere un seq scan: se lo desactiva para ver el índice
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = consulta.explain()
+        self.assertIn('catalog_juego_nombre_norm_trgm', plan)
+
+    def test_candidatos_ordenados_por_similitud(self):
+        candidatos = list(candidatos_similares(Juego.objects.all(), 'Spider Man Miles Morales'))
+        self.assertEqual(candidatos[0].nombre, 'Marvel’s Spider-Man Miles Morales PS4')
+        similitudes = [juego.similitud for juego in candidatos]
+        self.assertEqual(similitudes, sorted(similitudes, reverse=True))
+        self.assertNotIn('Gran Turismo 7 PS5', [juego.nombre for juego in candidatos])
+
+    def test_candidatos_respeta_el_limite(self):
+        crear_juegos([f'Spider Man {numero} PS4' for numero in range(10)])
+        self.assertEqual(len(candidatos_similares(Juego.objects.all(), 'spider man', limite=3)), 3)
+
+
+@skipUnless(ES_POSTGRES, SIN_POSTGRES)
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class MigrarSqliteAPostgresTests(TransactionTestCase):
+    """Arma una base SQLite migrada en un temporal y la copia a la base de test (PostgreSQL)"""
+
+    ALIAS = 'origen_sqlite'
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.origen = Path(self.directorio.name) / 'origen.sqlite3'
+        entorno = {**os.environ, 'SQLITE_PATH': str(self.origen)}
+        entorno.pop('DATABASE_URL', None)
+        entorno.pop('DATABASE_URL_LECTURA', None)
+        subprocess.run(
+            [sys.executable, 'manage.py', 'migrate', '--noinput', '-v0'],
+            cwd=settings.BASE_DIR, env=entorno, check=True,
+        )
+        connections.settings[self.ALIAS] = connections.configure_settings({
+            'default': {},
+            self.ALIAS: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(self.origen)},
+        })[self.ALIAS]
+        juegos = crear_juegos(using=self.ALIAS)
+        blob = ImagenBlob.objects.using(self.ALIAS).create(hash='a' * 64, extension='.jpg', tamano=1234)
+        Juego.objects.using(self.ALIAS).filter(id=juegos[1].id).update(imagen_blob=blob)
+        SupplierAlias.objects.using(self.ALIAS).create(
+            proveedor='primario', consola='ps5', texto_original='SPIDERMAN 2', juego_id=juegos[0].id, score=1,
+        )
+
+    def tearDown(self):
+        connections[self.ALIAS].close()
+        del connections[self.ALIAS]
+        del connections.settings[self.ALIAS]
+        self.directorio.cleanup()
+
+    def migrar(self, **opciones):
+        call_command('migrar_sqlite_a_postgres', origen=str(self.origen), interactive=False, verbosity=0, **opciones)
+
+    def test_copia_filas_y_reacomoda_secuencias(self):
+        self.migrar()
+        self.assertEqual(Juego.objects.count(), len(NOMBRES))
+        alias = SupplierAlias.objects.get()
+        self.assertEqual(alias.juego.nombre, NOMBRES[0])
+        # La secuencia quedó después de las PK copiadas
+        nuevo, = crear_juegos(['Nuevo PS5'])
+        self.assertGreater(nuevo.id, max(Juego.objects.exclude(id=nuevo.id).values_list('id', flat=True)))
+        # El índice trigram funciona sobre lo copiado
+        self.assertEqual(filtrar_por_nombre(Juego.objects.all(), 'pokemon').count(), 1)
+
+    def test_copia_los_blobs_de_imagen(self):
+        self.migrar()
+        juego = Juego.objects.get(nombre=NOMBRES[1])
+        self.assertEqual(juego.imagen_blob.hash, 'a' * 64)
+        self.assertEqual(Juego.objects.filter(imagen_blob__isnull=False).count(), 1)
+
+    def test_destino_con_datos_requiere_vaciar(self):
+        from django.core.management.base import CommandError
+
+        crear_juegos(['Otro PS4'])
+        with self.assertRaises(CommandError):
+            self.migrar()
+        self.migrar(vaciar=True)
+        self.assertFalse(Juego.objects.filter(nombre='Otro PS4').exists())
+
+    def test_blobs_en_el_destino_requieren_vaciar(self):
+        from django.core.management.base import CommandError
+
+        ImagenBlob.objects.create(hash='b' * 64, extension='.jpg', tamano=1)
+        with self.assertRaises(CommandError):
+            self.migrar()
+        self.migrar(vaciar=True)
+        self.assertEqual(list(ImagenBlob.objects.values_list('hash', flat=True)), ['a' * 64])
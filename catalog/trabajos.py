@@ -0,0 +1,219 @@
+# catalog/trabajos.py
+"""
+Cola de importaciones de stock subidas desde el admin.
+
+El admin guarda el CSV en disco por chunks (`encolar`) y responde enseguida;
+la importación la corre el mismo comando de consola (ps4, ps5, secus) en un
+thread del proceso web o, con IMPORTACIONES_WORKER='comando', en
+`python manage.py procesar_importaciones --esperar`.
+
+La cola es la tabla TrabajoImportacion: un trabajo se toma con un UPDATE
+condicional sobre su estado, así que varios procesos pueden vaciarla sin
+correr dos veces el mismo archivo. El avance (filas, coincidencias) se lee
+de la ImportRun que crea el comando y los no encontrados de su salida.
+
+Si el proceso muere con un trabajo 'corriendo', el trabajo queda así hasta que
+arranca un worker: al empezar, reencola los que no avanzan (ni el trabajo ni
+su ImportRun se actualizaron) hace más de IMPORTACIONES_COLGADO_MINUTOS y se
+reanudan desde el checkpoint. En modo 'hilo' la página de progreso del admin
+arranca el worker si el proceso web se reinició.
+"""
+import hashlib
+import logging
+import re
+import threading
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from .models import ImportRun, TrabajoImportacion
+
+logger = logging.getLogger(__name__)
+
+# Líneas de la salida de los comandos con filas que no matchearon
+_NO_ENCONTRADO = re.compile(r'^(?:NO ENCONTRADO|⏭️\s+OMITIDO): (.+)$')
+MAX_NO_ENCONTRADOS = 50
+
+_lock = threading.Lock()
+_hilo = None
+
+
+def directorio():
+    ruta = Path(settings.IMPORTACIONES_DIR)
+    ruta.mkdir(parents=True, exist_ok=True)
+    return ruta
+
+
+def guardar_archivo(archivo_subido):
+    """Copia el upload a IMPORTACIONES_DIR por chunks; devuelve (ruta, sha256)"""
+    nombre = get_valid_filename(Path(archivo_subido.name).name) or 'stock.csv'
+    ruta = directorio() / f'{uuid.uuid4().hex[:12]}_{nombre}'
+    sha = hashlib.sha256()
+    with open(ruta, 'wb') as destino:
+        for chunk in archivo_subido.chunks():
+            sha.update(chunk)
+            destino.write(chunk)
+    return ruta, sha.hexdigest()
+
+
+def encolar(archivo_subido, comando, usuario=''):
+    """Guarda el CSV, crea el trabajo y (según la configuración) arranca el worker"""
+    ruta, hash_archivo = guardar_archivo(archivo_subido)
+    trabajo = TrabajoImportacion.objects.create(
+        comando=comando,
+        archivo=str(ruta),
+        nombre_original=archivo_subido.name,
+        hash_archivo=hash_archivo,
+        usuario=usuario,
+    )
+    if settings.IMPORTACIONES_WORKER == 'hilo':
+        transaction.on_commit(iniciar_worker)
+    return trabajo
+
+
+def tomar_siguiente():
+    """Marca como 'corriendo' el pendiente más viejo y lo devuelve (o None si no hay)"""
+    for trabajo_id in TrabajoImportacion.objects.filter(estado='pendiente').order_by('fecha_creacion').values_list('id', flat=True):
+        tomado = TrabajoImportacion.objects.filter(id=trabajo_id, estado='pendiente').update(
+            estado='corriendo', fecha_inicio=timezone.now()
+        )
+        if tomado:
+            return TrabajoImportacion.objects.get(id=trabajo_id)
+    return None
+
+
+def buscar_corrida(trabajo):
+    """ImportRun que creó el comando para este trabajo"""
+    if trabajo.corrida_id:
+        return trabajo.corrida
+    if trabajo.fecha_inicio is None:
+        return None
+    corrida = ImportRun.objects.filter(
+        comando=trabajo.comando,
+        hash_archivo=trabajo.hash_archivo,
+        fecha_actualizacion__gte=trabajo.fecha_inicio,
+    ).order_by('-fecha_actualizacion').first()
+    if corrida is not None:
+        trabajo.corrida = corrida
+        TrabajoImportacion.objects.filter(id=trabajo.id).update(corrida=corrida)
+    return corrida
+
+
+def ejecutar(trabajo):
+    """Corre el comando del trabajo con su salida a un archivo y registra el resultado"""
+    try:
+        with open(trabajo.archivo_salida, 'w', encoding='utf-8') as salida:
+            call_command(
+                trabajo.comando,
+                file=trabajo.archivo,
+                resume=trabajo.reanudar,
+                stdout=salida,
+                stderr=salida,
+                no_color=True,
+            )
+        corrida = buscar_corrida(trabajo)
+        if corrida is None or corrida.etapa != 'completada':
+            trabajo.estado = 'fallido'
+            trabajo.error = corrida.error if corrida else 'El comando terminó sin crear la corrida (ver salida)'
+        else:
+            trabajo.estado = 'terminado'
+    except Exception as e:
+        logger.exception('Falló la importación #%s', trabajo.id)
+        trabajo.estado = 'fallido'
+        trabajo.error = str(e)
+    trabajo.fecha_fin = timezone.now()
+    trabajo.save(update_fields=['estado', 'error', 'fecha_fin'])
+
+
+def procesar_pendientes():
+    """Corre los trabajos pendientes de a uno; devuelve cuántos corrió"""
+    corridos = 0
+    while (trabajo := tomar_siguiente()) is not None:
+        logger.info('Importación #%s (%s): %s', trabajo.id, trabajo.comando, trabajo.nombre_original)
+        ejecutar(trabajo)
+        corridos += 1
+    return corridos
+
+
+def _worker():
+    try:
+        close_old_connections()
+        reencolar_colgados(settings.IMPORTACIONES_COLGADO_MINUTOS)
+        procesar_pendientes()
+    finally:
+        connection.close()
+
+
+def iniciar_worker():
+    """Arranca el thread del worker si no hay uno corriendo en este proceso"""
+    global _hilo
+    with _lock:
+        if _hilo is not None and _hilo.is_alive():
+            return
+        _hilo = threading.Thread(target=_worker, name='importaciones', daemon=True)
+        _hilo.start()
+
+
+def despertar_worker():
+    """En modo 'hilo', arranca el worker si este proceso no tiene uno (p. ej. después de un reinicio)"""
+    if settings.IMPORTACIONES_WORKER == 'hilo':
+        iniciar_worker()
+
+
+def reencolar_colgados(minutos=None):
+    """
+    Trabajos 'corriendo' de un proceso que murió: vuelven a la cola y se
+    reanudan desde el checkpoint. Con `minutos`, solo los que empezaron antes y
+    cuya ImportRun no guardó un checkpoint en ese tiempo; sin `minutos`, todos.
+    """
+    colgados = TrabajoImportacion.objects.filter(estado='corriendo')
+    if minutos is not None:
+        limite = timezone.now() - timedelta(minutes=minutos)
+        con_avance = ImportRun.objects.filter(
+            comando=OuterRef('comando'),
+            hash_archivo=OuterRef('hash_archivo'),
+            fecha_actualizacion__gte=limite,
+        )
+        colgados = colgados.filter(fecha_inicio__lt=limite).exclude(Exists(con_avance))
+    reencolados = colgados.update(estado='pendiente', reanudar=True)
+    if reencolados:
+        logger.warning('Importaciones colgadas reencoladas: %s', reencolados)
+    return reencolados
+
+
+def no_encontrados(trabajo, maximo=MAX_NO_ENCONTRADOS):
+    """Últimos nombres sin coincidencia según la salida del comando"""
+    try:
+        with open(trabajo.archivo_salida, encoding='utf-8') as salida:
+            nombres = [m.group(1) for m in map(_NO_ENCONTRADO.match, salida) if m]
+    except FileNotFoundError:
+        return []
+    return nombres[-maximo:]
+
+
+def progreso(trabajo):
+    """Avance para la página del admin: filas, filas/s, coincidencias y no encontrados"""
+    corrida = buscar_corrida(trabajo)
+    contadores = corrida.contadores if corrida else {}
+    filas = corrida.filas_procesadas if corrida else 0
+    fin = trabajo.fecha_fin or timezone.now()
+    segundos = (fin - trabajo.fecha_inicio).total_seconds() if trabajo.fecha_inicio else 0
+    return {
+        'corrida': corrida,
+        'etapa': corrida.get_etapa_display() if corrida else trabajo.get_estado_display(),
+        'filas': filas,
+        'filas_por_segundo': round(filas / segundos, 1) if segundos > 0 else 0,
+        'segundos': round(segundos),
+        'actualizados': contadores.get('actualizados', 0),
+        'creados': contadores.get('creados', 0),
+        'cantidad_no_encontrados': contadores.get('no_encontrados', 0),
+        'errores': contadores.get('errores', 0),
+        'no_encontrados': no_encontrados(trabajo),
+    }
@@ -1,141 +1,165 @@
 # catalog/views.py
-from django.shortcuts import render, get_object_or_404
+import logging
+
+from django.shortcuts import render
 from django.http import Http404, HttpResponse
-from django.core.paginator import Paginator
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
 from .models import Juego
+from .busqueda import filtrar_por_nombre
+from . import demanda
+from .cache_juegos import aobtener_juego
+from .condicional import condicional, etag, validadores_catalogo
+from CaSy.basedatos import alias_lectura
+
+logger = logging.getLogger(__name__)
 
 def subir_stock_ps4(request):
     return HttpResponse("Stock PS4 actualizado.")
 
-def catalogo_general(request):
-    """Vista del catálogo general con todos los juegos"""
+POR_PAGINA = 24
+
+# ?orden= de los listados; 'populares' usa el score precalculado (catalog/demanda.py)
+ORDENES = {
+    'nombre': ('nombre',),
+    'populares': ('-popularidad', 'nombre'),
+}
+
+# Listados del catálogo: nombre de la URL -> (título, filtros). También los usa catalog/prerender.py
+LISTADOS = {
+    'general': ('Catálogo General', {}),
+    'ps4': ('Catálogo PS4', {'consola': 'ps4'}),
+    'ps5': ('Catálogo PS5', {'consola': 'ps5'}),
+}
+
+
+async def paginar(juegos, numero, por_pagina=POR_PAGINA):
+    """
+    Paginator.get_page() con el ORM async: un COUNT y un SELECT con LIMIT.
+    Devuelve una Page normal, así el template no cambia.
+    """
+    paginator = Paginator(juegos, por_pagina)
+    paginator.count = await juegos.acount()
+    try:
+        numero = paginator.validate_number(numero)
+    except PageNotAnInteger:
+        numero = 1
+    except EmptyPage:
+        numero = paginator.num_pages
+    inicio = (numero - 1) * por_pagina
+    objetos = [juego async for juego in juegos[inicio:inicio + por_pagina]]
+    return Page(objetos, numero, paginator)
+
+
+async def _listado(request, titulo, **filtros):
+    """Listado paginado con búsqueda (?q=) por nombre normalizado y orden (?orden=)"""
     query = request.GET.get('q', '')
+    orden = request.GET.get('orden', 'nombre')
+    if orden not in ORDENES:
+        orden = 'nombre'
     
+    juegos = Juego.objects.using(alias_lectura()).filter(disponible=True, **filtros).order_by(*ORDENES[orden])
     if query:
-        juegos = Juego.objects.filter(
-            nombre__icontains=query,
-            disponible=True
-        ).order_by('nombre')
-    else:
-        juegos = Juego.objects.filter(disponible=True).order_by('nombre')
+        juegos = filtrar_por_nombre(juegos, query)
     
-    # Paginación
-    paginator = Paginator(juegos, 24)
-    page_number = request.GET.get('page')
-    juegos_paginados = paginator.get_page(page_number)
+    juegos_paginados = await paginar(juegos, request.GET.get('page'))
     
-    context = {
+    return render(request, 'catalog/lista.html', contexto_listado(juegos_paginados, titulo, query, orden))
+
+
+def contexto_listado(juegos_paginados, titulo, query='', orden='nombre'):
+    return {
         'juegos': juegos_paginados,
-        'total_juegos': juegos.count(),
-        'titulo': 'Catálogo General',
+        'total_juegos': juegos_paginados.paginator.count,
+        'titulo': titulo,
         'query': query,
+        'orden': orden,
     }
-    
-    return render(request, 'catalog/lista.html', context)
 
-def catalogo_ps4(request):
+@condicional(validadores_catalogo)
+async def catalogo_general(request):
+    """Vista del catálogo general con todos los juegos"""
+    titulo, filtros = LISTADOS['general']
+    return await _listado(request, titulo, **filtros)
+
+@condicional(validadores_catalogo)
+async def catalogo_ps4(request):
     """Vista del catálogo de PS4"""
-    query = request.GET.get('q', '')
-    
-    if query:
-        juegos = Juego.objects.filter(
-            nombre__icontains=query,
-            consola='ps4',
-            disponible=True
-        ).order_by('nombre')
-    else:
-        juegos = Juego.objects.filter(consola='ps4', disponible=True).order_by('nombre')
-    
-    paginator = Paginator(juegos, 24)
-    page_number = request.GET.get('page')
-    juegos_paginados = paginator.get_page(page_number)
-    
-    context = {
-        'juegos': juegos_paginados,
-        'total_juegos': juegos.count(),
-        'titulo': 'Catálogo PS4',
-        'query': query,
-    }
-    
-    return render(request, 'catalog/lista.html', context)
+    titulo, filtros = LISTADOS['ps4']
+    return await _listado(request, titulo, **filtros)
 
-def catalogo_ps5(request):
+@condicional(validadores_catalogo)
+async def catalogo_ps5(request):
     """Vista del catálogo de PS5"""
-    query = request.GET.get('q', '')
-    
-    if query:
-        juegos = Juego.objects.filter(
-            nombre__icontains=query,
-            consola='ps5',
-            disponible=True
-        ).order_by('nombre')
-    else:
-        juegos = Juego.objects.filter(consola='ps5', disponible=True).order_by('nombre')
-    
-    paginator = Paginator(juegos, 24)
-    page_number = request.GET.get('page')
-    juegos_paginados = paginator.get_page(page_number)
-    
-    context = {
-        'juegos': juegos_paginados,
-        'total_juegos': juegos.count(),
-        'titulo': 'Catálogo PS5',
-        'query': query,
-    }
-    
-    return render(request, 'catalog/lista.html', context)
+    titulo, filtros = LISTADOS['ps5']
+    return await _listado(request, titulo, **filtros)
 
-def destacados(request):
+@condicional(validadores_catalogo)
+async def destacados(request):
     """Vista de juegos destacados"""
     # Si tienes un campo 'destacado' en el modelo
     # juegos = Juego.objects.filter(destacado=True, disponible=True).order_by('nombre')
     
     # Por ahora, mostrar los más recientes
-    juegos = Juego.objects.filter(disponible=True).order_by('-fecha_actualizacion')[:20]
+    recientes = Juego.objects.using(alias_lectura()).filter(disponible=True).order_by('-fecha_actualizacion')[:20]
+    juegos = [juego async for juego in recientes]
     
     context = {
         'juegos': juegos,
-        'total_juegos': juegos.count(),
+        'total_juegos': len(juegos),
         'titulo': 'Juegos Destacados',
     }
     
     return render(request, 'catalog/lista.html', context)
 
-def detalle_juego(request, slug):
+def _id_desde_slug(slug):
+    """El slug tiene formato {id}-{nombre-slugificado}: el ID es lo que está antes del primer guion"""
+    try:
+        return int(slug.split('-')[0])
+    except (ValueError, IndexError) as e:
+        logger.debug("Slug inválido %r: %s", slug, e)
+        return None
+
+
+# popularidad cambia con cada consolidar_demanda y no se muestra en el detalle
+CAMPOS_DETALLE = [campo.attname for campo in Juego._meta.concrete_fields if campo.attname != 'popularidad']
+
+
+async def validadores_detalle(request, slug):
+    """
+    ETag de los campos de la fila y Last-Modified de fecha_actualizacion, con la
+    misma búsqueda por id que usa la vista (cache por id, si no la PK)
+    """
+    juego_id = _id_desde_slug(slug)
+    juego = await aobtener_juego(juego_id) if juego_id is not None else None
+    if juego is None or not juego.disponible:
+        return None, None
+    return etag(request.path, [getattr(juego, campo) for campo in CAMPOS_DETALLE]), juego.fecha_actualizacion
+
+@condicional(validadores_detalle)
+async def detalle_juego(request, slug):
     """
     Vista de detalle del juego.
     El slug tiene formato: {id}-{nombre-slugificado}
     Ejemplo: 10-a-way-out o 10-a-way-out-ps4
     """
-    try:
-        # Extraer el ID del slug (todo lo que está antes del primer guion)
-        partes = slug.split('-')
-        juego_id = int(partes[0])
-        
-        # Buscar el juego por ID
-        juego = get_object_or_404(Juego, id=juego_id)
-        
-        # Verificar que el juego esté disponible
-        if not juego.disponible:
-            raise Http404("Este juego no está disponible actualmente")
-        
-        # Debug: Imprimir info en consola
-        print(f"✅ Juego encontrado: {juego.nombre} (ID: {juego.id})")
-        print(f"   Slug recibido: {slug}")
-        print(f"   Tiene secundario: {juego.tiene_secundario}")
-        if juego.tiene_secundario:
-            print(f"   Precio primario: ${juego.recargo}")
-            print(f"   Precio secundario: ${juego.recargo_secundario}")
-        
-    except (ValueError, IndexError) as e:
-        print(f"❌ Error parseando slug '{slug}': {e}")
+    juego_id = _id_desde_slug(slug)
+    if juego_id is None:
         raise Http404("Formato de URL inválido")
-    except Juego.DoesNotExist:
-        print(f"❌ Juego con ID extraído de '{slug}' no encontrado")
+    
+    # Buscar el juego por ID (cache por id, ver catalog/cache_juegos.py)
+    juego = await aobtener_juego(juego_id)
+    if juego is None:
+        logger.debug("Juego %s (slug %r) no encontrado", juego_id, slug)
         raise Http404("Juego no encontrado")
     
+    # Verificar que el juego esté disponible
+    if not juego.disponible:
+        raise Http404("Este juego no está disponible actualmente")
+    
+    demanda.registrar(demanda.VISTA, juego.id)
+    
     context = {
         'juego': juego,
     }
     
-    return render(request, 'catalog/detalle.html', context)
\ No newline at end of file
+    return render(request, 'catalog/detalle.html', context)
@@ -0,0 +1,50 @@
+# featured/portada.py
+"""
+Carruseles de la home (destacados y reseñas) precalculados como HTML.
+Se guardan en el cache compartido y se regeneran cuando cambia el catálogo,
+así la home no consulta la base en cada visita.
+"""
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from catalog.models import Juego, ResenaCliente
+
+CLAVE_CARRUSELES = 'home:carruseles'
+CANTIDAD_CARRUSEL = 10
+
+
+def construir_carruseles():
+    """Consulta, renderiza y guarda ambos carruseles. Devuelve el payload."""
+    juegos_destacados = Juego.objects.filter(
+        destacado=True,
+        disponible=True
+    ).order_by('-fecha_actualizacion')[:CANTIDAD_CARRUSEL]
+    resenas = ResenaCliente.objects.filter(activo=True).order_by('-fecha')[:CANTIDAD_CARRUSEL]
+
+    payload = {
+        'destacados': render_to_string('carrusel_destacados.html', {'juegos': juegos_destacados}),
+        'resenas': render_to_string('carrusel_resenas.html', {'resenas': resenas}),
+        'generado': timezone.now().isoformat(),
+    }
+    cache.set(CLAVE_CARRUSELES, payload, timeout=None)
+    return payload
+
+
+def obtener_carruseles():
+    """Carruseles listos para insertar en home.html"""
+    payload = cache.get(CLAVE_CARRUSELES) or construir_carruseles()
+    return {
+        'destacados': mark_safe(payload['destacados']),
+        'resenas': mark_safe(payload['resenas']),
+    }
+
+
+def invalidar_carruseles(**kwargs):
+    """Se regeneran en la próxima visita (barato para saves en loop)"""
+    cache.delete(CLAVE_CARRUSELES)
+
+
+def regenerar_carruseles(**kwargs):
+    construir_carruseles()
@@ -0,0 +1,13 @@
+# featured/signals.py
+from django.db.models.signals import post_delete, post_save
+
+from catalog.models import Juego, ResenaCliente
+from catalog.signals import catalogo_actualizado
+from .portada import invalidar_carruseles, regenerar_carruseles
+
+
+def conectar():
+    for modelo in (Juego, ResenaCliente):
+        post_save.connect(invalidar_carruseles, sender=modelo, dispatch_uid=f'portada_save_{modelo.__name__}')
+        post_delete.connect(invalidar_carruseles, sender=modelo, dispatch_uid=f'portada_delete_{modelo.__name__}')
+    catalogo_actualizado.connect(regenerar_carruseles, dispatch_uid='portada_catalogo')
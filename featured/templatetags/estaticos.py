@@ -0,0 +1,54 @@
+import json
+import os
+from functools import lru_cache
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from CaSy.vendor import DEPENDENCIAS
+
+register = template.Library()
+
+
+@register.simple_tag
+def css_bundle(nombre):
+    """
+    <link> del bundle de CSS (settings.CSS_BUNDLES) con su nombre hasheado.
+    En DEBUG no hay collectstatic, así que se enlazan los archivos fuente.
+    """
+    if settings.DEBUG:
+        fuentes = settings.CSS_BUNDLES[nombre]
+        return format_html_join('\n    ', '<link rel="stylesheet" href="{}">', ((static(f),) for f in fuentes))
+    return format_html('<link rel="stylesheet" href="{}">', static(nombre))
+
+
+@lru_cache(maxsize=4)
+def _leer_manifiesto_vendor(ruta, mtime):
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+
+def manifiesto_vendor():
+    """vendor.json generado por `vendorizar`, o None si todavía no se corrió"""
+    ruta = finders.find('vendor/vendor.json')
+    if not ruta:
+        return None
+    return _leer_manifiesto_vendor(ruta, os.path.getmtime(ruta))
+
+
+@register.inclusion_tag('vendor_head.html')
+def vendor_head():
+    """Bootstrap, Font Awesome, Poppins y htmx: locales si existe static/vendor, CDN si no"""
+    return {'vendor': manifiesto_vendor()}
+
+
+@register.simple_tag
+def htmx_script():
+    """Solo htmx (para el admin, que no usa Bootstrap): local si existe static/vendor, CDN si no"""
+    vendor = manifiesto_vendor()
+    if vendor and vendor.get('htmx'):
+        return format_html('<script src="{}"></script>', static(vendor['htmx']))
+    return format_html('<script src="{}"></script>', DEPENDENCIAS['htmx/htmx.min.js'])
@@ -1,21 +1,18 @@
+import logging
+
 from django.shortcuts import render
 from django.core.paginator import Paginator
-from catalog.models import Juego, ResenaCliente
+from catalog.condicional import condicional, validadores_catalogo, validadores_estaticos
+from .portada import obtener_carruseles
+
+logger = logging.getLogger(__name__)
 
 # Create your views here.
+@condicional(validadores_catalogo)
 def home(request):
-    # Obtener solo los juegos destacados y disponibles
-    juegos_destacados = Juego.objects.filter(
-        destacado=True,
-        disponible=True
-    ).order_by('-fecha_actualizacion')[:10]
-    
-    # Obtener reseñas activas
-    resenas = ResenaCliente.objects.filter(activo=True).order_by('-fecha')[:10]
-    
+    # Carruseles precalculados (ver featured/portada.py)
     context = {
-        'juegos': juegos_destacados,  # Para el carrusel de juegos
-        'resenas': resenas,  # Para el carrusel de reseñas
+        'carruseles': obtener_carruseles(),
     }
     return render(request, 'home.html', context)
 
@@ -28,15 +25,17 @@ def ps4(request):
 def ps5(request):
     return render(request, 'ps5.html')
 
+@condicional(validadores_estaticos)
 def questions(request):
     return render(request, 'questions.html')
 
+@condicional(validadores_estaticos)
 def about(request):
     return render(request, 'about.html')
 
 def lista_juegos(request):
     # Vista principal que muestra los juegos paginados
-    print("Vista lista_juegos ejecutándose...")
+    logger.debug("Vista lista_juegos ejecutándose")
     juegos = cargar_juegos_desde_csv()
     
     # Paginación - 20 juegos por página